@@ -1,7 +1,11 @@
+import base64
+import binascii
+import json
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.api.schemas import (
     InventoryItemResponse,
@@ -9,13 +13,56 @@ from app.api.schemas import (
     UpdateInventoryResponse,
 )
 from app.core.states import PieceState
-from app.infrastructure.db import SqliteInventoryRepository, get_db
+from app.infrastructure.db import (
+    AsyncSqliteInventoryRepository,
+    get_async_db,
+    get_async_read_db,
+    get_async_session_factory,
+)
+from app.infrastructure.write_queue import InventoryWriteQueue
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+
+
+def _encode_cursor(state: PieceState | None, after_id: int) -> str:
+    payload = json.dumps({"s": state.value if state else None, "id": after_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, state: PieceState | None) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        after_id = int(payload["id"])
+        cursor_state = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+    if cursor_state != (state.value if state else None):
+        raise HTTPException(
+            status_code=400, detail="Cursor does not match the state filter"
+        )
+    return after_id
+
+
+def get_inventory_repo(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncSqliteInventoryRepository:
+    return AsyncSqliteInventoryRepository(db)
+
+
+def get_inventory_reader(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> AsyncSqliteInventoryRepository:
+    return AsyncSqliteInventoryRepository(db)
 
-def get_inventory_repo(db: Session = Depends(get_db)) -> SqliteInventoryRepository:
-    return SqliteInventoryRepository(db)
+
+def get_write_queue(request: Request) -> InventoryWriteQueue | None:
+    # Started by the app lifespan; absent when the app runs without it
+    return getattr(request.app.state, "write_queue", None)
 
 
 class UpdateStateRequest(BaseModel):
@@ -23,24 +70,80 @@ class UpdateStateRequest(BaseModel):
     color_id: int = Field(..., ge=0, le=9999)
     qty: int = Field(..., gt=0, le=10000)
     state: PieceState
+    # Addresses the row by its unique key; without it the first matching
+    # (part_no, color_id) row in any set is updated
+    set_no: str | None = Field(None, pattern=r"^[0-9A-Za-z-]{3,20}$")
 
 
 @router.get("/", response_model=InventoryListResponse)
 async def list_inventory(
     state: PieceState = Query(None),
-    repo: SqliteInventoryRepository = Depends(get_inventory_repo),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    repo: AsyncSqliteInventoryRepository = Depends(get_inventory_reader),
 ):
-    rows = repo.list(state=state)
+    # Without limit/cursor the whole inventory is returned, as before
+    if limit is None and cursor is None:
+        rows = await repo.list(state=state)
+        items = [InventoryItemResponse(**r) for r in rows]
+        return {"items": items, "count": len(items)}
+
+    after_id = _decode_cursor(cursor, state) if cursor else None
+    rows, next_after_id = await repo.list_page(
+        state=state, limit=limit or DEFAULT_PAGE_SIZE, after_id=after_id
+    )
     items = [InventoryItemResponse(**r) for r in rows]
-    return {"items": items, "count": len(items)}
+    next_cursor = (
+        _encode_cursor(state, next_after_id) if next_after_id is not None else None
+    )
+    return {"items": items, "count": len(items), "next_cursor": next_cursor}
+
+
+@router.get("/stream")
+async def stream_inventory(
+    state: PieceState = Query(None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_session_factory
+    ),
+):
+    """Stream the full inventory as NDJSON, one item per line."""
+
+    async def ndjson_lines():
+        # The session is opened here because the request's dependencies are
+        # torn down before the response body is sent.
+        async with session_factory() as db:
+            repo = AsyncSqliteInventoryRepository(db)
+            async for batch in repo.iter_batches(
+                state=state, batch_size=STREAM_BATCH_SIZE
+            ):
+                yield "".join(
+                    json.dumps(
+                        {
+                            "set_no": r["set_no"],
+                            "part_no": r["part_no"],
+                            "color_id": r["color_id"],
+                            "qty": r["qty"],
+                            "state": r["state"],
+                        }
+                    )
+                    + "\n"
+                    for r in batch
+                )
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 @router.patch("/", response_model=UpdateInventoryResponse)
 async def update_item(
     req: UpdateStateRequest,
-    repo: SqliteInventoryRepository = Depends(get_inventory_repo),
+    repo: AsyncSqliteInventoryRepository = Depends(get_inventory_repo),
+    write_queue: InventoryWriteQueue | None = Depends(get_write_queue),
 ):
-    updated = repo.update_item(req.part_no, req.color_id, req.qty, req.state)
+    # Group-commit through the shared writer when it is running
+    writer = write_queue if write_queue is not None else repo
+    updated = await writer.update_item(
+        req.part_no, req.color_id, req.qty, req.state, set_no=req.set_no
+    )
     if not updated:
         raise HTTPException(status_code=404, detail="Item not found")
     return {"ok": True}
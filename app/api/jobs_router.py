@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.schemas import JobResponse
+from app.infrastructure.db import AsyncSqliteJobsRepository, get_async_read_db
+
+router = APIRouter()
+
+
+def get_jobs_reader(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> AsyncSqliteJobsRepository:
+    return AsyncSqliteJobsRepository(db)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    jobs_repo: AsyncSqliteJobsRepository = Depends(get_jobs_reader),
+):
+    job = await jobs_repo.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
@@ -1,17 +1,40 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
-from app.core.states import PieceState
+from app.core.states import JobStatus, PieceState
 
 
-class LegoSetResponse(BaseModel):
-    set_no: str
-    name: str
-    assembled: bool
+class JobAcceptedResponse(BaseModel):
+    ok: bool
+    job_id: int
+    status: JobStatus
+
 
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    payload: dict
+    # Handler output once SUCCEEDED, e.g. the added set for add_set jobs
+    result: dict | None = None
+    error: str | None = None
+    attempts: int
+    created_at: datetime
+    updated_at: datetime
 
-class CreateSetResponse(BaseModel):
+
+class BulkSetResult(BaseModel):
+    set_no: str
     ok: bool
-    set: LegoSetResponse
+    name: str | None = None
+    error: str | None = None
+
+
+class BulkCreateSetsResponse(BaseModel):
+    results: list[BulkSetResult]
+    succeeded: int
+    failed: int
 
 
 class InventoryItemResponse(BaseModel):
@@ -25,6 +48,8 @@ class InventoryItemResponse(BaseModel):
 class InventoryListResponse(BaseModel):
     items: list[InventoryItemResponse]
     count: int
+    # Opaque cursor for the next page; None when there are no more rows
+    next_cursor: str | None = None
 
 
 class UpdateInventoryResponse(BaseModel):
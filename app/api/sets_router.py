@@ -1,60 +1,126 @@
+import functools
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.schemas import CreateSetResponse, LegoSetResponse
-from app.core.exceptions import BricklinkAPIError, SetNotFoundError
+from app.api.schemas import BulkCreateSetsResponse, JobAcceptedResponse
+from app.core.catalog_interface import CatalogServiceInterface
 from app.core.services import InventoryService
+from app.core.states import JobStatus
 from app.infrastructure.bricklink_client import BricklinkClient
 from app.infrastructure.db import (
-    SqliteInventoryRepository,
-    SqliteSetsRepository,
-    get_db,
+    AsyncSqliteInventoryRepository,
+    AsyncSqliteJobsRepository,
+    AsyncSqliteSetsRepository,
+    get_async_db,
 )
+from app.infrastructure.job_queue import JobWorkerPool
+from app.infrastructure.rate_limiter import Priority, run_with_priority
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+SET_NO_PATTERN = r"^[0-9A-Za-z-]{3,20}$"
+MAX_BULK_SETS = 1000
+# Catalog fetches in flight during a bulk import
+BULK_FETCH_CONCURRENCY = 8
+
+
 class CreateSetRequest(BaseModel):
-    set_no: str = Field(..., pattern=r"^[0-9A-Za-z-]{3,20}$")
+    set_no: str = Field(..., pattern=SET_NO_PATTERN)
+    assembled: bool = False
+
+
+class BulkCreateSetsRequest(BaseModel):
+    set_nos: list[Annotated[str, Field(pattern=SET_NO_PATTERN)]] = Field(
+        ..., min_length=1, max_length=MAX_BULK_SETS
+    )
     assembled: bool = False
 
 
-def get_bricklink_client() -> BricklinkClient:
-    return BricklinkClient()
+def get_bricklink_client(
+    request: Request,
+) -> CatalogServiceInterface | BricklinkClient:
+    # Built once by the app lifespan so caches and HTTP connections are
+    # shared across requests
+    client: CatalogServiceInterface | BricklinkClient = request.app.state.catalog_client
+    return client
+
 
+def get_job_pool(request: Request) -> JobWorkerPool | None:
+    # Started by the app lifespan; absent when the app runs without it
+    return getattr(request.app.state, "job_pool", None)
 
-def get_sets_repo(db: Session = Depends(get_db)) -> SqliteSetsRepository:
-    return SqliteSetsRepository(db)
 
+def get_jobs_repo(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncSqliteJobsRepository:
+    return AsyncSqliteJobsRepository(db)
 
-def get_inventory_repo(db: Session = Depends(get_db)) -> SqliteInventoryRepository:
-    return SqliteInventoryRepository(db)
+
+def get_sets_repo(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncSqliteSetsRepository:
+    return AsyncSqliteSetsRepository(db)
+
+
+def get_inventory_repo(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncSqliteInventoryRepository:
+    return AsyncSqliteInventoryRepository(db)
 
 
 def get_inventory_service(
-    sets_repo: SqliteSetsRepository = Depends(get_sets_repo),
-    inventory_repo: SqliteInventoryRepository = Depends(get_inventory_repo),
-    bricklink_client: BricklinkClient = Depends(get_bricklink_client),
+    sets_repo: AsyncSqliteSetsRepository = Depends(get_sets_repo),
+    inventory_repo: AsyncSqliteInventoryRepository = Depends(get_inventory_repo),
+    bricklink_client: CatalogServiceInterface | BricklinkClient = Depends(
+        get_bricklink_client
+    ),
 ) -> InventoryService:
     return InventoryService(inventory_repo, sets_repo, bricklink_client)
 
 
-@router.post("/", response_model=CreateSetResponse)
+@router.post("/", response_model=JobAcceptedResponse, status_code=202)
 async def add_set(
     req: CreateSetRequest,
+    response: Response,
+    jobs_repo: AsyncSqliteJobsRepository = Depends(get_jobs_repo),
+    job_pool: JobWorkerPool | None = Depends(get_job_pool),
+):
+    # Importing a set can take many seconds, so it runs as a background job;
+    # poll GET /jobs/{job_id} for the outcome
+    job_id = await jobs_repo.enqueue(
+        "add_set", {"set_no": req.set_no, "assembled": req.assembled}
+    )
+    if job_pool is not None:
+        job_pool.notify()
+    response.headers["Location"] = f"/jobs/{job_id}"
+    return {"ok": True, "job_id": job_id, "status": JobStatus.QUEUED}
+
+
+@router.post("/bulk", response_model=BulkCreateSetsResponse)
+async def add_sets(
+    req: BulkCreateSetsRequest,
     service: InventoryService = Depends(get_inventory_service),
 ):
     try:
-        lego_set = await service.add_set(req.set_no, assembled=req.assembled)
-        return {"ok": True, "set": LegoSetResponse(**lego_set.model_dump())}
-    except SetNotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except BricklinkAPIError as e:
-        raise HTTPException(status_code=502, detail=str(e))
+        results = await service.add_sets(
+            req.set_nos,
+            assembled=req.assembled,
+            concurrency=BULK_FETCH_CONCURRENCY,
+            # Don't hold up users adding single sets
+            run_fetch=functools.partial(run_with_priority, Priority.BACKGROUND),
+        )
     except Exception:
-        logger.exception("Unexpected error in add_set endpoint")
+        logger.exception("Unexpected error in add_sets endpoint")
         raise HTTPException(status_code=500, detail="Internal server error")
+    succeeded = sum(r["ok"] for r in results)
+    return {
+        "results": results,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+    }
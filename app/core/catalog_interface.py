@@ -113,3 +113,6 @@ class CatalogServiceInterface(ABC):
             True if service is healthy, False otherwise
         """
         pass
+
+    async def close(self) -> None:  # noqa: B027 (optional to override)
+        """Release connections and other resources; the default does nothing."""
@@ -5,11 +5,42 @@ The InventoryService orchestrates operations across repositories and
 external catalog services (Bricklink, Rebrickable, etc.).
 """
 
+import asyncio
+import inspect
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
 
-from app.core.exceptions import BricklinkAPIError, SetNotFoundError
+from pydantic import BaseModel
+
+from app.core.exceptions import (
+    BricklinkAPIError,
+    CatalogNotFoundError,
+    SetNotFoundError,
+)
 from app.core.models import LegoSet, Part
 from app.core.states import PieceState
 
+logger = logging.getLogger(__name__)
+
+
+async def _maybe_await(result: Any) -> Any:
+    """Resolve repository results from either the sync or async repositories."""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+def _bulk_result(set_no: str, error: str | None = None) -> dict:
+    return {"set_no": set_no, "ok": False, "name": None, "error": error}
+
+
+def _as_dict(record: Any) -> Any:
+    """Accept catalog results as dicts (BricklinkClient) or catalog models."""
+    if isinstance(record, BaseModel):
+        return record.model_dump()
+    return record
+
 
 class InventoryService:
     def __init__(
@@ -18,36 +49,191 @@ class InventoryService:
         sets_repo,
         bricklink_client,
     ) -> None:
-        self.inventory_repo = inventory_repo  # SqliteInventoryRepository
-        self.sets_repo = sets_repo  # SqliteSetsRepository
-        self.bricklink_client = bricklink_client  # BricklinkClient
+        # Sqlite*Repository or AsyncSqlite*Repository
+        self.inventory_repo = inventory_repo
+        self.sets_repo = sets_repo
+        # BricklinkClient or a CatalogServiceInterface implementation
+        self.bricklink_client = bricklink_client
 
     async def add_set(self, set_no: str, assembled: bool = False) -> LegoSet:
+        set_meta, parts = await self._fetch_catalog(set_no)
+        # The set row is committed together with its parts by add_parts,
+        # so a failed import never leaves a set without inventory.
+        return await self._write_set(set_no, set_meta, parts, assembled)
+
+    async def add_sets(
+        self,
+        set_nos: list[str],
+        assembled: bool = False,
+        concurrency: int = 8,
+        batch_size: int = 20,
+        run_fetch: (
+            Callable[[Callable[[], Awaitable[Any]]], Awaitable[Any]] | None
+        ) = None,
+    ) -> list[dict]:
+        """
+        Import many sets, reporting success or failure per set.
+
+        Catalog data is fetched for up to `concurrency` sets at a time while
+        sets already fetched are written in batches of up to `batch_size`
+        sets per transaction. If a batch fails to commit, its sets are
+        retried one transaction each so one bad set cannot fail the rest.
+
+        Args:
+            set_nos: Set numbers to import; duplicates are imported once
+            assembled: Whether the sets are assembled
+            concurrency: Maximum catalog fetches in flight
+            batch_size: Maximum sets written per transaction
+            run_fetch: Optional wrapper each set's catalog fetch is run
+                through, e.g. to lower its rate limit priority
+
+        Returns:
+            One {"set_no", "ok", "name", "error"} dict per distinct set
+            number, in request order
+        """
+        results: dict[str, dict] = {}
+        pending: list[str] = []
+        for set_no in dict.fromkeys(set_nos):
+            if await _maybe_await(self.sets_repo.get(set_no)) is not None:
+                results[set_no] = _bulk_result(set_no, error="Set already added")
+            else:
+                results[set_no] = _bulk_result(set_no)
+                pending.append(set_no)
+
+        # End the check's transaction (the repositories share one session) so
+        # the write connection is not held while the catalog is fetched
+        await _maybe_await(self.inventory_repo.rollback())
+
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=batch_size * 2)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(set_no: str) -> None:
+            async with semaphore:
+                try:
+                    if run_fetch is None:
+                        outcome: Any = await self._fetch_catalog(set_no)
+                    else:
+                        outcome = await run_fetch(lambda: self._fetch_catalog(set_no))
+                except Exception as e:  # mapped by _fetch_catalog
+                    outcome = e
+            await fetched.put((set_no, outcome))
+
+        fetchers = [asyncio.create_task(fetch(set_no)) for set_no in pending]
         try:
-            set_meta = await self.bricklink_client.fetch_set_metadata(set_no)
-        except Exception as e:  # refine with real client errors later
-            raise BricklinkAPIError(f"Failed to fetch set metadata: {e}") from e
+            remaining = len(pending)
+            while remaining:
+                batch = [await fetched.get()]
+                while len(batch) < batch_size and not fetched.empty():
+                    batch.append(fetched.get_nowait())
+                remaining -= len(batch)
 
-        if not set_meta or not set_meta.get("name"):
-            raise SetNotFoundError(f"Set '{set_no}' not found")
+                to_write = []
+                for set_no, outcome in batch:
+                    if isinstance(outcome, Exception):
+                        results[set_no]["error"] = str(outcome)
+                    else:
+                        to_write.append((set_no, *outcome))
+                await self._write_batch(to_write, assembled, results)
+        finally:
+            for task in fetchers:
+                task.cancel()
+        return list(results.values())
 
+    async def _write_batch(
+        self,
+        batch: list[tuple[str, dict, list[dict]]],
+        assembled: bool,
+        results: dict[str, dict],
+    ) -> None:
+        """Write fetched sets in one transaction, or one by one if that fails."""
+        if not batch:
+            return
         try:
-            parts = await self.bricklink_client.fetch_set_inventory(set_no)
-        except Exception as e:
-            raise BricklinkAPIError(f"Failed to fetch inventory: {e}") from e
+            for set_no, set_meta, parts in batch:
+                await self._write_set(set_no, set_meta, parts, assembled, commit=False)
+            await _maybe_await(self.inventory_repo.commit())
+        except Exception:
+            await _maybe_await(self.inventory_repo.rollback())
+            if len(batch) > 1:
+                for item in batch:
+                    await self._write_batch([item], assembled, results)
+                return
+            logger.exception(f"Failed to write set {batch[0][0]}")
+            results[batch[0][0]]["error"] = "Failed to save set"
+            return
+        for set_no, set_meta, _ in batch:
+            results[set_no].update(ok=True, name=set_meta["name"])
 
+    async def _write_set(
+        self,
+        set_no: str,
+        set_meta: dict,
+        parts: list[dict],
+        assembled: bool,
+        commit: bool = True,
+    ) -> LegoSet:
+        """Add a set row and its parts; with commit=False the caller commits."""
         lego_set = LegoSet(
             set_no=set_no, name=set_meta.get("name", ""), assembled=assembled
         )
-        self.sets_repo.add(lego_set)
         state = PieceState.OWNED_LOCKED if assembled else PieceState.OWNED_FREE
-        for p in parts:
-            part = Part(
-                part_no=p["part_no"],
-                color_id=p["color_id"],
-                name=p.get("name", ""),
-            )
-            self.inventory_repo.add_part(
-                lego_set.set_no, part, qty=p.get("qty", 1), state=state
+        await _maybe_await(self.sets_repo.add(lego_set, commit=False))
+        await _maybe_await(
+            self.inventory_repo.add_parts(
+                lego_set.set_no,
+                (
+                    (
+                        Part(
+                            part_no=p["part_no"],
+                            color_id=p["color_id"],
+                            name=p.get("name", ""),
+                        ),
+                        p.get("qty", 1),
+                    )
+                    for p in parts
+                ),
+                state=state,
+                commit=commit,
             )
+        )
         return lego_set
+
+    async def _fetch_catalog(self, set_no: str) -> tuple[dict, list[dict]]:
+        """
+        Fetch a set's metadata and inventory concurrently.
+
+        The inventory request starts alongside the metadata request and is
+        cancelled if the metadata lookup fails or finds no such set.
+
+        Raises:
+            SetNotFoundError: If the catalog has no such set
+            BricklinkAPIError: If either catalog request fails
+        """
+        inventory = asyncio.ensure_future(
+            self.bricklink_client.fetch_set_inventory(set_no)
+        )
+        try:
+            try:
+                set_meta = _as_dict(
+                    await self.bricklink_client.fetch_set_metadata(set_no)
+                )
+            except CatalogNotFoundError as e:
+                raise SetNotFoundError(f"Set '{set_no}' not found") from e
+            except Exception as e:  # refine with real client errors later
+                raise BricklinkAPIError(f"Failed to fetch set metadata: {e}") from e
+
+            if not set_meta or not set_meta.get("name"):
+                raise SetNotFoundError(f"Set '{set_no}' not found")
+        except BaseException:
+            inventory.cancel()
+            if inventory.done() and not inventory.cancelled():
+                inventory.exception()  # already failed; don't warn about it
+            raise
+
+        try:
+            parts = [_as_dict(p) for p in await inventory]
+        except CatalogNotFoundError as e:
+            raise SetNotFoundError(f"Set '{set_no}' not found") from e
+        except Exception as e:
+            raise BricklinkAPIError(f"Failed to fetch inventory: {e}") from e
+        return set_meta, parts
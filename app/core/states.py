@@ -5,3 +5,10 @@ class PieceState(str, Enum):
     MISSING = "MISSING"
     OWNED_LOCKED = "OWNED_LOCKED"
     OWNED_FREE = "OWNED_FREE"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
@@ -7,10 +7,18 @@ CatalogServiceInterface for interacting with Bricklink API v3.
 API Documentation: https://www.bricklink.com/v3/api.page
 """
 
+import asyncio
+import inspect
 import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, NamedTuple, TypeVar
 
+import aiohttp
 import requests
-from cachetools import TTLCache
+from cachetools import Cache, TLRUCache, TTLCache
 
 from app.core.catalog_interface import (
     CatalogServiceInterface,
@@ -23,12 +31,98 @@ from app.core.exceptions import (
     CatalogAuthError,
     CatalogNotFoundError,
     CatalogRateLimitError,
+    CatalogServiceError,
     CatalogTimeoutError,
 )
-from app.infrastructure.oauth_client import OAuthHTTPClient
+from app.infrastructure.cache_manager import CacheManager
+from app.infrastructure.catalog_disk_cache import CatalogDiskCache
+from app.infrastructure.circuit_breaker import CircuitBreaker
+from app.infrastructure.compact_inventory import CompactInventory, construct_part
+from app.infrastructure.oauth_client import AsyncOAuthHTTPClient, OAuthHTTPClient
+from app.infrastructure.rate_limiter import (
+    CatalogRateLimiter,
+    Priority,
+    catalog_priority,
+    run_with_priority,
+)
+from app.infrastructure.tinylfu import WTinyLFUCache
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+class CacheEntry(NamedTuple):
+    """
+    A cached catalog value with its soft and hard expiry (time.monotonic()).
+
+    Past soft_expires the value is still served but a refresh is started;
+    past hard_expires it is dropped from the cache.
+    """
+
+    value: Any
+    soft_expires: float
+    hard_expires: float
+
+
+@dataclass
+class _Flight(Generic[T]):
+    """An upstream request shared by the callers waiting on it."""
+
+    task: asyncio.Task[T]
+    priority: Priority
+    waiters: int = 0
+    # Background refreshes run for the cache itself, not for any caller
+    detached: bool = False
+
+
+def _entry_expiry(key: str, entry: CacheEntry, now: float) -> float:
+    """TLRUCache time-to-use function: entries live until their hard expiry."""
+    return entry.hard_expires
+
+
+# In-memory cache implementations selectable with cache_policy
+CACHE_POLICIES: dict[str, type[Cache]] = {
+    "tlru": TLRUCache,
+    "wtinylfu": WTinyLFUCache,
+}
+
+
+def parse_subsets(response: dict, validate: bool = False) -> list[InventoryPart]:
+    """
+    Extract the parts from a Bricklink subsets response.
+
+    Only entries whose item type is PART are kept. By default parts are built
+    without Pydantic validation, trusting Bricklink's field types; that roughly
+    halves the parse time of a large inventory, which matters on a Pi.
+
+    Args:
+        response: Decoded JSON of GET /items/SET/{no}/subsets
+        validate: Build parts through InventoryPart validation instead, so
+            malformed responses fail loudly (debugging aid)
+
+    Returns:
+        Parts in response order
+    """
+    build = InventoryPart if validate else construct_part
+    parts = []
+    for entry in response.get("data", []):
+        for item in entry.get("entries", []):
+            info = item.get("item") or {}
+            if info.get("type") != "PART":
+                continue
+            parts.append(
+                build(
+                    part_no=info.get("no", ""),
+                    color_id=item.get("color_id", 0),
+                    qty=item.get("quantity", 1),
+                    name=info.get("name", ""),
+                    is_spare=item.get("is_alternate", False),
+                    is_counterpart=item.get("is_counterpart", False),
+                )
+            )
+    return parts
+
 
 class BricklinkCatalogService(CatalogServiceInterface):
     """
@@ -42,9 +136,18 @@ class BricklinkCatalogService(CatalogServiceInterface):
 
     def __init__(
         self,
-        oauth_client: OAuthHTTPClient,
+        oauth_client: OAuthHTTPClient | AsyncOAuthHTTPClient,
         cache_ttl: int = 86400,  # 24 hours
         max_cache_size: int = 100,  # Tuned for Raspberry Pi memory constraints
+        disk_cache: CatalogDiskCache | None = None,
+        soft_ttl_ratio: float = 0.8,
+        ttl_jitter: float = 0.1,
+        rate_limiter: CatalogRateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        validate_responses: bool = False,
+        cache_manager: CacheManager | None = None,
+        cache_policy: str = "tlru",
+        not_found_ttl: float = 600,
     ):
         """
         Initialize Bricklink catalog service.
@@ -52,21 +155,82 @@ class BricklinkCatalogService(CatalogServiceInterface):
         Args:
             oauth_client: Configured OAuth HTTP client
             cache_ttl: Cache time-to-live in seconds (default 24h)
-            max_cache_size: Maximum number of items in each cache (default 100)
+            max_cache_size: Maximum number of items in each cache (default
+                100); ignored when cache_manager is given
+            disk_cache: Optional persistent cache consulted on memory misses
+            soft_ttl_ratio: Fraction of the TTL after which a cached value is
+                served stale while it is refreshed in the background
+            ttl_jitter: Random +/- fraction applied to each entry's TTL so
+                entries cached together do not all expire together
+            rate_limiter: Optional limiter every Bricklink call must pass
+            circuit_breaker: Optional breaker that fails calls fast while
+                Bricklink is down or unusually slow
+            validate_responses: Validate every parsed part with Pydantic
+                instead of trusting Bricklink's types (slower; for debugging)
+            cache_manager: Optional shared byte budget for the in-memory
+                caches, replacing the per-cache entry limits
+            cache_policy: Eviction policy of the in-memory caches: "tlru"
+                (least recently used) or "wtinylfu" (frequency-aware and
+                resistant to bulk imports and warm-up scans)
+            not_found_ttl: Seconds a set number Bricklink answered 404 for is
+                reported as not found without asking again (0 disables)
         """
         self.oauth_client = oauth_client
         self.cache_ttl = cache_ttl
+        self.disk_cache = disk_cache
+        self.soft_ttl_ratio = soft_ttl_ratio
+        self.ttl_jitter = ttl_jitter
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.validate_responses = validate_responses
+        self.cache_manager = cache_manager
+
+        if cache_policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy: {cache_policy}")
+        cache_class = CACHE_POLICIES[cache_policy]
+
+        if cache_manager is not None:
+            # Sized in bytes against one budget shared by both caches
+            self.metadata_cache = cache_manager.timed_cache(
+                "metadata", _entry_expiry, cache_class=cache_class
+            )
+            self.inventory_cache = cache_manager.timed_cache(
+                "inventory", _entry_expiry, cache_class=cache_class
+            )
+        else:
+            # Cache for set metadata (keyed by set_no)
+            # Reduced size for Raspberry Pi deployment
+            self.metadata_cache = cache_class(
+                maxsize=max_cache_size, ttu=_entry_expiry, timer=time.monotonic
+            )
 
-        # Cache for set metadata (keyed by set_no)
-        # Reduced size for Raspberry Pi deployment
-        self.metadata_cache = TTLCache(maxsize=max_cache_size, ttl=cache_ttl)
+            # Cache for set inventory (keyed by set_no), held as
+            # CompactInventory so a large set costs a few hundred KB
+            self.inventory_cache = cache_class(
+                maxsize=max_cache_size, ttu=_entry_expiry, timer=time.monotonic
+            )
 
-        # Cache for set inventory (keyed by set_no)
-        # Inventory data is larger, so use smaller cache
-        self.inventory_cache = TTLCache(
-            maxsize=max_cache_size // 2, ttl=cache_ttl * 7  # 7 days
+        # Set numbers Bricklink does not know (typos, scanner misreads), so
+        # repeated lookups do not spend quota; short-lived in case the set
+        # is added to the catalog later
+        self.not_found_ttl = not_found_ttl
+        self.not_found_cache = TTLCache(
+            maxsize=1024, ttl=not_found_ttl, timer=time.monotonic
         )
 
+        self._caches = {
+            "metadata": self.metadata_cache,
+            "inventory": self.inventory_cache,
+        }
+        self._ttls = {
+            "metadata": cache_ttl,
+            "inventory": cache_ttl * 7,  # 7 days
+        }
+
+        # Upstream requests currently running, keyed by (kind, set_no), so
+        # concurrent cache misses for the same set share one API call
+        self._inflight: dict[tuple[str, str], _Flight[Any]] = {}
+
     async def search_sets(self, query: str, limit: int = 20) -> list[SetSearchResult]:
         """
         Search for sets in Bricklink catalog.
@@ -102,7 +266,7 @@ class BricklinkCatalogService(CatalogServiceInterface):
             # A real implementation might need to use /items/SET endpoint differently
             # or implement custom search logic
 
-            response = await self.oauth_client.get(url, params=params)
+            response = await self._get(url, params=params)
 
             results = []
             for item in response.get("data", [])[:limit]:
@@ -141,16 +305,35 @@ class BricklinkCatalogService(CatalogServiceInterface):
             CatalogAPIError: If API request fails
         """
         # Check cache first
-        if set_no in self.metadata_cache:
-            logger.debug(f"Cache hit for set metadata: {set_no}")
-            return self.metadata_cache[set_no]
+        metadata = self._cache_get(
+            "metadata", set_no, lambda: self._fetch_set_metadata(set_no)
+        )
+        if metadata is not None:
+            return metadata
+        self._check_not_found(set_no)
 
+        return await self._single_flight(
+            ("metadata", set_no), lambda: self._load_set_metadata(set_no)
+        )
+
+    async def _load_set_metadata(self, set_no: str) -> SetMetadata:
+        """Load set metadata from the disk cache, or else from Bricklink."""
+        cached = await self._disk_get("metadata", set_no)
+        if cached is not None:
+            value, remaining = cached
+            metadata = SetMetadata.model_validate(value)
+            self._remember("metadata", set_no, metadata, remaining)
+            return metadata
+        return await self._fetch_set_metadata(set_no)
+
+    async def _fetch_set_metadata(self, set_no: str) -> SetMetadata:
+        """Fetch set metadata from Bricklink and cache it in both tiers."""
         try:
             # GET /items/{type}/{no}
             url = f"{self.BASE_URL}/items/SET/{set_no}"
 
             logger.info(f"Fetching metadata for set: {set_no}")
-            response = await self.oauth_client.get(url)
+            response = await self._get(url)
 
             data = response.get("data", {})
 
@@ -166,13 +349,13 @@ class BricklinkCatalogService(CatalogServiceInterface):
             )
 
             # Cache the result
-            self.metadata_cache[set_no] = metadata
+            await self._store("metadata", set_no, metadata, metadata.model_dump())
 
             return metadata
 
         except Exception as e:
             logger.error(f"Failed to fetch metadata for {set_no}: {e}")
-            raise self._convert_exception(e)
+            raise self._not_found_aware(set_no, e)
 
     async def fetch_set_inventory(self, set_no: str) -> list[InventoryPart]:
         """
@@ -192,10 +375,34 @@ class BricklinkCatalogService(CatalogServiceInterface):
             CatalogAPIError: If API request fails
         """
         # Check cache first
-        if set_no in self.inventory_cache:
-            logger.debug(f"Cache hit for set inventory: {set_no}")
-            return self.inventory_cache[set_no]
+        cached = self._cache_get(
+            "inventory", set_no, lambda: self._fetch_set_inventory(set_no)
+        )
+        if cached is not None:
+            return cached.to_parts()
+        self._check_not_found(set_no)
 
+        return await self._single_flight(
+            ("inventory", set_no), lambda: self._load_set_inventory(set_no)
+        )
+
+    async def _load_set_inventory(self, set_no: str) -> list[InventoryPart]:
+        """Load a set's inventory from the disk cache, or else from Bricklink."""
+        cached = await self._disk_get("inventory", set_no)
+        if cached is not None:
+            value, remaining = cached
+            if self.validate_responses:
+                parts = [InventoryPart.model_validate(p) for p in value]
+            else:  # written by _fetch_set_inventory from parsed parts
+                parts = [construct_part(**p) for p in value]
+            self._remember(
+                "inventory", set_no, CompactInventory.from_parts(parts), remaining
+            )
+            return parts
+        return await self._fetch_set_inventory(set_no)
+
+    async def _fetch_set_inventory(self, set_no: str) -> list[InventoryPart]:
+        """Fetch a set's inventory from Bricklink and cache it in both tiers."""
         try:
             # GET /items/{type}/{no}/subsets
             url = f"{self.BASE_URL}/items/SET/{set_no}/subsets"
@@ -208,35 +415,234 @@ class BricklinkCatalogService(CatalogServiceInterface):
                 "break_subsets": "true",  # Break down subsets
             }
 
-            response = await self.oauth_client.get(url, params=params)
-
-            # Parse parts from response
-            parts = []
-            for entry in response.get("data", []):
-                for item in entry.get("entries", []):
-                    # Only include actual parts (type 'PART')
-                    if item.get("item", {}).get("type") == "PART":
-                        parts.append(
-                            InventoryPart(
-                                part_no=item.get("item", {}).get("no", ""),
-                                color_id=item.get("color_id", 0),
-                                qty=item.get("quantity", 1),
-                                name=item.get("item", {}).get("name", ""),
-                                is_spare=item.get("is_alternate", False),
-                                is_counterpart=item.get("is_counterpart", False),
-                            )
-                        )
+            response = await self._get(url, params=params)
+
+            parts = parse_subsets(response, validate=self.validate_responses)
 
             logger.info(f"Retrieved {len(parts)} parts for set {set_no}")
 
             # Cache the result
-            self.inventory_cache[set_no] = parts
+            await self._store(
+                "inventory",
+                set_no,
+                CompactInventory.from_parts(parts),
+                [p.model_dump() for p in parts],
+            )
 
             return parts
 
         except Exception as e:
             logger.error(f"Failed to fetch inventory for {set_no}: {e}")
-            raise self._convert_exception(e)
+            raise self._not_found_aware(set_no, e)
+
+    async def _get(self, url: str, params: dict | None = None) -> dict:
+        """GET from Bricklink through the circuit breaker and rate limiter."""
+        acquire = self.rate_limiter.acquire if self.rate_limiter is not None else None
+        if self.circuit_breaker is None:
+            if acquire is not None:
+                await acquire()
+            return await self.oauth_client.get(url, params=params)
+        # The breaker admits the call before a rate limit token is spent on it
+        return await self.circuit_breaker.call(
+            lambda: self.oauth_client.get(url, params=params),
+            is_failure=self._is_outage,
+            before=acquire,
+        )
+
+    def _is_outage(self, exc: Exception) -> bool:
+        """Whether an error means Bricklink is failing (not e.g. a 404)."""
+        return isinstance(
+            self._convert_exception(exc), CatalogAPIError | CatalogTimeoutError
+        )
+
+    def _cache_get(
+        self, kind: str, set_no: str, refresh: Callable[[], Awaitable[Any]]
+    ) -> Any | None:
+        """
+        Return a value from the memory cache, refreshing it if stale.
+
+        A value past its soft expiry is returned as-is and refresh() is
+        started in the background (unless a fetch for it is already running),
+        so callers never wait on upstream latency for a cached set.
+
+        Args:
+            kind: "metadata" or "inventory"
+            set_no: LEGO set number
+            refresh: Coroutine function re-fetching the value from Bricklink
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        entry = self._caches[kind].get(set_no)
+        if entry is None:
+            return None
+        logger.debug(f"Cache hit for set {kind}: {set_no}")
+        key = (kind, set_no)
+        if time.monotonic() >= entry.soft_expires and key not in self._inflight:
+            logger.info(f"Refreshing stale {kind} for set {set_no} in background")
+            self._start_flight(key, refresh, Priority.BACKGROUND, detached=True)
+        return entry.value
+
+    def _check_not_found(self, set_no: str) -> None:
+        """Raise CatalogNotFoundError if Bricklink recently 404'd set_no."""
+        if self.not_found_ttl > 0 and set_no in self.not_found_cache:
+            logger.debug(f"Negative cache hit for set: {set_no}")
+            raise CatalogNotFoundError(
+                f"Set not found in Bricklink catalog: {set_no} (cached)"
+            )
+
+    def _not_found_aware(self, set_no: str, exc: Exception) -> Exception:
+        """Convert exc, remembering set_no if Bricklink does not know it."""
+        error = self._convert_exception(exc)
+        if isinstance(error, CatalogNotFoundError) and self.not_found_ttl > 0:
+            self.not_found_cache[set_no] = True
+        return error
+
+    def purge_not_found(self, set_no: str | None = None) -> int:
+        """
+        Forget cached not-found results, e.g. once a new set is catalogued.
+
+        Args:
+            set_no: Set number to forget (default: all of them)
+
+        Returns:
+            Number of entries removed
+        """
+        if set_no is None:
+            count = len(self.not_found_cache)
+            self.not_found_cache.clear()
+        else:
+            count = int(self.not_found_cache.pop(set_no, None) is not None)
+        if count:
+            logger.info(f"Purged {count} cached not-found set numbers")
+        return count
+
+    def _jittered_ttl(self, kind: str) -> float:
+        """Return the hard TTL for a new entry of this kind, with jitter."""
+        jitter = random.uniform(-self.ttl_jitter, self.ttl_jitter)
+        return self._ttls[kind] * (1 + jitter)
+
+    def _remember(self, kind: str, set_no: str, value: Any, ttl: float) -> None:
+        """
+        Put a value in the memory cache with ttl seconds left to live.
+
+        The stale-while-revalidate window (the last 1 - soft_ttl_ratio of the
+        kind's TTL) sits at the end of the entry's life.
+        """
+        now = time.monotonic()
+        stale_window = self._ttls[kind] * (1 - self.soft_ttl_ratio)
+        self._caches[kind][set_no] = CacheEntry(
+            value, now + ttl - stale_window, now + ttl
+        )
+
+    async def _store(self, kind: str, set_no: str, value: Any, raw: Any) -> None:
+        """Cache a freshly fetched value in memory and on disk."""
+        self.not_found_cache.pop(set_no, None)
+        ttl = self._jittered_ttl(kind)
+        self._remember(kind, set_no, value, ttl)
+        await self._disk_set(kind, set_no, raw, ttl)
+
+    async def _disk_get(self, kind: str, set_no: str) -> tuple[Any, float] | None:
+        """Read an entry and its remaining TTL from the disk cache, if any."""
+        if self.disk_cache is None:
+            return None
+        try:
+            entry = await asyncio.to_thread(self.disk_cache.get_entry, kind, set_no)
+        except Exception as e:
+            logger.warning(f"Catalog disk cache read failed for {kind} {set_no}: {e}")
+            return None
+        if entry is not None:
+            logger.debug(f"Disk cache hit for set {kind}: {set_no}")
+        return entry
+
+    async def _disk_set(self, kind: str, set_no: str, value: Any, ttl: float) -> None:
+        """Write an entry to the disk cache; failures are logged, not raised."""
+        if self.disk_cache is None:
+            return
+        try:
+            await asyncio.to_thread(self.disk_cache.set, kind, set_no, value, ttl)
+        except Exception as e:
+            logger.warning(f"Catalog disk cache write failed for {kind} {set_no}: {e}")
+
+    async def _single_flight(
+        self, key: tuple[str, str], load: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Share one upstream request between concurrent callers for a key.
+
+        The first caller starts load() as a task; callers arriving while it
+        runs await the same task, so all of them get its result or its
+        exception. One caller being cancelled does not abort the request for
+        the others, but once every caller waiting on it has been cancelled
+        the request is cancelled too (background refreshes excepted).
+
+        The request runs at the priority of the caller that started it. If a
+        lower-priority request fails on the rate limit (e.g. a cache warm-up
+        joined by a user adding a set hits the background share of the daily
+        quota), higher-priority callers retry at their own priority.
+
+        Args:
+            key: (kind, set_no) identifying the request
+            load: Coroutine function performing the upstream fetch
+
+        Returns:
+            load()'s result
+        """
+        priority = catalog_priority.get()
+        flight = self._start_flight(key, load)
+        try:
+            return await self._await_flight(key, flight)
+        except CatalogRateLimitError:
+            if flight.priority <= priority:
+                raise
+            logger.info(
+                f"Retrying {key[0]} for set {key[1]} at {priority.name.lower()}"
+                " priority after the shared request hit the rate limit"
+            )
+            return await self._await_flight(key, self._start_flight(key, load))
+
+    async def _await_flight(self, key: tuple[str, str], flight: _Flight[T]) -> T:
+        """Wait for a shared request, cancelling it if no one else is waiting."""
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.detached and not flight.task.done():
+                logger.debug(f"Cancelling abandoned request for {key[0]}: {key[1]}")
+                flight.task.cancel()
+
+    def _start_flight(
+        self,
+        key: tuple[str, str],
+        load: Callable[[], Awaitable[T]],
+        priority: Priority | None = None,
+        detached: bool = False,
+    ) -> _Flight[T]:
+        """
+        Return the running request for key, starting load() if there is none.
+
+        A new request runs at the given priority (default: the caller's).
+        """
+        flight = self._inflight.get(key)
+        if flight is None or flight.task.done():
+            if priority is None:
+                priority = catalog_priority.get()
+            task = asyncio.ensure_future(run_with_priority(priority, load))
+            flight = _Flight(task, priority, detached=detached)
+            self._inflight[key] = flight
+            task.add_done_callback(lambda t: self._inflight_done(key, t))
+        else:
+            logger.debug(f"Joining in-flight request for {key[0]}: {key[1]}")
+        return flight
+
+    def _inflight_done(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        flight = self._inflight.get(key)
+        if flight is not None and flight.task is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter was cancelled
+            task.exception()
 
     async def health_check(self) -> bool:
         """
@@ -248,7 +654,7 @@ class BricklinkCatalogService(CatalogServiceInterface):
         try:
             # Try to access a simple endpoint
             url = f"{self.BASE_URL}/items/SET/75192"  # Known set
-            await self.oauth_client.get(url)
+            await run_with_priority(Priority.BACKGROUND, lambda: self._get(url))
             return True
         except Exception as e:
             logger.warning(f"Bricklink health check failed: {e}")
@@ -264,8 +670,14 @@ class BricklinkCatalogService(CatalogServiceInterface):
         Returns:
             Catalog-specific exception
         """
-        if isinstance(exc, requests.exceptions.HTTPError):
-            status_code = exc.response.status_code
+        if isinstance(exc, CatalogServiceError):
+            return exc
+
+        if isinstance(exc, requests.exceptions.HTTPError | aiohttp.ClientResponseError):
+            if isinstance(exc, aiohttp.ClientResponseError):
+                status_code = exc.status
+            else:
+                status_code = exc.response.status_code
 
             if status_code == 401 or status_code == 403:
                 return CatalogAuthError(f"Bricklink authentication failed: {exc}")
@@ -280,17 +692,36 @@ class BricklinkCatalogService(CatalogServiceInterface):
                     f"Bricklink API error (status {status_code}): {exc}"
                 )
 
-        elif isinstance(exc, requests.exceptions.Timeout):
+        elif isinstance(exc, requests.exceptions.Timeout | TimeoutError):
             return CatalogTimeoutError(f"Bricklink request timed out: {exc}")
 
-        elif isinstance(exc, (requests.exceptions.ConnectionError, ConnectionError)):
+        elif isinstance(
+            exc,
+            requests.exceptions.ConnectionError
+            | aiohttp.ClientConnectionError
+            | ConnectionError,
+        ):
             return CatalogAPIError(f"Failed to connect to Bricklink: {exc}")
 
         else:
             return CatalogAPIError(f"Bricklink API error: {exc}")
 
+    async def close(self) -> None:
+        """Cancel background fetches and close the HTTP client and caches."""
+        for flight in list(self._inflight.values()):
+            flight.task.cancel()
+        result = self.oauth_client.close()
+        if inspect.isawaitable(result):
+            await result
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+        logger.info("Bricklink catalog service closed")
+
     def clear_cache(self) -> None:
-        """Clear all cached data."""
+        """Clear all cached data, including the disk cache."""
         self.metadata_cache.clear()
         self.inventory_cache.clear()
+        self.not_found_cache.clear()
+        if self.disk_cache is not None:
+            self.disk_cache.clear()
         logger.info("Bricklink cache cleared")
@@ -15,3 +15,6 @@ class BricklinkClient:
             {"part_no": "3001", "color_id": 1, "qty": 4, "name": "Brick 2 x 4"},
             {"part_no": "3020", "color_id": 1, "qty": 2, "name": "Plate 2 x 4"},
         ]
+
+    async def close(self) -> None:
+        return None
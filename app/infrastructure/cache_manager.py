@@ -0,0 +1,195 @@
+"""
+One memory budget shared by all in-memory catalog caches.
+
+Sizing caches by entry count makes memory use depend on which sets are hot:
+a 7,500-part inventory weighs about a thousand times as much as a polybag's.
+CacheManager instead measures each entry's approximate size in bytes and
+keeps the total across every cache it manages under a single budget, so
+memory use on the Pi stays predictable.
+
+When an insert takes the total over budget, entries are evicted from the
+cache currently holding the most bytes, least recently used first. Large
+inventories are therefore evicted before the small metadata entries that
+almost every request needs.
+"""
+
+import logging
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from cachetools import Cache, TLRUCache
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+def approx_size(value: Any) -> int:
+    """
+    Estimate the memory held by a cached value, in bytes.
+
+    Objects with an nbytes() method (e.g. CompactInventory) report their own
+    size. Containers, tuples (including CacheEntry) and Pydantic models are
+    measured recursively; anything else counts as sys.getsizeof().
+
+    Args:
+        value: Value to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if callable(nbytes):
+        return int(nbytes())
+    size = sys.getsizeof(value)
+    if isinstance(value, str | bytes | bytearray | int | float | bool | None):
+        return size
+    if isinstance(value, dict):
+        return size + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, list | tuple | set | frozenset):
+        return size + sum(approx_size(item) for item in value)
+    if isinstance(value, BaseModel):
+        return size + approx_size(value.__dict__)
+    return size
+
+
+class _BudgetedCache(Cache):
+    """Mixin for byte-sized caches that enforce their manager's budget."""
+
+    manager: "CacheManager"
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        try:
+            super().__setitem__(key, value)
+        except ValueError:
+            logger.warning(
+                f"Not caching {key}: larger than the whole cache budget"
+                f" ({self.manager.max_bytes} bytes)"
+            )
+            return
+        self.manager.enforce()
+
+
+# Budgeted subclass of each cache class, created on first use
+_budgeted_classes: dict[type[Cache], type[_BudgetedCache]] = {}
+
+
+def _budgeted(cache_class: type[Cache]) -> type[_BudgetedCache]:
+    budgeted = _budgeted_classes.get(cache_class)
+    if budgeted is None:
+        budgeted = type(
+            f"Budgeted{cache_class.__name__}", (_BudgetedCache, cache_class), {}
+        )
+        _budgeted_classes[cache_class] = budgeted
+    return budgeted
+
+
+class CacheManager:
+    """
+    Enforces a shared byte budget across named caches.
+
+    Caches built with timed_cache() enforce the budget on every insert. Other
+    cachetools caches can be added with register(), provided they were built
+    with getsizeof=manager.sizeof; call enforce() after inserting into them.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        sizeof: Callable[[Any], int] = approx_size,
+    ):
+        """
+        Initialize an empty manager.
+
+        Args:
+            max_bytes: Budget for the approximate size of all cached entries
+            sizeof: Function estimating an entry's size in bytes
+        """
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._caches: dict[str, Cache] = {}
+
+    def timed_cache(
+        self,
+        name: str,
+        ttu: Callable[[Any, Any, float], float],
+        timer: Callable[[], float] = time.monotonic,
+        cache_class: type[Cache] = TLRUCache,
+    ) -> Cache:
+        """
+        Create and register a cache with per-entry expiry bounded by the budget.
+
+        Args:
+            name: Name the cache is reported under
+            ttu: TLRUCache time-to-use function
+            timer: Clock for expiry
+            cache_class: TLRUCache, or a class with the same constructor
+                (e.g. WTinyLFUCache)
+
+        Returns:
+            The new cache
+        """
+        cache = _budgeted(cache_class)(
+            maxsize=self.max_bytes, ttu=ttu, timer=timer, getsizeof=self.sizeof
+        )
+        cache.manager = self
+        return self.register(name, cache)
+
+    def register(self, name: str, cache: Cache) -> Cache:
+        """
+        Put an existing cache under the shared budget.
+
+        Args:
+            name: Name the cache is reported under
+            cache: cachetools cache sized with this manager's sizeof
+
+        Returns:
+            The cache, for chaining
+        """
+        if name in self._caches:
+            raise ValueError(f"Cache {name!r} is already registered")
+        self._caches[name] = cache
+        return cache
+
+    def used_bytes(self) -> int:
+        """Approximate bytes held by all managed caches."""
+        return sum(cache.currsize for cache in self._caches.values())
+
+    def enforce(self) -> int:
+        """
+        Evict entries until the managed caches fit the budget.
+
+        Returns:
+            Number of entries evicted
+        """
+        evicted = 0
+        while self.used_bytes() > self.max_bytes:
+            largest = max(self._caches.values(), key=lambda c: c.currsize)
+            try:
+                largest.popitem()
+            except KeyError:  # only expired entries were left
+                break
+            evicted += 1
+        if evicted:
+            logger.debug(f"Evicted {evicted} catalog cache entries to fit budget")
+        return evicted
+
+    def occupancy(self) -> dict[str, Any]:
+        """
+        Describe current memory use.
+
+        Returns:
+            Dict with the budget, bytes used in total, and entries and bytes
+            per cache (plus hit statistics for caches that keep them)
+        """
+        caches = {}
+        for name, cache in self._caches.items():
+            caches[name] = {"entries": len(cache), "bytes": cache.currsize}
+            if hasattr(cache, "stats"):
+                caches[name].update(cache.stats())
+        return {
+            "max_bytes": self.max_bytes,
+            "used_bytes": self.used_bytes(),
+            "caches": caches,
+        }
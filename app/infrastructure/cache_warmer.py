@@ -0,0 +1,67 @@
+"""
+Background pre-warming of the catalog caches after startup.
+
+The sets table already lists the sets users care about, so right after a
+restart we walk it and fetch each set's metadata and inventory through the
+catalog client. Hits come from the disk cache when it has them; misses go to
+Bricklink at background priority, so the rate limiter serves interactive
+requests first and the warm-up never spends the interactive quota reserve.
+"""
+
+import logging
+from functools import partial
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.exceptions import CatalogRateLimitError
+from app.infrastructure.db import AsyncSqliteSetsRepository
+from app.infrastructure.rate_limiter import Priority, run_with_priority
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_catalog_cache(
+    catalog_client,
+    session_factory: async_sessionmaker[AsyncSession],
+    limit: int | None = 100,
+) -> int:
+    """
+    Load owned sets into the catalog caches, most recently added first.
+
+    Meant to run as a background task started from the app lifespan. Stops
+    early when the daily rate limit budget for background calls runs out;
+    other failures are logged and the set is skipped.
+
+    Args:
+        catalog_client: Catalog client whose caches are filled
+        session_factory: Factory for the read session listing the sets
+        limit: Maximum number of sets to warm (None for all)
+
+    Returns:
+        Number of sets warmed
+    """
+    try:
+        async with session_factory() as db:
+            set_nos = await AsyncSqliteSetsRepository(db).list_set_nos(limit=limit)
+    except Exception:
+        logger.exception("Catalog cache warm-up could not list sets")
+        return 0
+    logger.info(f"Warming catalog cache for {len(set_nos)} sets")
+
+    async def warm(set_no: str) -> None:
+        await catalog_client.fetch_set_metadata(set_no)
+        await catalog_client.fetch_set_inventory(set_no)
+
+    warmed = 0
+    for set_no in set_nos:
+        try:
+            await run_with_priority(Priority.BACKGROUND, partial(warm, set_no))
+        except CatalogRateLimitError as e:
+            logger.warning(f"Stopping catalog cache warm-up: {e}")
+            break
+        except Exception as e:
+            logger.warning(f"Catalog cache warm-up failed for set {set_no}: {e}")
+            continue
+        warmed += 1
+    logger.info(f"Catalog cache warm-up done: {warmed}/{len(set_nos)} sets")
+    return warmed
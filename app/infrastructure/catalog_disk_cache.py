@@ -0,0 +1,182 @@
+"""
+Persistent second-tier cache for catalog responses.
+
+The in-memory caches in BricklinkCatalogService are small and lost on every
+restart. CatalogDiskCache keeps the same entries in a local SQLite file,
+zlib-compressed JSON, with a per-entry expiry and a total size budget
+enforced by evicting the least recently used entries.
+
+Calls are synchronous and fast (a few ms on a Pi SD card); the catalog
+service runs them in a worker thread.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_cache (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_catalog_cache_accessed ON catalog_cache (accessed_at);
+"""
+
+
+class CatalogDiskCache:
+    """
+    SQLite-backed cache of JSON-serializable catalog values.
+
+    Entries are keyed by (kind, key), e.g. ("inventory", "75192"). Expired
+    entries are never returned and are purged during eviction.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 64 * 1024 * 1024,
+        compress_level: int = 6,
+    ):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: SQLite file to store entries in
+            max_bytes: Budget for the total compressed size of all entries
+            compress_level: zlib compression level (1 fastest - 9 smallest)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, kind: str, key: str) -> Any | None:
+        """
+        Return the cached value, or None if missing or expired.
+
+        Args:
+            kind: Entry kind ("metadata", "inventory", ...)
+            key: Entry key, usually the set number
+
+        Returns:
+            The decoded value, or None
+        """
+        entry = self.get_entry(kind, key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, kind: str, key: str) -> tuple[Any, float] | None:
+        """
+        Return the cached value with its remaining lifetime.
+
+        Args:
+            kind: Entry kind ("metadata", "inventory", ...)
+            key: Entry key, usually the set number
+
+        Returns:
+            (value, seconds until expiry), or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM catalog_cache"
+                " WHERE kind = ? AND key = ? AND expires_at > ?",
+                (kind, key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE catalog_cache SET accessed_at = ? WHERE kind = ? AND key = ?",
+                (now, kind, key),
+            )
+        return json.loads(zlib.decompress(row[0])), row[1] - now
+
+    def set(self, kind: str, key: str, value: Any, ttl: float) -> None:
+        """
+        Store a value, then evict entries if the size budget is exceeded.
+
+        Args:
+            kind: Entry kind ("metadata", "inventory", ...)
+            key: Entry key, usually the set number
+            value: JSON-serializable value
+            ttl: Seconds until the entry expires
+        """
+        blob = zlib.compress(
+            json.dumps(value, separators=(",", ":")).encode(), self.compress_level
+        )
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalog_cache"
+                " (kind, key, value, size, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, blob, len(blob), now + ttl, now),
+            )
+            self._evict(now)
+
+    def delete(self, kind: str, key: str) -> None:
+        """Remove one entry if present."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM catalog_cache WHERE kind = ? AND key = ?", (kind, key)
+            )
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM catalog_cache")
+
+    def size_bytes(self) -> int:
+        """Total compressed size of all stored entries."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM catalog_cache"
+            ).fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones over budget."""
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM catalog_cache"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        self._conn.execute("DELETE FROM catalog_cache WHERE expires_at <= ?", (now,))
+        rows = self._conn.execute(
+            "SELECT kind, key, size FROM catalog_cache ORDER BY accessed_at"
+        ).fetchall()
+        total = sum(size for _, _, size in rows)
+        victims = []
+        for kind, key, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append((kind, key))
+            total -= size
+        self._conn.executemany(
+            "DELETE FROM catalog_cache WHERE kind = ? AND key = ?", victims
+        )
+        logger.debug(f"Evicted {len(victims)} catalog disk cache entries")
@@ -0,0 +1,220 @@
+"""
+Circuit breaker for calls to an external service.
+
+When Bricklink is down every call waits out the HTTP timeout and its
+retries before failing, so requests pile up behind a dependency that cannot
+answer. CircuitBreaker watches the outcome and latency of recent calls and,
+once too many fail or are slow, opens: calls then fail immediately with
+CatalogAPIError. After open_seconds it lets a trial call through (half-open)
+and closes again if that call succeeds.
+"""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from enum import Enum
+from typing import Any, TypeVar
+
+from app.core.exceptions import CatalogAPIError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpenError(CatalogAPIError):
+    """Raised instead of calling the service while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker driven by error rate and latency.
+
+    The last window_size calls are kept. Once at least min_calls have been
+    seen, the circuit opens if the share of failed calls reaches
+    failure_rate_threshold or the share of calls slower than slow_call_seconds
+    reaches slow_call_rate_threshold.
+    """
+
+    def __init__(
+        self,
+        name: str = "catalog",
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize a closed circuit.
+
+        Args:
+            name: Name used in log messages and errors
+            window_size: Number of recent calls the rates are computed over
+            min_calls: Calls needed in the window before the circuit can open
+            failure_rate_threshold: Failed share of calls that opens the circuit
+            slow_call_seconds: Duration above which a call counts as slow
+            slow_call_rate_threshold: Slow share of calls that opens the circuit
+            open_seconds: Time the circuit stays open before a trial call
+            timer: Clock used for latencies and the open period
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.timer = timer
+        # (failed, slow) per call, most recent last
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state; an open circuit turns half-open once open_seconds pass."""
+        if (
+            self._state is CircuitState.OPEN
+            and self.timer() - self._opened_at >= self.open_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open; allowing a trial call")
+        return self._state
+
+    def check(self) -> None:
+        """
+        Fail fast if a call would be rejected right now.
+
+        Lets callers skip work (e.g. waiting for a rate limit token) that would
+        be wasted on a call the breaker is going to reject anyway.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its
+                trial call already running
+        """
+        state = self.state
+        if state is CircuitState.OPEN or (
+            state is CircuitState.HALF_OPEN and self._trial_running
+        ):
+            raise CircuitOpenError(
+                f"{self.name} circuit is open; failing fast"
+                f" (retry in {self._retry_in():.0f}s)"
+            )
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        is_failure: Callable[[Exception], bool] = lambda e: True,
+        before: Callable[[], Awaitable[Any]] | None = None,
+    ) -> T:
+        """
+        Run fn() through the breaker and record its outcome and latency.
+
+        The call is admitted (and, when half-open, made the trial call)
+        before before() runs, so callers rejected by the breaker never wait
+        for or spend e.g. a rate limit token.
+
+        Args:
+            fn: Coroutine function making the protected call
+            is_failure: Whether an exception from fn() counts against the
+                service (e.g. a 404 does not)
+            before: Optional coroutine function awaited once the call is
+                admitted; it is not timed and its errors are not recorded
+
+        Returns:
+            fn()'s result
+
+        Raises:
+            CircuitOpenError: If the circuit rejects the call
+        """
+        self.check()
+        trial = self._state is CircuitState.HALF_OPEN
+        if trial:
+            self._trial_running = True
+        if before is not None:
+            try:
+                await before()
+            except BaseException:
+                if trial:  # let another caller make the trial call
+                    self._trial_running = False
+                raise
+        start = self.timer()
+        try:
+            result = await fn()
+        except Exception as e:
+            self._record(is_failure(e), self.timer() - start, trial)
+            raise
+        except BaseException:
+            if trial:  # cancelled; let another caller make the trial call
+                self._trial_running = False
+            raise
+        self._record(False, self.timer() - start, trial)
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Describe the breaker for health reporting.
+
+        Returns:
+            Dict with state, failure and slow-call rates over the window,
+            number of calls in the window, and seconds until a trial call
+            while open
+        """
+        state = self.state
+        calls = len(self._window)
+        return {
+            "state": state.value,
+            "failure_rate": round(self._rate(0), 2),
+            "slow_call_rate": round(self._rate(1), 2),
+            "calls": calls,
+            "retry_in": (
+                round(self._retry_in(), 1) if state is CircuitState.OPEN else None
+            ),
+        }
+
+    def _record(self, failed: bool, duration: float, trial: bool) -> None:
+        slow = duration >= self.slow_call_seconds
+        if trial:
+            self._trial_running = False
+            if failed or slow:
+                self._open("trial call failed")
+            else:
+                self._window.clear()
+                self._state = CircuitState.CLOSED
+                logger.info(f"Circuit {self.name} closed")
+            return
+        if self._state is not CircuitState.CLOSED:
+            return  # call started before the circuit opened
+
+        self._window.append((failed, slow))
+        if len(self._window) >= self.min_calls:
+            if self._rate(0) >= self.failure_rate_threshold:
+                self._open(f"failure rate {self._rate(0):.0%}")
+            elif self._rate(1) >= self.slow_call_rate_threshold:
+                self._open(f"slow call rate {self._rate(1):.0%}")
+
+    def _open(self, reason: str) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self.timer()
+        logger.warning(
+            f"Circuit {self.name} opened ({reason}); failing fast for"
+            f" {self.open_seconds:.0f}s"
+        )
+
+    def _rate(self, index: int) -> float:
+        if not self._window:
+            return 0.0
+        return sum(call[index] for call in self._window) / len(self._window)
+
+    def _retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - self.timer())
@@ -0,0 +1,159 @@
+"""
+Column-wise, compact storage for cached set inventories.
+
+A list[InventoryPart] costs several hundred bytes per part on CPython: a
+Pydantic object, its __dict__, a fields-set set and a separate copy of every
+string. CompactInventory stores the same parts as columns instead: interned
+part numbers and names (shared across every cached set), array('i') colour
+ids and quantities, and one byte of flags per part. That takes well under a
+tenth of the memory, so far more inventories fit in the in-memory catalog cache.
+Parts are turned back into models only when a caller reads the inventory.
+"""
+
+import sys
+from array import array
+from collections.abc import Iterable
+
+from app.core.catalog_interface import InventoryPart
+
+_SPARE = 1
+_COUNTERPART = 2
+
+_INVENTORY_PART_FIELDS = frozenset(InventoryPart.model_fields)
+_object_setattr = object.__setattr__
+
+
+def construct_part(
+    part_no: str,
+    color_id: int,
+    qty: int,
+    name: str,
+    is_spare: bool = False,
+    is_counterpart: bool = False,
+) -> InventoryPart:
+    """
+    Build an InventoryPart without running validation.
+
+    Does what InventoryPart.model_construct() does, minus its per-call field
+    and alias bookkeeping, which on pydantic 2.5 makes model_construct()
+    slower than validating. The caller guarantees the field types.
+    """
+    part = object.__new__(InventoryPart)
+    _object_setattr(
+        part,
+        "__dict__",
+        {
+            "part_no": part_no,
+            "color_id": color_id,
+            "qty": qty,
+            "name": name,
+            "is_spare": is_spare,
+            "is_counterpart": is_counterpart,
+        },
+    )
+    _object_setattr(part, "__pydantic_fields_set__", set(_INVENTORY_PART_FIELDS))
+    _object_setattr(part, "__pydantic_extra__", None)
+    _object_setattr(part, "__pydantic_private__", None)
+    return part
+
+
+class CompactInventory:
+    """An immutable, column-wise set inventory."""
+
+    __slots__ = ("part_nos", "names", "color_ids", "qtys", "flags")
+
+    def __init__(
+        self,
+        part_nos: tuple[str, ...],
+        names: tuple[str, ...],
+        color_ids: array,
+        qtys: array,
+        flags: bytes,
+    ):
+        """
+        Wrap already-built columns; use from_parts() to pack models.
+
+        Args:
+            part_nos: Interned part number per part
+            names: Interned part name per part
+            color_ids: array('i') of colour ids
+            qtys: array('i') of quantities
+            flags: One byte per part; bit 0 spare, bit 1 counterpart
+        """
+        self.part_nos = part_nos
+        self.names = names
+        self.color_ids = color_ids
+        self.qtys = qtys
+        self.flags = flags
+
+    @classmethod
+    def from_parts(cls, parts: Iterable[InventoryPart]) -> "CompactInventory":
+        """
+        Pack parts into columns.
+
+        Args:
+            parts: Parts in inventory order
+
+        Returns:
+            The packed inventory
+        """
+        intern = sys.intern
+        part_nos = []
+        names = []
+        color_ids = array("i")
+        qtys = array("i")
+        flags = bytearray()
+        for part in parts:
+            part_nos.append(intern(part.part_no))
+            names.append(intern(part.name))
+            color_ids.append(part.color_id)
+            qtys.append(part.qty)
+            flags.append(
+                (_SPARE if part.is_spare else 0)
+                | (_COUNTERPART if part.is_counterpart else 0)
+            )
+        return cls(tuple(part_nos), tuple(names), color_ids, qtys, bytes(flags))
+
+    def to_parts(self) -> list[InventoryPart]:
+        """Materialize the inventory as a fresh list of InventoryPart models."""
+        return [
+            construct_part(
+                part_no,
+                color_id,
+                qty,
+                name,
+                bool(flag & _SPARE),
+                bool(flag & _COUNTERPART),
+            )
+            for part_no, name, color_id, qty, flag in zip(
+                self.part_nos,
+                self.names,
+                self.color_ids,
+                self.qtys,
+                self.flags,
+                strict=True,
+            )
+        ]
+
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by this inventory.
+
+        Counts the containers and each distinct string once. Interned strings
+        shared with other cached inventories are counted in each of them, so
+        the estimate errs high.
+        """
+        strings = set(self.part_nos)
+        strings.update(self.names)
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.part_nos)
+            + sys.getsizeof(self.names)
+            + sys.getsizeof(self.color_ids)
+            + sys.getsizeof(self.qtys)
+            + sys.getsizeof(self.flags)
+            + sum(map(sys.getsizeof, strings))
+        )
+
+    def __len__(self) -> int:
+        return len(self.qtys)
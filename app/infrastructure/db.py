@@ -1,32 +1,209 @@
+from __future__ import annotations
+
 import os
+from typing import TYPE_CHECKING
 
 from sqlalchemy import (
+    JSON,
     Boolean,
     Column,
+    DateTime,
+    ForeignKey,
     Index,
     Integer,
     MetaData,
+    SmallInteger,
     String,
     Table,
+    TypeDecorator,
     create_engine,
+    event,
+    func,
     select,
     update,
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, registry, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.exceptions import SetNotFoundError
+from app.core.states import JobStatus, PieceState
+
+if TYPE_CHECKING:
+    import builtins
+    from collections.abc import AsyncIterator, Iterable
+
+    from sqlalchemy.engine import Engine
+
+    from app.core.models import LegoSet, Part
 
-from app.core.models import LegoSet, Part
-from app.core.states import PieceState
+# PRAGMAs applied to every new SQLite connection, selected by LEGO_DB_PROFILE.
+SQLITE_PRAGMA_PROFILES: dict[str, dict[str, str | int]] = {
+    # Default for the Pi: WAL lets readers run alongside a writer, NORMAL sync
+    # only fsyncs at checkpoints (a power cut can lose the last commit, never
+    # corrupt the file) and a modest mmap/page cache keeps reads off the SD card.
+    "pi": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,  # negative = KiB, i.e. ~16 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # WAL concurrency with a full fsync on every commit
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+    # Plain SQLite defaults (rollback journal, full sync)
+    "default": {},
+}
 
 DB_PATH = os.getenv("LEGO_DB_PATH", "./data/lego_inventory.db")
+DB_PROFILE = os.getenv("LEGO_DB_PROFILE", "pi")
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+
+
+def apply_sqlite_pragmas(engine: Engine, profile: str = "pi") -> None:
+    """
+    Register a connect hook that applies a PRAGMA profile to the engine.
+
+    Args:
+        engine: SQLAlchemy engine backed by SQLite
+        profile: Key into SQLITE_PRAGMA_PROFILES
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in SQLITE_PRAGMA_PROFILES:
+        raise ValueError(
+            f"Unknown SQLite profile '{profile}', "
+            f"expected one of {sorted(SQLITE_PRAGMA_PROFILES)}"
+        )
+    pragmas = SQLITE_PRAGMA_PROFILES[profile]
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
 engine = create_engine(
     f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False}
 )
+apply_sqlite_pragmas(engine, DB_PROFILE)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def _set_query_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def create_async_read_engine(
+    db_path: str, pool_size: int = 4, profile: str = "pi"
+) -> AsyncEngine:
+    """
+    Create the engine for read-only sessions.
+
+    Connections are opened with mode=ro and query_only, so readers never take
+    SQLite's write lock; under WAL they run alongside the writer. The database
+    file must already exist (init_db creates it).
+
+    Args:
+        db_path: Path to the SQLite database file
+        pool_size: Number of pooled reader connections
+        profile: Key into SQLITE_PRAGMA_PROFILES
+    """
+    read_engine = create_async_engine(
+        f"sqlite+aiosqlite:///file:{os.path.abspath(db_path)}?mode=ro&uri=true",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    apply_sqlite_pragmas(read_engine.sync_engine, profile)
+    event.listen(read_engine.sync_engine, "connect", _set_query_only)
+    return read_engine
+
+
+def create_async_write_engine(db_path: str, profile: str = "pi") -> AsyncEngine:
+    """
+    Create the engine for read-write sessions.
+
+    It holds a single pooled connection: SQLite allows one writer at a time,
+    so in-process writers wait on the pool rather than on the file lock.
+
+    Args:
+        db_path: Path to the SQLite database file
+        profile: Key into SQLITE_PRAGMA_PROFILES
+    """
+    write_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    apply_sqlite_pragmas(write_engine.sync_engine, profile)
+    return write_engine
+
+
+# Async engines used by the API so DB I/O runs on the aiosqlite worker thread
+# instead of the event loop: reads (list/get) and mutations go through
+# separate engines and pools. The sync engine above remains for scripts/tests.
+async_read_engine = create_async_read_engine(
+    DB_PATH, int(os.getenv("LEGO_DB_READ_POOL_SIZE", "4")), DB_PROFILE
+)
+async_write_engine = create_async_write_engine(DB_PATH, DB_PROFILE)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, expire_on_commit=False
+)
+AsyncWriteSessionLocal = async_sessionmaker(
+    bind=async_write_engine, autoflush=False, expire_on_commit=False
+)
 mapper_registry = registry()
 
 metadata = MetaData()
 
+# Stable on-disk codes for PieceState; never renumber existing entries.
+PIECE_STATE_CODES: dict[PieceState, int] = {
+    PieceState.MISSING: 0,
+    PieceState.OWNED_LOCKED: 1,
+    PieceState.OWNED_FREE: 2,
+}
+PIECE_STATES_BY_CODE = {code: state for state, code in PIECE_STATE_CODES.items()}
+
+
+class PieceStateCode(TypeDecorator):
+    """Stores a PieceState as a small integer and reads back its string value."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return PIECE_STATE_CODES[PieceState(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return PIECE_STATES_BY_CODE[value].value
+
+
 sets_table = Table(
     "sets",
     metadata,
@@ -36,30 +213,143 @@ sets_table = Table(
     Column("assembled", Boolean, default=False),
 )
 
+# One row per part number; the name is stored once and shared by every color
+# and set that uses the part.
 parts_table = Table(
     "parts",
     metadata,
     Column("id", Integer, primary_key=True),
-    Column("part_no", String, nullable=False),
-    Column("color_id", Integer, nullable=False),
+    Column("part_no", String, unique=True, nullable=False),
     Column("name", String),
 )
 
+# Compact layout: integer keys into sets/parts and a small-int state instead
+# of repeating set_no, part_no and the state name on every row. The integer
+# primary key is the rowid, which pagination and streaming order by, so the
+# tables are not declared WITHOUT ROWID.
 inventory_table = Table(
     "inventory",
     metadata,
     Column("id", Integer, primary_key=True),
-    Column("set_no", String, nullable=False, index=True),
-    Column("part_no", String, nullable=False),
+    Column("set_id", Integer, ForeignKey("sets.id"), nullable=False),
+    Column("part_id", Integer, ForeignKey("parts.id"), nullable=False),
     Column("color_id", Integer, nullable=False),
     Column("qty", Integer, default=0),
-    Column("state", String, nullable=False, index=True),
-    Index("ix_inventory_part_color", "part_no", "color_id"),
+    Column("state", PieceStateCode, nullable=False, index=True),
+    Index("ix_inventory_part_color", "part_id", "color_id"),
+    # Upsert/point-update key; one row per part and color within a set
+    Index("uq_inventory_set_part_color", "set_id", "part_id", "color_id", unique=True),
 )
 
+# Background jobs (e.g. add_set) that must survive restarts. Queued jobs are
+# claimed in id order by the worker pool.
+jobs_table = Table(
+    "jobs",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("kind", String, nullable=False),
+    Column("payload", JSON, nullable=False),
+    Column("status", String, nullable=False, default=JobStatus.QUEUED.value),
+    Column("result", JSON),
+    Column("error", String),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("created_at", DateTime, nullable=False, server_default=func.now()),
+    Column(
+        "updated_at",
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    ),
+    Index("ix_jobs_status", "status", "id"),
+)
+
+
+def _inventory_rows():
+    """SELECT of inventory rows in their API shape (set_no, part_no, state name)."""
+    return select(
+        inventory_table.c.id,
+        sets_table.c.set_no,
+        parts_table.c.part_no,
+        inventory_table.c.color_id,
+        inventory_table.c.qty,
+        inventory_table.c.state,
+    ).select_from(
+        inventory_table.join(
+            sets_table, inventory_table.c.set_id == sets_table.c.id
+        ).join(parts_table, inventory_table.c.part_id == parts_table.c.id)
+    )
 
-def init_db():
-    metadata.create_all(engine)
+
+def _migrate_legacy_inventory(conn) -> bool:
+    """
+    Convert the original string-keyed inventory layout to the compact one.
+
+    The legacy inventory table is renamed aside, the new tables are created,
+    rows are copied across with set/part numbers resolved to ids and states
+    to their codes, and the legacy table is dropped. Runs inside the caller's
+    transaction.
+
+    Returns:
+        True if a legacy layout was found and migrated
+    """
+    columns = {r[1] for r in conn.exec_driver_sql("PRAGMA table_info(inventory)")}
+    if "set_no" not in columns:
+        return False
+
+    # Index names are global in SQLite; drop the legacy ones so the new
+    # table can reuse them.
+    legacy_indexes = conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index' "
+        "AND tbl_name IN ('inventory', 'parts') AND sql IS NOT NULL"
+    ).fetchall()
+    for (name,) in legacy_indexes:
+        conn.exec_driver_sql(f'DROP INDEX "{name}"')
+    conn.exec_driver_sql("ALTER TABLE inventory RENAME TO inventory_legacy")
+    # The old parts table (part_no, color_id, name) was never written to
+    conn.exec_driver_sql("DROP TABLE IF EXISTS parts")
+    metadata.create_all(conn)
+
+    conn.exec_driver_sql(
+        "INSERT INTO sets (set_no, assembled) "
+        "SELECT DISTINCT set_no, 0 FROM inventory_legacy "
+        "WHERE set_no NOT IN (SELECT set_no FROM sets)"
+    )
+    conn.exec_driver_sql(
+        "INSERT INTO parts (part_no) SELECT DISTINCT part_no FROM inventory_legacy"
+    )
+    state_case = " ".join(
+        f"WHEN '{state.value}' THEN {code}" for state, code in PIECE_STATE_CODES.items()
+    )
+    # Grouping also merges rows duplicating the new unique key, which racing
+    # select-then-insert writes could leave behind; quantities are summed
+    conn.exec_driver_sql(
+        "INSERT INTO inventory (id, set_id, part_id, color_id, qty, state) "
+        f"SELECT MIN(l.id), s.id, p.id, l.color_id, SUM(l.qty), "
+        f"MIN(CASE l.state {state_case} END) "
+        "FROM inventory_legacy l "
+        "JOIN sets s ON s.set_no = l.set_no "
+        "JOIN parts p ON p.part_no = l.part_no "
+        "GROUP BY s.id, p.id, l.color_id"
+    )
+    conn.exec_driver_sql("DROP TABLE inventory_legacy")
+    return True
+
+
+def init_db(bind: Engine | None = None):
+    bind = bind if bind is not None else engine
+    with bind.begin() as conn:
+        migrated = _migrate_legacy_inventory(conn)
+        metadata.create_all(conn)
+        # create_all skips existing tables, so add indexes introduced since
+        # the database was created
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+    if migrated:
+        # Give the pages freed by the old layout back to the filesystem
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM")
 
 
 def get_db():
@@ -71,6 +361,29 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """FastAPI dependency to provide a scoped async session for writes."""
+    async with AsyncWriteSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """FastAPI dependency to provide a scoped read-only async session."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    FastAPI dependency for read endpoints that manage their own session.
+
+    Streaming responses outlive the request's dependencies, so they open a
+    read-only session from this factory inside the response body instead of
+    using get_async_read_db.
+    """
+    return AsyncReadSessionLocal
+
+
 # Simple repository implementations
 
 
@@ -78,7 +391,7 @@ class SqliteSetsRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def add(self, lego_set: LegoSet) -> None:
+    def add(self, lego_set: LegoSet, commit: bool = True) -> None:
         self.db.execute(
             sets_table.insert().values(
                 set_no=lego_set.set_no,
@@ -86,7 +399,8 @@ class SqliteSetsRepository:
                 assembled=lego_set.assembled,
             )
         )
-        self.db.commit()
+        if commit:
+            self.db.commit()
 
     def get(self, set_no: str) -> dict | None:
         r = self.db.execute(
@@ -94,67 +408,433 @@ class SqliteSetsRepository:
         ).first()
         return dict(r._mapping) if r else None
 
+    def list_set_nos(self, limit: int | None = None) -> list[str]:
+        """Return set numbers, most recently added first."""
+        stmt = select(sets_table.c.set_no).order_by(sets_table.c.id.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(self.db.execute(stmt).scalars())
+
 
 class SqliteInventoryRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def _upsert(self):
+        """INSERT keyed on (set_id, part_id, color_id) that adds to the qty."""
+        stmt = sqlite_insert(inventory_table)
+        return stmt.on_conflict_do_update(
+            index_elements=["set_id", "part_id", "color_id"],
+            set_={
+                "qty": inventory_table.c.qty + stmt.excluded.qty,
+                "state": stmt.excluded.state,
+            },
+        )
+
+    def _set_id(self, set_no: str) -> int:
+        set_id = self.db.execute(
+            select(sets_table.c.id).where(sets_table.c.set_no == set_no)
+        ).scalar()
+        if set_id is None:
+            raise SetNotFoundError(f"Set '{set_no}' not found")
+        return int(set_id)
+
+    def _part_ids(self, names: dict[str, str]) -> dict[str, int]:
+        """Intern part numbers into the parts table and return their ids."""
+        insert = sqlite_insert(parts_table)
+        self.db.execute(
+            # Fill in names missing from parts interned without one (e.g. by
+            # the legacy migration); known names are never overwritten
+            insert.on_conflict_do_update(
+                index_elements=["part_no"],
+                set_={"name": func.coalesce(parts_table.c.name, insert.excluded.name)},
+                where=parts_table.c.name.is_(None),
+            ),
+            [{"part_no": part_no, "name": name} for part_no, name in names.items()],
+        )
+        part_nos = list(names)
+        ids: dict[str, int] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(part_nos), 500):
+            ids.update(
+                self.db.execute(
+                    select(parts_table.c.part_no, parts_table.c.id).where(
+                        parts_table.c.part_no.in_(part_nos[i : i + 500])
+                    )
+                )
+                .tuples()
+                .all()
+            )
+        return ids
+
     def add_part(
         self,
         set_no: str,
         part: Part,
         qty: int = 1,
         state: PieceState = PieceState.OWNED_FREE,
+        commit: bool = True,
     ) -> None:
-        existing = self.db.execute(
-            select(inventory_table).where(
-                (inventory_table.c.set_no == set_no)
-                & (inventory_table.c.part_no == part.part_no)
-                & (inventory_table.c.color_id == part.color_id)
-            )
-        ).first()
-        if existing:
-            self.db.execute(
-                update(inventory_table)
-                .where(inventory_table.c.id == existing.id)
-                .values(qty=existing.qty + qty, state=state.value)
-            )
-        else:
-            self.db.execute(
-                inventory_table.insert().values(
-                    set_no=set_no,
-                    part_no=part.part_no,
-                    color_id=part.color_id,
-                    qty=qty,
-                    state=state.value,
+        self.add_parts(set_no, [(part, qty)], state=state, commit=commit)
+
+    def add_parts(
+        self,
+        set_no: str,
+        parts: Iterable[tuple[Part, int]],
+        state: PieceState = PieceState.OWNED_FREE,
+        commit: bool = True,
+    ) -> int:
+        """
+        Add many parts of a set in a single transaction.
+
+        Duplicate (part_no, color_id) entries are summed in memory and written
+        with one executemany upsert; rows already present for the set have
+        their qty increased. Anything pending on the session (e.g. a set added
+        with commit=False) is committed with the parts. With commit=False the
+        caller owns the transaction, including rolling it back on error.
+
+        Returns:
+            Number of distinct inventory rows written
+
+        Raises:
+            SetNotFoundError: If the set has not been added
+        """
+        totals: dict[tuple[str, int], int] = {}
+        names: dict[str, str] = {}
+        try:
+            for part, qty in parts:
+                key = (part.part_no, part.color_id)
+                totals[key] = totals.get(key, 0) + qty
+                names.setdefault(part.part_no, part.name)
+
+            if totals:
+                set_id = self._set_id(set_no)
+                part_ids = self._part_ids(names)
+                self.db.execute(
+                    self._upsert(),
+                    [
+                        {
+                            "set_id": set_id,
+                            "part_id": part_ids[part_no],
+                            "color_id": color_id,
+                            "qty": qty,
+                            "state": state,
+                        }
+                        for (part_no, color_id), qty in totals.items()
+                    ],
                 )
-            )
+            if commit:
+                self.db.commit()
+        except Exception:
+            if commit:
+                self.db.rollback()
+            raise
+        return len(totals)
+
+    def commit(self) -> None:
+        """Commit writes made with commit=False."""
         self.db.commit()
 
+    def rollback(self) -> None:
+        """Discard writes made with commit=False."""
+        self.db.rollback()
+
     def list(self, state: PieceState | None = None) -> list[dict]:
+        stmt = _inventory_rows()
         if state:
-            rows = self.db.execute(
-                select(inventory_table).where(inventory_table.c.state == state.value)
-            ).fetchall()
-        else:
-            rows = self.db.execute(select(inventory_table)).fetchall()
-        return [dict(r._mapping) for r in rows]
+            stmt = stmt.where(inventory_table.c.state == state)
+        return [dict(r._mapping) for r in self.db.execute(stmt)]
+
+    def list_page(
+        self,
+        state: PieceState | None = None,
+        limit: int = 100,
+        after_id: int | None = None,
+    ) -> tuple[builtins.list[dict], int | None]:
+        """
+        Return one page of inventory rows in id order (keyset pagination).
+
+        Seeks past after_id on the state index (SQLite indexes carry the rowid,
+        so this is an index range scan) rather than using OFFSET.
+
+        Returns:
+            The rows and the after_id for the next page, or None on the last page
+        """
+        stmt = _inventory_rows().order_by(inventory_table.c.id).limit(limit + 1)
+        if state:
+            stmt = stmt.where(inventory_table.c.state == state)
+        if after_id is not None:
+            stmt = stmt.where(inventory_table.c.id > after_id)
+        rows = [dict(r._mapping) for r in self.db.execute(stmt)]
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1]["id"]
+        return rows, None
 
     def update_item(
-        self, part_no: str, color_id: int, qty: int, state: PieceState
+        self,
+        part_no: str,
+        color_id: int,
+        qty: int,
+        state: PieceState,
+        set_no: str | None = None,
+        commit: bool = True,
     ) -> bool:
-        row = self.db.execute(
-            select(inventory_table).where(
-                (inventory_table.c.part_no == part_no)
+        """
+        Set qty and state of one inventory row in a single UPDATE ... RETURNING.
+
+        With set_no the row is addressed by its unique key; without it the
+        oldest row for (part_no, color_id) across all sets is updated.
+
+        Returns:
+            True if a row was updated, False if none matched
+        """
+        part_id = (
+            select(parts_table.c.id)
+            .where(parts_table.c.part_no == part_no)
+            .scalar_subquery()
+        )
+        stmt = update(inventory_table).values(qty=qty, state=state)
+        if set_no is not None:
+            set_id = (
+                select(sets_table.c.id)
+                .where(sets_table.c.set_no == set_no)
+                .scalar_subquery()
+            )
+            stmt = stmt.where(
+                (inventory_table.c.set_id == set_id)
+                & (inventory_table.c.part_id == part_id)
                 & (inventory_table.c.color_id == color_id)
             )
+        else:
+            first_match = (
+                select(inventory_table.c.id)
+                .where(
+                    (inventory_table.c.part_id == part_id)
+                    & (inventory_table.c.color_id == color_id)
+                )
+                .order_by(inventory_table.c.id)
+                .limit(1)
+                .scalar_subquery()
+            )
+            stmt = stmt.where(inventory_table.c.id == first_match)
+        row = self.db.execute(stmt.returning(inventory_table.c.id)).first()
+        if commit:
+            self.db.commit()
+        return row is not None
+
+
+class SqliteJobsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, kind: str, payload: dict) -> int:
+        """Insert a queued job and return its id."""
+        job_id = self.db.execute(
+            jobs_table.insert()
+            .values(kind=kind, payload=payload, status=JobStatus.QUEUED.value)
+            .returning(jobs_table.c.id)
+        ).scalar_one()
+        self.db.commit()
+        return int(job_id)
+
+    def get(self, job_id: int) -> dict | None:
+        r = self.db.execute(select(jobs_table).where(jobs_table.c.id == job_id)).first()
+        return dict(r._mapping) if r else None
+
+    def claim_next(self) -> dict | None:
+        """
+        Mark the oldest queued job as running and return it.
+
+        The select and update are one statement, so two workers can never
+        claim the same job.
+        """
+        oldest = (
+            select(jobs_table.c.id)
+            .where(jobs_table.c.status == JobStatus.QUEUED.value)
+            .order_by(jobs_table.c.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        r = self.db.execute(
+            update(jobs_table)
+            .where(jobs_table.c.id == oldest)
+            .values(status=JobStatus.RUNNING.value, attempts=jobs_table.c.attempts + 1)
+            .returning(*jobs_table.c)
         ).first()
-        if not row:
-            return False
+        self.db.commit()
+        return dict(r._mapping) if r else None
+
+    def finish(
+        self, job_id: int, result: dict | None = None, error: str | None = None
+    ) -> None:
+        """Record a job's outcome: succeeded with result, or failed with error."""
+        status = JobStatus.FAILED if error is not None else JobStatus.SUCCEEDED
         self.db.execute(
-            update(inventory_table)
-            .where(inventory_table.c.id == row.id)
-            .values(qty=qty, state=state.value)
+            update(jobs_table)
+            .where(jobs_table.c.id == job_id)
+            .values(status=status.value, result=result, error=error)
         )
         self.db.commit()
-        return True
+
+    def requeue_running(self, max_attempts: int = 3) -> tuple[int, int]:
+        """
+        Return jobs left running by a previous process to the queue.
+
+        A job that has already been started max_attempts times is failed
+        instead, so a job that crashes the process cannot be retried forever.
+
+        Returns:
+            (jobs re-queued, jobs failed)
+        """
+        running = jobs_table.c.status == JobStatus.RUNNING.value
+        failed = self.db.execute(
+            update(jobs_table)
+            .where(running & (jobs_table.c.attempts >= max_attempts))
+            .values(
+                status=JobStatus.FAILED.value,
+                error=f"Interrupted {max_attempts} times; not retrying",
+            )
+        ).rowcount
+        requeued = self.db.execute(
+            update(jobs_table).where(running).values(status=JobStatus.QUEUED.value)
+        ).rowcount
+        self.db.commit()
+        return requeued, failed
+
+
+# Async repositories
+#
+# These reuse the sync repositories through AsyncSession.run_sync: the same
+# statements run on the aiosqlite worker thread, so the event loop never
+# blocks on SQLite and the SQL lives in one place.
+
+
+class AsyncSqliteSetsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(self, lego_set: LegoSet, commit: bool = True) -> None:
+        await self.db.run_sync(
+            lambda s: SqliteSetsRepository(s).add(lego_set, commit=commit)
+        )
+
+    async def get(self, set_no: str) -> dict | None:
+        return await self.db.run_sync(lambda s: SqliteSetsRepository(s).get(set_no))
+
+    async def list_set_nos(self, limit: int | None = None) -> list[str]:
+        return await self.db.run_sync(
+            lambda s: SqliteSetsRepository(s).list_set_nos(limit=limit)
+        )
+
+
+class AsyncSqliteInventoryRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add_part(
+        self,
+        set_no: str,
+        part: Part,
+        qty: int = 1,
+        state: PieceState = PieceState.OWNED_FREE,
+    ) -> None:
+        await self.db.run_sync(
+            lambda s: SqliteInventoryRepository(s).add_part(
+                set_no, part, qty=qty, state=state
+            )
+        )
+
+    async def add_parts(
+        self,
+        set_no: str,
+        parts: Iterable[tuple[Part, int]],
+        state: PieceState = PieceState.OWNED_FREE,
+        commit: bool = True,
+    ) -> int:
+        return await self.db.run_sync(
+            lambda s: SqliteInventoryRepository(s).add_parts(
+                set_no, parts, state=state, commit=commit
+            )
+        )
+
+    async def commit(self) -> None:
+        await self.db.commit()
+
+    async def rollback(self) -> None:
+        await self.db.rollback()
+
+    async def list(self, state: PieceState | None = None) -> list[dict]:
+        return await self.db.run_sync(
+            lambda s: SqliteInventoryRepository(s).list(state=state)
+        )
+
+    async def iter_batches(
+        self, state: PieceState | None = None, batch_size: int = 1000
+    ) -> AsyncIterator[builtins.list[dict]]:
+        """
+        Yield inventory rows in id order, batch_size rows at a time.
+
+        Rows are read through a server-side cursor, so memory stays bounded by
+        one batch regardless of table size.
+        """
+        stmt = _inventory_rows().order_by(inventory_table.c.id)
+        if state:
+            stmt = stmt.where(inventory_table.c.state == state)
+        result = await self.db.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield [dict(r._mapping) for r in partition]
+
+    async def list_page(
+        self,
+        state: PieceState | None = None,
+        limit: int = 100,
+        after_id: int | None = None,
+    ) -> tuple[builtins.list[dict], int | None]:
+        return await self.db.run_sync(
+            lambda s: SqliteInventoryRepository(s).list_page(
+                state=state, limit=limit, after_id=after_id
+            )
+        )
+
+    async def update_item(
+        self,
+        part_no: str,
+        color_id: int,
+        qty: int,
+        state: PieceState,
+        set_no: str | None = None,
+    ) -> bool:
+        return await self.db.run_sync(
+            lambda s: SqliteInventoryRepository(s).update_item(
+                part_no, color_id, qty, state, set_no=set_no
+            )
+        )
+
+
+class AsyncSqliteJobsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(self, kind: str, payload: dict) -> int:
+        return await self.db.run_sync(
+            lambda s: SqliteJobsRepository(s).enqueue(kind, payload)
+        )
+
+    async def get(self, job_id: int) -> dict | None:
+        return await self.db.run_sync(lambda s: SqliteJobsRepository(s).get(job_id))
+
+    async def claim_next(self) -> dict | None:
+        return await self.db.run_sync(lambda s: SqliteJobsRepository(s).claim_next())
+
+    async def finish(
+        self, job_id: int, result: dict | None = None, error: str | None = None
+    ) -> None:
+        await self.db.run_sync(
+            lambda s: SqliteJobsRepository(s).finish(job_id, result=result, error=error)
+        )
+
+    async def requeue_running(self, max_attempts: int = 3) -> tuple[int, int]:
+        return await self.db.run_sync(
+            lambda s: SqliteJobsRepository(s).requeue_running(max_attempts)
+        )
@@ -0,0 +1,207 @@
+"""
+Durable background jobs backed by the jobs table.
+
+Slow operations such as importing a set (catalog round trips plus writing
+every part) are enqueued as rows in the jobs table and executed by an
+in-process pool of worker tasks, so the HTTP request that asked for them can
+return immediately. Because jobs live in SQLite, queued work survives a
+restart, and jobs interrupted mid-run are re-queued on startup.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.exceptions import LegoServiceError
+from app.core.services import InventoryService
+from app.infrastructure.db import (
+    AsyncSqliteInventoryRepository,
+    AsyncSqliteJobsRepository,
+    AsyncSqliteSetsRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], Awaitable[dict]]
+
+
+class JobWorkerPool:
+    """
+    Runs queued jobs on a fixed number of worker tasks.
+
+    Workers claim jobs in id order and dispatch them to the handler registered
+    for the job's kind. A handler's return value is stored as the job result;
+    a LegoServiceError becomes the job's error message. Workers poll every
+    poll_interval seconds and are woken early by notify().
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        handlers: dict[str, JobHandler],
+        workers: int = 2,
+        poll_interval: float = 5.0,
+        max_attempts: int = 3,
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            session_factory: Factory for the sessions jobs are claimed with
+            handlers: Coroutine function to run for each job kind
+            workers: Number of jobs run concurrently
+            poll_interval: Seconds between checks for new jobs when idle
+            max_attempts: Times a job interrupted by a restart is started
+                before it is failed instead of re-queued
+        """
+        self.session_factory = session_factory
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Re-queue interrupted jobs and start the worker tasks."""
+        if self._tasks:
+            return
+        async with self.session_factory() as db:
+            requeued, failed = await AsyncSqliteJobsRepository(db).requeue_running(
+                self.max_attempts
+            )
+        if requeued:
+            logger.info(f"Re-queued {requeued} interrupted jobs")
+        if failed:
+            logger.warning(f"Failed {failed} jobs interrupted too many times")
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Stop the worker tasks.
+
+        Jobs still running are left in the RUNNING state and re-queued by the
+        next start().
+        """
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers to pick up a newly enqueued job."""
+        self._wakeup.set()
+
+    async def run_pending(self) -> int:
+        """
+        Run queued jobs on the calling task until none are left.
+
+        Returns:
+            Number of jobs run
+        """
+        count = 0
+        while await self._run_one():
+            count += 1
+        return count
+
+    async def _work(self) -> None:
+        while True:
+            if await self._run_one():
+                continue
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            self._wakeup.clear()
+
+    async def _run_one(self) -> bool:
+        """Claim and run one job; return False if the queue was empty."""
+        async with self.session_factory() as db:
+            job = await AsyncSqliteJobsRepository(db).claim_next()
+        if job is None:
+            return False
+
+        result: Any = None
+        error: str | None = None
+        handler = self.handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise LegoServiceError(f"Unknown job kind: {job['kind']}")
+            result = await handler(job["payload"])
+        except LegoServiceError as e:
+            error = str(e)
+        except Exception:
+            logger.exception(f"Job {job['id']} ({job['kind']}) failed")
+            error = "Internal server error"
+
+        async with self.session_factory() as db:
+            await AsyncSqliteJobsRepository(db).finish(
+                job["id"], result=result, error=error
+            )
+        logger.info(f"Job {job['id']} ({job['kind']}) {'failed' if error else 'done'}")
+        return True
+
+
+def add_set_handler(
+    session_factory: async_sessionmaker[AsyncSession], catalog_client
+) -> JobHandler:
+    """
+    Build the handler for "add_set" jobs.
+
+    Payload: {"set_no": str, "assembled": bool}. A set that is already in the
+    inventory (e.g. a retried request, or another job for the same set that
+    finished first) succeeds with the stored set.
+
+    Args:
+        session_factory: Factory for write sessions
+        catalog_client: Catalog client used to fetch the set
+
+    Returns:
+        Coroutine function running one add_set job
+    """
+
+    async def stored_set(set_no: str) -> dict | None:
+        # Short session, so no connection is held while the catalog is fetched
+        async with session_factory() as db:
+            existing = await AsyncSqliteSetsRepository(db).get(set_no)
+        if existing is None:
+            return None
+        return {
+            "set_no": existing["set_no"],
+            "name": existing["name"],
+            "assembled": existing["assembled"],
+        }
+
+    async def handle(payload: dict) -> dict:
+        set_no = payload["set_no"]
+        existing = await stored_set(set_no)
+        if existing is not None:
+            return existing
+
+        try:
+            async with session_factory() as db:
+                service = InventoryService(
+                    AsyncSqliteInventoryRepository(db),
+                    AsyncSqliteSetsRepository(db),
+                    catalog_client,
+                )
+                lego_set = await service.add_set(
+                    set_no, assembled=payload.get("assembled", False)
+                )
+        except IntegrityError:
+            # Another job added the set while this one fetched it
+            existing = await stored_set(set_no)
+            if existing is None:
+                raise
+            return existing
+        return lego_set.model_dump()
+
+    return handle
@@ -10,14 +10,19 @@ Not Bricklink-specific - just handles OAuth signing and requests.
 import asyncio
 import logging
 from typing import Any
+from urllib.parse import urlencode
 
+import aiohttp
+from oauthlib.oauth1 import Client as OAuth1Signer
 from requests_oauthlib import OAuth1Session
 from tenacity import (
+    RetryCallState,
     retry,
     retry_if_exception_type,
     stop_after_attempt,
     wait_exponential,
 )
+from yarl import URL
 
 logger = logging.getLogger(__name__)
 
@@ -218,3 +223,206 @@ class OAuthHTTPClient:
     def close(self) -> None:
         """Close the underlying HTTP session."""
         self.session.close()
+
+
+def _stop_after_max_retries(retry_state: RetryCallState) -> bool:
+    """tenacity stop condition: give up after the client's max_retries attempts."""
+    client: AsyncOAuthHTTPClient = retry_state.args[0]
+    return retry_state.attempt_number >= client.max_retries
+
+
+class AsyncOAuthHTTPClient:
+    """
+    Generic OAuth 1.0a HTTP client on a native asyncio transport.
+
+    Requests are signed with oauthlib and sent over a pooled, keep-alive
+    aiohttp session, so concurrent calls need no executor threads. Same
+    interface as OAuthHTTPClient, except close() is a coroutine.
+    HTTP errors are raised as aiohttp.ClientResponseError.
+    """
+
+    def __init__(
+        self,
+        config: OAuthConfig,
+        timeout: int = 30,
+        max_retries: int = 3,
+        max_connections: int = 100,
+        max_connections_per_host: int = 10,
+    ):
+        """
+        Initialize async OAuth HTTP client.
+
+        Args:
+            config: OAuth configuration with credentials
+            timeout: Request timeout in seconds
+            max_retries: Maximum number of retry attempts
+            max_connections: Total connection pool size
+            max_connections_per_host: Pooled connections allowed per host
+        """
+        config.validate()
+        self.config = config
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+
+        self.signer = OAuth1Signer(
+            client_key=config.consumer_key,
+            client_secret=config.consumer_secret,
+            resource_owner_key=config.resource_owner_key,
+            resource_owner_secret=config.resource_owner_secret,
+        )
+        # Created on first use so it binds to the running event loop
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared aiohttp session (connection pool)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _sign(
+        self,
+        method: str,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        body: str | None = None,
+    ) -> tuple[str, dict[str, str]]:
+        """Return the signed URL and headers (with Authorization) for a request."""
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params, doseq=True)}"
+        signed_url, signed_headers, _ = self.signer.sign(
+            url, http_method=method, body=body, headers=headers
+        )
+        return signed_url, signed_headers
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        data: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        body = None
+        headers = dict(headers or {})
+        if data is not None:
+            # Form bodies are part of the OAuth 1.0a signature base string
+            body = urlencode(data, doseq=True)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        signed_url, signed_headers = self._sign(method, url, params, headers, body)
+
+        async with self.session.request(
+            method,
+            # Already percent-encoded exactly as signed; don't let yarl requote
+            URL(signed_url, encoded=True),
+            headers=signed_headers,
+            data=body,
+            json=json,
+        ) as response:
+            logger.debug(f"Response status: {response.status}")
+            # Let caller handle status codes - raise ClientResponseError
+            response.raise_for_status()
+            result: dict[str, Any] = await response.json(content_type=None)
+            return result
+
+    @retry(
+        stop=_stop_after_max_retries,
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(
+            (ConnectionError, TimeoutError, aiohttp.ClientConnectionError)
+        ),
+        reraise=True,
+    )
+    async def get(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Make an authenticated GET request.
+
+        Args:
+            url: Full URL to request
+            params: Query parameters
+            headers: Additional headers
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            aiohttp.ClientResponseError: If the response status is 4xx/5xx
+            aiohttp.ClientConnectionError: If request fails after retries
+            TimeoutError: If request times out
+        """
+        # Don't log params - they may contain sensitive data
+        logger.debug(f"OAuth GET: {url}")
+        return await self._request("GET", url, params=params, headers=headers)
+
+    @retry(
+        stop=_stop_after_max_retries,
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(
+            (ConnectionError, TimeoutError, aiohttp.ClientConnectionError)
+        ),
+        reraise=True,
+    )
+    async def post(
+        self,
+        url: str,
+        data: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Make an authenticated POST request.
+
+        Args:
+            url: Full URL to request
+            data: Form data
+            json: JSON body
+            headers: Additional headers
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            aiohttp.ClientResponseError: If the response status is 4xx/5xx
+            aiohttp.ClientConnectionError: If request fails after retries
+            TimeoutError: If request times out
+        """
+        logger.debug(f"OAuth POST: {url}")
+        return await self._request("POST", url, headers=headers, data=data, json=json)
+
+    async def health_check(self, url: str) -> bool:
+        """
+        Check if the OAuth-protected endpoint is accessible.
+
+        Args:
+            url: URL to check
+
+        Returns:
+            True if accessible, False otherwise
+        """
+        try:
+            await self.get(url)
+            return True
+        except Exception as e:
+            logger.warning(f"Health check failed: {e}")
+            return False
+
+    async def close(self) -> None:
+        """Close the underlying aiohttp session and its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
@@ -0,0 +1,200 @@
+"""
+Client-side rate limiting for catalog API calls.
+
+Bricklink enforces a daily call quota and answers bursts with 429s.
+CatalogRateLimiter keeps us under both limits with two token buckets (calls
+per second and calls per day) and hands out per-second slots in priority
+order, so a user adding a set is not stuck behind a bulk import or cache
+refresh. Background calls also cannot spend the slice of the daily quota
+reserved for interactive ones.
+
+The priority of the current call is carried in a context variable, so code
+deep in the catalog layer does not need it threaded through every call:
+
+    await run_with_priority(Priority.BACKGROUND, lambda: catalog.fetch(...))
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from enum import IntEnum
+from typing import Any
+
+from app.core.exceptions import CatalogRateLimitError
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Catalog call priority; lower values are served first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+catalog_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "catalog_priority", default=Priority.INTERACTIVE
+)
+
+
+async def run_with_priority(priority: Priority, call: Callable[[], Awaitable[Any]]):
+    """
+    Await call() with catalog requests made inside it at the given priority.
+
+    Args:
+        priority: Priority for catalog calls made by call()
+        call: Coroutine function to run
+
+    Returns:
+        call()'s result
+    """
+    token = catalog_priority.set(priority)
+    try:
+        return await call()
+    finally:
+        catalog_priority.reset(token)
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at rate tokens per second."""
+
+    def __init__(
+        self, rate: float, capacity: float, timer: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens held
+            timer: Clock used for refills
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.timer = timer
+        self._tokens = capacity
+        self._updated = timer()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        now = self.timer()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        return self._tokens
+
+    def take(self) -> None:
+        """Remove one token (the caller checks availability first)."""
+        self._tokens = self.tokens - 1
+
+    def time_until_available(self) -> float:
+        """Seconds until at least one token is available."""
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class CatalogRateLimiter:
+    """
+    Per-second and per-day token buckets with priority-ordered waiting.
+
+    acquire() waits for a per-second token; waiters are served lowest
+    Priority first, then first come first served. If the daily bucket is
+    empty, acquire() raises CatalogRateLimitError instead of waiting hours.
+    """
+
+    def __init__(
+        self,
+        per_second: float = 5.0,
+        per_day: int = 5000,
+        burst: int | None = None,
+        interactive_reserve: float = 0.1,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the limiter with full buckets.
+
+        Args:
+            per_second: Sustained calls per second
+            per_day: Calls per rolling day
+            burst: Calls allowed back to back (default: per_second)
+            interactive_reserve: Fraction of the daily quota background
+                calls may not use
+            timer: Clock used for refills
+        """
+        self.second_bucket = TokenBucket(
+            per_second, burst if burst is not None else per_second, timer
+        )
+        self.day_bucket = TokenBucket(per_day / 86400, per_day, timer)
+        self.reserved = per_day * interactive_reserve
+        self._waiters: list[tuple[Priority, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+
+    async def acquire(self, priority: Priority | None = None) -> None:
+        """
+        Wait for permission to make one catalog call.
+
+        Args:
+            priority: Call priority (default: the current catalog_priority)
+
+        Raises:
+            CatalogRateLimitError: If the daily quota is used up
+        """
+        if priority is None:
+            priority = catalog_priority.get()
+
+        if not self._waiters and self.second_bucket.tokens >= 1:
+            self._grant(priority)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    def remaining(self) -> dict[str, float]:
+        """
+        Report the budget left in each bucket.
+
+        Returns:
+            Dict with per_second and per_day tokens available and the number
+            of callers waiting
+        """
+        return {
+            "per_second": round(self.second_bucket.tokens, 2),
+            "per_day": int(self.day_bucket.tokens),
+            "waiting": len(self._waiters),
+        }
+
+    def _grant(self, priority: Priority) -> None:
+        """Take one token from both buckets or raise if the day is spent."""
+        floor = self.reserved if priority > Priority.INTERACTIVE else 0
+        if self.day_bucket.tokens < floor + 1:
+            raise CatalogRateLimitError(
+                f"Daily Bricklink quota exhausted for {priority.name.lower()} calls"
+            )
+        self.second_bucket.take()
+        self.day_bucket.take()
+
+    async def _dispatch(self) -> None:
+        """Release waiters in priority order as per-second tokens refill."""
+        while self._waiters:
+            wait = self.second_bucket.time_until_available()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            priority, _, future = heapq.heappop(self._waiters)
+            if future.done():  # caller was cancelled
+                continue
+            try:
+                self._grant(priority)
+            except CatalogRateLimitError as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
@@ -0,0 +1,355 @@
+"""
+Scan-resistant W-TinyLFU cache for the catalog caches.
+
+With plain LRU, one bulk import or cache warm-up pass streams hundreds of
+set numbers through the cache and evicts the handful of sets users look at
+every day. W-TinyLFU keeps an approximate access frequency for every key it
+has seen (a count-min sketch that is halved periodically so old popularity
+fades) and only lets a new entry into the main cache if it has been used
+more often than the entry it would evict. A small LRU window in front of the
+main cache still gives brand-new keys a chance to prove themselves.
+
+WTinyLFUCache is a cachetools Cache with the same constructor as TLRUCache
+(per-entry expiry through a ttu function, optional getsizeof), so it can
+replace TLRUCache wherever one is used. It also counts hits and misses;
+replay() compares policies on a recorded sequence of keys:
+
+    python -m app.infrastructure.tinylfu keys.txt --size 100
+"""
+
+import argparse
+import heapq
+import itertools
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from cachetools import Cache, LRUCache, TLRUCache
+
+
+class CountMinSketch:
+    """
+    Approximate per-key access counts in a fixed amount of memory.
+
+    Counters saturate at 15 (TinyLFU only needs to tell rare from popular)
+    and are all halved once sample_size increments have been recorded.
+    """
+
+    MAX_COUNT = 15
+
+    def __init__(self, width: int, depth: int = 4, sample_size: int | None = None):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            width: Counters per row; rounded up to a power of two
+            depth: Number of rows (independent hash functions)
+            sample_size: Increments between agings (default: 10 * width)
+        """
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self.sample_size = sample_size or 10 * self.width
+        self._mask = self.width - 1
+        self._rows = [bytearray(self.width) for _ in range(depth)]
+        self._seeds = [random.getrandbits(32) for _ in range(depth)]
+        self._additions = 0
+
+    def increment(self, key: Hashable) -> None:
+        """Record one access to key."""
+        h = hash(key)
+        for row, seed in zip(self._rows, self._seeds, strict=True):
+            i = hash((seed, h)) & self._mask
+            if row[i] < self.MAX_COUNT:
+                row[i] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._age()
+
+    def estimate(self, key: Hashable) -> int:
+        """Approximate number of recent accesses to key (never too low)."""
+        h = hash(key)
+        return min(
+            row[hash((seed, h)) & self._mask]
+            for row, seed in zip(self._rows, self._seeds, strict=True)
+        )
+
+    def _age(self) -> None:
+        halved = bytes(count >> 1 for count in range(256))
+        for row in self._rows:
+            row[:] = row.translate(halved)
+        self._additions //= 2
+
+
+class WTinyLFUCache(Cache):
+    """
+    W-TinyLFU cache: an LRU admission window in front of a segmented LRU.
+
+    New entries enter the window. When the cache is full, the window's
+    oldest entry competes with the main cache's eviction victim and only
+    the one the sketch has seen more often is kept. Entries hit again while
+    on probation are promoted to the protected segment, which scans cannot
+    flush.
+    """
+
+    def __init__(
+        self,
+        maxsize: float,
+        ttu: Callable[[Any, Any, float], float] | None = None,
+        timer: Callable[[], float] = time.monotonic,
+        getsizeof: Callable[[Any], float] | None = None,
+        window_ratio: float = 0.01,
+        protected_ratio: float = 0.8,
+        expected_entries: int | None = None,
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Capacity, in entries or in getsizeof units
+            ttu: Optional TLRUCache-style time-to-use function
+                (key, value, now) -> expiry time
+            timer: Clock passed to ttu
+            getsizeof: Optional function returning an entry's size
+            window_ratio: Share of maxsize used by the admission window
+            protected_ratio: Share of the main cache reserved for entries
+                hit more than once
+            expected_entries: Number of entries the frequency sketch is
+                sized for (default: maxsize, or 1024 when getsizeof is given)
+        """
+        Cache.__init__(self, maxsize, getsizeof)
+        self.ttu = ttu
+        self.timer = timer
+        self.window_max = maxsize * window_ratio
+        self.protected_max = (maxsize - self.window_max) * protected_ratio
+        self.hits = 0
+        self.misses = 0
+        if expected_entries is None:
+            expected_entries = int(maxsize) if getsizeof is None else 1024
+        # Wide rows keep collisions from inflating the counts of one-off keys
+        # (e.g. a scan) past those of genuinely popular ones
+        self._sketch = CountMinSketch(
+            width=16 * expected_entries, sample_size=10 * expected_entries
+        )
+        # key -> size, least recently used first
+        self._window: OrderedDict[Any, float] = OrderedDict()
+        self._probation: OrderedDict[Any, float] = OrderedDict()
+        self._protected: OrderedDict[Any, float] = OrderedDict()
+        self._window_size = 0.0
+        self._probation_size = 0.0
+        self._protected_size = 0.0
+        self._expires: dict[Any, float] = {}
+        self._expiry_heap: list[tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+
+    def __contains__(self, key: Any) -> bool:
+        return Cache.__contains__(self, key) and not self._expired(key)
+
+    def __getitem__(self, key: Any) -> Any:
+        self._sketch.increment(key)
+        if key not in self:
+            self.misses += 1
+            return self.__missing__(key)
+        self.hits += 1
+        self._touch(key)
+        return Cache.__getitem__(self, key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        expires = None
+        if self.ttu is not None:
+            now = self.timer()
+            expires = self.ttu(key, value, now)
+            if not now < expires:
+                return  # skip expired items, like TLRUCache
+            self.expire(now)
+
+        Cache.__setitem__(self, key, value)  # may evict via popitem()
+        size = self.getsizeof(value)
+        if key in self._protected:
+            self._protected_size += size - self._protected[key]
+            self._protected[key] = size
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            self._probation_size += size - self._probation[key]
+            self._probation[key] = size
+            self._probation.move_to_end(key)
+        else:
+            self._window_size += size - self._window.pop(key, 0)
+            self._window[key] = size
+            self._drain_window()
+
+        if expires is None:
+            self._expires.pop(key, None)
+        else:
+            self._expires[key] = expires
+            heapq.heappush(self._expiry_heap, (expires, next(self._seq), key))
+
+    def __delitem__(self, key: Any) -> None:
+        Cache.__delitem__(self, key)
+        self._expires.pop(key, None)
+        for segment, attr in (
+            (self._window, "_window_size"),
+            (self._probation, "_probation_size"),
+            (self._protected, "_protected_size"),
+        ):
+            if key in segment:
+                setattr(self, attr, getattr(self, attr) - segment.pop(key))
+                return
+
+    def __iter__(self):
+        return (key for key in Cache.__iter__(self) if not self._expired(key))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def popitem(self) -> tuple[Any, Any]:
+        """Evict one entry, applying the TinyLFU admission test."""
+        self.expire()
+        victim = next(iter(self._probation or self._protected), None)
+        candidate = None
+        if self._window and (victim is None or self._window_size > self.window_max):
+            candidate = next(iter(self._window))
+
+        if candidate is not None and victim is not None:
+            if self._sketch.estimate(candidate) > self._sketch.estimate(victim):
+                evict = victim
+                self._admit(candidate)
+            else:
+                evict = candidate
+        elif candidate is not None or victim is not None:
+            evict = candidate if candidate is not None else victim
+        elif self._window:
+            evict = next(iter(self._window))
+        else:
+            raise KeyError(f"{type(self).__name__} is empty")
+
+        value = Cache.__getitem__(self, evict)
+        del self[evict]
+        return evict, value
+
+    def clear(self) -> None:
+        for key in list(Cache.__iter__(self)):
+            del self[key]
+        self._expiry_heap.clear()
+
+    def expire(self, time: float | None = None) -> None:
+        """Remove expired entries."""
+        if self.ttu is None:
+            return
+        if time is None:
+            time = self.timer()
+        heap = self._expiry_heap
+        while heap and not time < heap[0][0]:
+            expires, _, key = heapq.heappop(heap)
+            if self._expires.get(key) == expires:
+                del self[key]
+
+    def stats(self) -> dict[str, float]:
+        """
+        Report lookup statistics since creation.
+
+        Returns:
+            Dict with hits, misses and hit_ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _expired(self, key: Any) -> bool:
+        expires = self._expires.get(key)
+        return expires is not None and not self.timer() < expires
+
+    def _touch(self, key: Any) -> None:
+        """Record a hit: refresh recency and promote probation entries."""
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            size = self._probation.pop(key)
+            self._probation_size -= size
+            self._protected[key] = size
+            self._protected_size += size
+            while (
+                self._protected_size > self.protected_max and len(self._protected) > 1
+            ):
+                demoted, demoted_size = self._protected.popitem(last=False)
+                self._protected_size -= demoted_size
+                self._probation[demoted] = demoted_size
+                self._probation_size += demoted_size
+
+    def _admit(self, key: Any) -> None:
+        """Move the window's oldest entry into the main cache's probation."""
+        size = self._window.pop(key)
+        self._window_size -= size
+        self._probation[key] = size
+        self._probation_size += size
+
+    def _drain_window(self) -> None:
+        """Move window overflow into the main cache while it has room."""
+        main_max = self.maxsize - self.window_max
+        while self._window_size > self.window_max and len(self._window) > 1:
+            oldest, size = next(iter(self._window.items()))
+            if self._probation_size + self._protected_size + size > main_max:
+                break  # full: the next popitem() decides admission
+            self._admit(oldest)
+
+
+def replay(keys: Iterable[Hashable], cache: Cache) -> dict[str, float]:
+    """
+    Feed an access sequence through a cache, loading every miss.
+
+    Args:
+        keys: Keys in access order, e.g. set numbers from an access log
+        cache: Empty cache to measure
+
+    Returns:
+        Dict with hits, misses and hit_ratio
+    """
+    hits = misses = 0
+    for key in keys:
+        if cache.get(key) is None:
+            misses += 1
+            cache[key] = True
+        else:
+            hits += 1
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+def _forever(key: Any, value: Any, now: float) -> float:
+    return float("inf")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Compare LRU, TLRU and W-TinyLFU hit ratios on a file of keys."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("log", help="File with one key (set number) per line")
+    parser.add_argument("--size", type=int, default=100, help="Cache entries")
+    args = parser.parse_args(argv)
+
+    with open(args.log) as f:
+        keys = [line.strip() for line in f if line.strip()]
+    policies = {
+        "lru": LRUCache(args.size),
+        "tlru": TLRUCache(args.size, ttu=_forever),
+        "wtinylfu": WTinyLFUCache(args.size),
+    }
+    print(f"{len(keys)} accesses, {len(set(keys))} distinct keys, size {args.size}")
+    for name, cache in policies.items():
+        stats = replay(keys, cache)
+        print(f"{name:>9}: hit ratio {stats['hit_ratio']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Single-writer group-commit queue for inventory mutations.
+
+SQLite allows one writer at a time, so concurrent requests that each open a
+session and commit end up queueing on the file lock (and fsyncing once each).
+InventoryWriteQueue funnels those writes through one background task that
+applies everything pending in a single transaction, so N concurrent writes
+cost one commit instead of N.
+"""
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.models import Part
+from app.core.states import PieceState
+from app.infrastructure.db import SqliteInventoryRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    """One queued repository call and the future its caller is awaiting."""
+
+    method: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+
+class InventoryWriteQueue:
+    """
+    Batches inventory writes from all requests into shared transactions.
+
+    A batch is flushed when max_batch writes are pending or max_delay seconds
+    after its first write arrived, whichever comes first. Each caller awaits
+    the result of its own write. If a batch fails, its writes are retried one
+    transaction each so a single bad write cannot fail the others.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_batch: int = 100,
+        max_delay: float = 0.005,
+    ):
+        """
+        Initialize the write queue.
+
+        Args:
+            session_factory: Factory for the sessions batches are written with
+            max_batch: Maximum number of writes applied in one transaction
+            max_delay: Seconds to wait for more writes before flushing
+        """
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue[_PendingWrite] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="inventory-writer")
+
+    async def stop(self) -> None:
+        """Flush pending writes and stop the writer task."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def add_part(
+        self,
+        set_no: str,
+        part: Part,
+        qty: int = 1,
+        state: PieceState = PieceState.OWNED_FREE,
+    ) -> None:
+        """Queue SqliteInventoryRepository.add_part and wait for its commit."""
+        await self._submit("add_part", (set_no, part), {"qty": qty, "state": state})
+
+    async def update_item(
+        self,
+        part_no: str,
+        color_id: int,
+        qty: int,
+        state: PieceState,
+        set_no: str | None = None,
+    ) -> bool:
+        """Queue SqliteInventoryRepository.update_item and wait for its commit."""
+        updated: bool = await self._submit(
+            "update_item", (part_no, color_id, qty, state), {"set_no": set_no}
+        )
+        return updated
+
+    async def _submit(self, method: str, args: tuple, kwargs: dict) -> Any:
+        if self._task is None:
+            raise RuntimeError("InventoryWriteQueue has not been started")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingWrite(method, args, kwargs, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[_PendingWrite]) -> None:
+        try:
+            async with self.session_factory() as db:
+                outcomes = await db.run_sync(self._apply, batch)
+        except Exception as e:
+            logger.exception("Inventory write batch failed")
+            outcomes = [(False, e)] * len(batch)
+
+        for write, (ok, value) in zip(batch, outcomes, strict=True):
+            if write.future.done():  # caller was cancelled
+                continue
+            if ok:
+                write.future.set_result(value)
+            else:
+                write.future.set_exception(value)
+
+    @staticmethod
+    def _apply(db: Session, batch: list[_PendingWrite]) -> list[tuple[bool, Any]]:
+        """Apply a batch in one transaction, or one by one if that fails."""
+        repo = SqliteInventoryRepository(db)
+        try:
+            results = [
+                (True, getattr(repo, w.method)(*w.args, commit=False, **w.kwargs))
+                for w in batch
+            ]
+            db.commit()
+            logger.debug(f"Committed {len(batch)} inventory writes")
+            return results
+        except Exception as e:
+            db.rollback()
+            if len(batch) == 1:
+                return [(False, e)]
+
+        outcomes: list[tuple[bool, Any]] = []
+        for w in batch:
+            try:
+                outcomes.append((True, getattr(repo, w.method)(*w.args, **w.kwargs)))
+            except Exception as e:
+                db.rollback()
+                outcomes.append((False, e))
+        return outcomes
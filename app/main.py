@@ -1,10 +1,30 @@
+import asyncio
+import contextlib
 import logging
+import os
 from contextlib import asynccontextmanager
 
-from fastapi import APIRouter, Depends, FastAPI
+from fastapi import APIRouter, Depends, FastAPI, Request
+from sqlalchemy import text
 
-from app.api import inventory_router, sets_router
-from app.infrastructure.db import get_db, init_db
+from app.api import inventory_router, jobs_router, sets_router
+from app.core.catalog_interface import CatalogServiceInterface
+from app.infrastructure.bricklink_catalog import BricklinkCatalogService
+from app.infrastructure.bricklink_client import BricklinkClient
+from app.infrastructure.cache_manager import CacheManager
+from app.infrastructure.cache_warmer import warm_catalog_cache
+from app.infrastructure.catalog_disk_cache import CatalogDiskCache
+from app.infrastructure.circuit_breaker import CircuitBreaker
+from app.infrastructure.db import (
+    AsyncReadSessionLocal,
+    AsyncWriteSessionLocal,
+    get_async_read_db,
+    init_db,
+)
+from app.infrastructure.job_queue import JobWorkerPool, add_set_handler
+from app.infrastructure.oauth_client import AsyncOAuthHTTPClient, OAuthConfig
+from app.infrastructure.rate_limiter import CatalogRateLimiter
+from app.infrastructure.write_queue import InventoryWriteQueue
 
 logger = logging.getLogger("lego")
 
@@ -12,21 +32,114 @@ health_router = APIRouter()
 
 
 @health_router.get("/health")
-async def health_check(db=Depends(get_db)):
+async def health_check(request: Request, db=Depends(get_async_read_db)):
     try:
         # Simple connectivity check
-        next(db.execute("SELECT 1"))  # type: ignore
-        return {"status": "ok"}
+        await db.execute(text("SELECT 1"))
+        status = {"status": "ok"}
     except Exception:
         return {"status": "error"}
 
+    catalog_client = getattr(request.app.state, "catalog_client", None)
+    rate_limiter = getattr(catalog_client, "rate_limiter", None)
+    if rate_limiter is not None:
+        status["bricklink_budget"] = rate_limiter.remaining()
+    circuit_breaker = getattr(catalog_client, "circuit_breaker", None)
+    if circuit_breaker is not None:
+        status["bricklink_circuit"] = circuit_breaker.snapshot()
+    cache_manager = getattr(catalog_client, "cache_manager", None)
+    if cache_manager is not None:
+        status["catalog_cache_memory"] = cache_manager.occupancy()
+    return status
+
+
+def build_catalog_client() -> CatalogServiceInterface | BricklinkClient:
+    """
+    Build the catalog client shared by all requests.
+
+    Uses the Bricklink catalog service when OAuth credentials are configured
+    in the environment, otherwise falls back to the stub client.
+    """
+    config = OAuthConfig(
+        consumer_key=os.getenv("LEGO_BRICKLINK_CONSUMER_KEY", ""),
+        consumer_secret=os.getenv("LEGO_BRICKLINK_CONSUMER_SECRET", ""),
+        resource_owner_key=os.getenv("LEGO_BRICKLINK_TOKEN", ""),
+        resource_owner_secret=os.getenv("LEGO_BRICKLINK_TOKEN_SECRET", ""),
+    )
+    try:
+        config.validate()
+    except ValueError:
+        logger.warning("Bricklink credentials not set - using stub catalog client")
+        return BricklinkClient()
+    oauth_client = AsyncOAuthHTTPClient(
+        config,
+        max_connections_per_host=int(
+            os.getenv("LEGO_BRICKLINK_CONNECTIONS_PER_HOST", "10")
+        ),
+    )
+    disk_cache = None
+    cache_path = os.getenv("LEGO_CATALOG_CACHE_PATH", "./data/catalog_cache.db")
+    if cache_path:
+        disk_cache = CatalogDiskCache(
+            cache_path,
+            max_bytes=int(os.getenv("LEGO_CATALOG_CACHE_MAX_MB", "64")) * 1024 * 1024,
+        )
+    rate_limiter = CatalogRateLimiter(
+        per_second=float(os.getenv("LEGO_BRICKLINK_CALLS_PER_SECOND", "5")),
+        per_day=int(os.getenv("LEGO_BRICKLINK_CALLS_PER_DAY", "5000")),
+    )
+    return BricklinkCatalogService(
+        oauth_client,
+        disk_cache=disk_cache,
+        rate_limiter=rate_limiter,
+        circuit_breaker=CircuitBreaker(name="bricklink"),
+        validate_responses=os.getenv("LEGO_CATALOG_VALIDATE", "false").lower()
+        in ("1", "true", "yes"),
+        cache_manager=CacheManager(
+            max_bytes=int(os.getenv("LEGO_CATALOG_CACHE_MEMORY_MB", "32")) * 1024 * 1024
+        ),
+        cache_policy=os.getenv("LEGO_CATALOG_CACHE_POLICY", "tlru"),
+        not_found_ttl=float(os.getenv("LEGO_CATALOG_NOT_FOUND_TTL", "600")),
+    )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting application - initializing database")
     init_db()
     logger.info("Database initialized")
+    app.state.write_queue = InventoryWriteQueue(AsyncWriteSessionLocal)
+    app.state.write_queue.start()
+    app.state.catalog_client = build_catalog_client()
+    app.state.job_pool = JobWorkerPool(
+        AsyncWriteSessionLocal,
+        {
+            "add_set": add_set_handler(
+                AsyncWriteSessionLocal, app.state.catalog_client
+            ),
+        },
+        workers=int(os.getenv("LEGO_JOB_WORKERS", "2")),
+    )
+    await app.state.job_pool.start()
+    # Fill the catalog caches for owned sets without delaying readiness
+    warmup = None
+    if os.getenv("LEGO_CATALOG_WARMUP", "true").lower() in ("1", "true", "yes"):
+        warmup = asyncio.create_task(
+            warm_catalog_cache(
+                app.state.catalog_client,
+                AsyncReadSessionLocal,
+                limit=int(os.getenv("LEGO_CATALOG_WARMUP_LIMIT", "100")),
+            ),
+            name="catalog-warmup",
+        )
     yield
+    if warmup is not None:
+        warmup.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warmup
+    await app.state.job_pool.stop()
+    await app.state.catalog_client.close()
+    await app.state.write_queue.stop()
     logger.info("Shutdown complete")
 
 
@@ -38,6 +151,7 @@ def create_app() -> FastAPI:
     app = FastAPI(title="Lego Inventory Service", lifespan=lifespan)
     app.include_router(sets_router.router, prefix="/sets", tags=["sets"])
     app.include_router(inventory_router.router, prefix="/inventory", tags=["inventory"])
+    app.include_router(jobs_router.router, prefix="/jobs", tags=["jobs"])
     app.include_router(health_router, tags=["health"])
     app.include_router(health_router, tags=["health"])
     return app
@@ -1,4 +1,5 @@
-from collections.abc import Callable, Generator
+import asyncio
+from collections.abc import AsyncGenerator, Callable
 from typing import Any
 from unittest.mock import Mock
 
@@ -6,12 +7,19 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.api import sets_router
 from app.infrastructure.bricklink_client import BricklinkClient
-from app.infrastructure.db import get_db, metadata
+from app.infrastructure.db import (
+    get_async_db,
+    get_async_read_db,
+    get_async_session_factory,
+    metadata,
+)
+from app.infrastructure.job_queue import JobWorkerPool, add_set_handler
 from app.infrastructure.oauth_client import OAuthConfig
 from app.main import create_app
 
@@ -32,6 +40,24 @@ def db_session():
         session.close()
 
 
+@pytest.fixture(scope="function")
+def async_session_factory(tmp_path):
+    # aiosqlite cannot share an in-memory database across connections, so the
+    # async API tests run against a throwaway file instead.
+    db_url = f"sqlite:///{tmp_path / 'test.db'}"
+    sync_engine = create_engine(db_url)
+    metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    # NullPool: TestClient runs each request on its own event loop
+    engine = create_async_engine(
+        db_url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool
+    )
+    try:
+        yield async_sessionmaker(bind=engine, expire_on_commit=False)
+    finally:
+        asyncio.run(engine.dispose())
+
+
 class MockBricklinkClient(BricklinkClient):
     async def fetch_set_metadata(self, set_no: str):
         if set_no == "BAD":
@@ -52,17 +78,18 @@ def mock_bricklink_client():
 
 @pytest.fixture(scope="function")
 def test_app(
-    db_session: Session, mock_bricklink_client: MockBricklinkClient
+    async_session_factory: async_sessionmaker[AsyncSession],
+    mock_bricklink_client: MockBricklinkClient,
 ) -> FastAPI:
     app = create_app()
 
-    def override_get_db() -> Generator[Session, None, None]:
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_factory() as db:
+            yield db
 
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    app.dependency_overrides[get_async_session_factory] = lambda: async_session_factory
     # Override bricklink client to use mock behavior
     app.dependency_overrides[sets_router.get_bricklink_client] = (
         lambda: mock_bricklink_client
@@ -76,6 +103,32 @@ def client(test_app: FastAPI) -> TestClient:
     return TestClient(test_app)
 
 
+@pytest.fixture(scope="function")
+def job_pool(
+    async_session_factory: async_sessionmaker[AsyncSession],
+    mock_bricklink_client: MockBricklinkClient,
+) -> JobWorkerPool:
+    # No worker tasks are started; tests run queued jobs with run_pending()
+    return JobWorkerPool(
+        async_session_factory,
+        {"add_set": add_set_handler(async_session_factory, mock_bricklink_client)},
+    )
+
+
+@pytest.fixture(scope="function")
+def add_set(client: TestClient, job_pool: JobWorkerPool) -> Callable:
+    """POST /sets/ and run the resulting job to completion."""
+
+    async def add(set_no: str, assembled: bool = False):
+        response = client.post(
+            "/sets/", json={"set_no": set_no, "assembled": assembled}
+        )
+        await job_pool.run_pending()
+        return response
+
+    return add
+
+
 @pytest.fixture(scope="function")
 def oauth_config():
     return OAuthConfig(
@@ -44,18 +44,15 @@ def test_add_set_response_structure(playwright, base_url):
         "/sets/", data={"set_no": "75192-1", "assembled": False}
     )
 
-    # The API should return a valid response (success or error)
-    assert response.status in [
-        200,
-        404,
-        502,
-    ], f"Got unexpected status {response.status}"
-
-    # If successful, verify response structure
-    if response.status == 200:
-        data = response.json()
-        assert "ok" in data
-        assert "set" in data
+    # The import runs as a background job; the request is only accepted
+    assert response.status == 202, f"Got unexpected status {response.status}"
+    data = response.json()
+    assert data["ok"] is True
+
+    # The job is queryable whether or not the set exists in Bricklink
+    job = request_context.get(f"/jobs/{data['job_id']}")
+    assert job.status == 200
+    assert job.json()["status"] in ["QUEUED", "RUNNING", "SUCCEEDED", "FAILED"]
 
     request_context.dispose()
 
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -15,10 +17,10 @@ async def test_list_inventory_initial(client: TestClient):
 
 
 @pytest.mark.asyncio
-async def test_add_set_and_list_inventory(client: TestClient):
+async def test_add_set_and_list_inventory(client: TestClient, add_set):
     # Add a set which populates inventory
-    create = client.post("/sets/", json={"set_no": "8888", "assembled": False})
-    assert create.status_code == 200
+    create = await add_set("8888")
+    assert create.status_code == 202
     inv = client.get("/inventory/")
     assert inv.status_code == 200
     data = inv.json()
@@ -28,9 +30,9 @@ async def test_add_set_and_list_inventory(client: TestClient):
 
 
 @pytest.mark.asyncio
-async def test_update_inventory_item(client: TestClient):
+async def test_update_inventory_item(client: TestClient, add_set):
     # Ensure a set is present
-    client.post("/sets/", json={"set_no": "12345", "assembled": True})
+    await add_set("12345", assembled=True)
     listing = client.get("/inventory/")
     item = listing.json()["items"][0]
     update = client.patch(
@@ -48,3 +50,90 @@ async def test_update_inventory_item(client: TestClient):
     updated = [i for i in after["items"] if i["part_no"] == item["part_no"]][0]
     assert updated["qty"] == item["qty"] + 1
     assert updated["state"] == "OWNED_LOCKED"
+
+
+@pytest.mark.asyncio
+async def test_list_inventory_paginated(client: TestClient, add_set):
+    await add_set("1111")
+    await add_set("2222")
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/inventory/", params=params).json()
+        assert page["count"] <= 3
+        seen.extend((i["set_no"], i["part_no"]) for i in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 4
+    assert len(set(seen)) == 4
+
+
+@pytest.mark.asyncio
+async def test_list_inventory_invalid_cursor(client: TestClient):
+    resp = client.get("/inventory/", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_inventory_cursor_state_mismatch(client: TestClient, add_set):
+    await add_set("1111")
+    page = client.get("/inventory/", params={"limit": 1}).json()
+    resp = client.get(
+        "/inventory/",
+        params={"cursor": page["next_cursor"], "state": "OWNED_FREE"},
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_stream_inventory_ndjson(client: TestClient, add_set):
+    await add_set("1111")
+    await add_set("2222", assembled=True)
+
+    resp = client.get("/inventory/stream")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(lines) == 4
+    assert {line["set_no"] for line in lines} == {"1111", "2222"}
+
+    locked = client.get("/inventory/stream", params={"state": "OWNED_LOCKED"})
+    assert {json.loads(x)["set_no"] for x in locked.text.splitlines()} == {"2222"}
+
+
+@pytest.mark.asyncio
+async def test_update_inventory_item_by_set(client: TestClient, add_set):
+    await add_set("1111")
+    await add_set("2222")
+    update = client.patch(
+        "/inventory/",
+        json={
+            "set_no": "2222",
+            "part_no": "3001",
+            "color_id": 1,
+            "qty": 99,
+            "state": "MISSING",
+        },
+    )
+    assert update.status_code == 200
+    items = client.get("/inventory/").json()["items"]
+    bricks = {i["set_no"]: i["qty"] for i in items if i["part_no"] == "3001"}
+    assert bricks == {"1111": 4, "2222": 99}
+
+    missing = client.patch(
+        "/inventory/",
+        json={
+            "set_no": "3333",
+            "part_no": "3001",
+            "color_id": 1,
+            "qty": 1,
+            "state": "MISSING",
+        },
+    )
+    assert missing.status_code == 404
@@ -0,0 +1,106 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.api import sets_router
+from app.infrastructure.bricklink_catalog import BricklinkCatalogService
+from app.infrastructure.bricklink_client import BricklinkClient
+from app.infrastructure.cache_manager import CacheManager
+from app.infrastructure.circuit_breaker import CircuitBreaker
+from app.infrastructure.rate_limiter import CatalogRateLimiter
+from app.main import build_catalog_client
+
+BRICKLINK_ENV = {
+    "LEGO_BRICKLINK_CONSUMER_KEY": "key",
+    "LEGO_BRICKLINK_CONSUMER_SECRET": "secret",
+    "LEGO_BRICKLINK_TOKEN": "token",
+    "LEGO_BRICKLINK_TOKEN_SECRET": "token_secret",
+}
+
+
+@pytest.mark.asyncio
+async def test_health_check(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_health_check_reports_bricklink_status(test_app, client):
+    test_app.state.catalog_client = BricklinkCatalogService(
+        Mock(),
+        rate_limiter=CatalogRateLimiter(per_second=5, per_day=100),
+        circuit_breaker=CircuitBreaker(),
+    )
+    response = client.get("/health")
+    assert response.json() == {
+        "status": "ok",
+        "bricklink_budget": {"per_second": 5.0, "per_day": 100, "waiting": 0},
+        "bricklink_circuit": {
+            "state": "CLOSED",
+            "failure_rate": 0.0,
+            "slow_call_rate": 0.0,
+            "calls": 0,
+            "retry_in": None,
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_health_check_reports_cache_memory(test_app, client):
+    test_app.state.catalog_client = BricklinkCatalogService(
+        Mock(), cache_manager=CacheManager(max_bytes=1024)
+    )
+    response = client.get("/health")
+    assert response.json()["catalog_cache_memory"] == {
+        "max_bytes": 1024,
+        "used_bytes": 0,
+        "caches": {
+            "metadata": {"entries": 0, "bytes": 0},
+            "inventory": {"entries": 0, "bytes": 0},
+        },
+    }
+
+
+def test_build_catalog_client_with_credentials(monkeypatch, tmp_path):
+    for name, value in BRICKLINK_ENV.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setenv("LEGO_CATALOG_CACHE_PATH", str(tmp_path / "cache.db"))
+    catalog_client = build_catalog_client()
+    assert isinstance(catalog_client, BricklinkCatalogService)
+    assert catalog_client.disk_cache is not None
+    assert catalog_client.rate_limiter is not None
+    assert catalog_client.circuit_breaker is not None
+    assert catalog_client.cache_manager is not None
+    assert (tmp_path / "cache.db").exists()
+
+
+def test_build_catalog_client_without_disk_cache(monkeypatch):
+    for name, value in BRICKLINK_ENV.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setenv("LEGO_CATALOG_CACHE_PATH", "")
+    assert build_catalog_client().disk_cache is None
+
+
+def test_build_catalog_client_without_credentials(monkeypatch):
+    for name in BRICKLINK_ENV:
+        monkeypatch.delenv(name, raising=False)
+    assert isinstance(build_catalog_client(), BricklinkClient)
+
+
+@pytest.mark.asyncio
+async def test_catalog_client_shared_across_requests(test_app, client):
+    # Any BricklinkClient would return the same stub data, so spy on this one
+    shared = Mock(wraps=BricklinkClient())
+    test_app.state.catalog_client = shared
+    del test_app.dependency_overrides[sets_router.get_bricklink_client]
+
+    first = client.post("/sets/bulk", json={"set_nos": ["1111"]})
+    second = client.post("/sets/bulk", json={"set_nos": ["2222"]})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["results"][0]["name"] == "Set 1111"
+    assert [c.args for c in shared.fetch_set_metadata.call_args_list] == [
+        ("1111",),
+        ("2222",),
+    ]
@@ -1,16 +1,97 @@
 import pytest
 
+from app.infrastructure.rate_limiter import Priority, catalog_priority
+
 
 @pytest.mark.asyncio
-async def test_create_set_endpoint(client):
+async def test_create_set_endpoint(client, job_pool):
     response = client.post("/sets/", json={"set_no": "7777", "assembled": False})
-    assert response.status_code == 200
+    assert response.status_code == 202
     body = response.json()
     assert body["ok"] is True
-    assert body["set"]["set_no"] == "7777"
+    assert body["status"] == "QUEUED"
+    job_url = response.headers["Location"]
+    assert job_url == f"/jobs/{body['job_id']}"
+    assert client.get(job_url).json()["status"] == "QUEUED"
+
+    assert await job_pool.run_pending() == 1
+
+    job = client.get(job_url).json()
+    assert job["status"] == "SUCCEEDED"
+    assert job["attempts"] == 1
+    assert job["result"] == {
+        "set_no": "7777",
+        "name": "Test Set 7777",
+        "assembled": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_set_not_found(client, add_set):
+    response = await add_set("BAD")
+    assert response.status_code == 202
+
+    job = client.get(response.headers["Location"]).json()
+    assert job["status"] == "FAILED"
+    assert "not found" in job["error"]
+    assert job["result"] is None
+
+
+@pytest.mark.asyncio
+async def test_create_set_twice_is_idempotent(client, add_set):
+    await add_set("7777")
+    response = await add_set("7777")
+
+    job = client.get(response.headers["Location"]).json()
+    assert job["status"] == "SUCCEEDED"
+    assert job["result"]["set_no"] == "7777"
+    assert client.get("/inventory/").json()["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_job_not_found(client):
+    assert client.get("/jobs/999").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_sets(client, add_set):
+    await add_set("1111")
+
+    response = client.post(
+        "/sets/bulk",
+        json={"set_nos": ["2222", "BAD", "1111", "3333", "2222"], "assembled": True},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["set_no"] for r in body["results"]] == ["2222", "BAD", "1111", "3333"]
+    assert [r["ok"] for r in body["results"]] == [True, False, False, True]
+    assert body["results"][0]["name"] == "Test Set 2222"
+    assert "not found" in body["results"][1]["error"]
+    assert body["results"][2]["error"] == "Set already added"
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+
+    items = client.get("/inventory/").json()["items"]
+    assert {i["set_no"] for i in items} == {"1111", "2222", "3333"}
+
+
+def test_bulk_create_sets_fetches_at_background_priority(client, mock_bricklink_client):
+    priorities = []
+    fetch_metadata = mock_bricklink_client.fetch_set_metadata
+
+    async def fetch_set_metadata(set_no):
+        priorities.append(catalog_priority.get())
+        return await fetch_metadata(set_no)
+
+    mock_bricklink_client.fetch_set_metadata = fetch_set_metadata
+
+    response = client.post("/sets/bulk", json={"set_nos": ["2222", "3333"]})
+
+    assert response.json()["succeeded"] == 2
+    assert priorities == [Priority.BACKGROUND, Priority.BACKGROUND]
 
 
 @pytest.mark.asyncio
-async def test_create_set_not_found(client):
-    response = client.post("/sets/", json={"set_no": "BAD", "assembled": False})
-    assert response.status_code == 404
+async def test_bulk_create_sets_validation(client):
+    assert client.post("/sets/bulk", json={"set_nos": []}).status_code == 422
+    assert client.post("/sets/bulk", json={"set_nos": ["x"]}).status_code == 422
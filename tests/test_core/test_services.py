@@ -1,9 +1,20 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
 import pytest
 
-from app.core.exceptions import SetNotFoundError
+from app.core.catalog_interface import InventoryPart, SetMetadata
+from app.core.exceptions import (
+    BricklinkAPIError,
+    CatalogAPIError,
+    CatalogNotFoundError,
+    SetNotFoundError,
+)
 from app.core.services import InventoryService
 from app.core.states import PieceState
+from app.infrastructure.bricklink_catalog import BricklinkCatalogService
 from app.infrastructure.db import SqliteInventoryRepository, SqliteSetsRepository
+from app.infrastructure.oauth_client import OAuthHTTPClient
 
 
 @pytest.mark.asyncio
@@ -29,3 +40,235 @@ async def test_add_set_not_found(db_session, mock_bricklink_client):
 
     with pytest.raises(SetNotFoundError):
         await service.add_set("BAD", assembled=False)
+
+
+class CatalogModelClient:
+    """Returns catalog models, as BricklinkCatalogService does."""
+
+    async def fetch_set_metadata(self, set_no: str) -> SetMetadata:
+        if set_no == "404":
+            raise CatalogNotFoundError("Set not found in Bricklink catalog")
+        return SetMetadata(set_no=set_no, name="Millennium Falcon")
+
+    async def fetch_set_inventory(self, set_no: str) -> list[InventoryPart]:
+        return [InventoryPart(part_no="3001", color_id=1, qty=3, name="Brick")]
+
+
+@pytest.mark.asyncio
+async def test_add_set_with_catalog_models(db_session):
+    sets_repo = SqliteSetsRepository(db_session)
+    inv_repo = SqliteInventoryRepository(db_session)
+    service = InventoryService(inv_repo, sets_repo, CatalogModelClient())
+
+    lego_set = await service.add_set("75192")
+
+    assert lego_set.name == "Millennium Falcon"
+    assert [(i["part_no"], i["qty"]) for i in inv_repo.list()] == [("3001", 3)]
+
+
+@pytest.mark.asyncio
+async def test_add_set_catalog_not_found(db_session):
+    sets_repo = SqliteSetsRepository(db_session)
+    inv_repo = SqliteInventoryRepository(db_session)
+    service = InventoryService(inv_repo, sets_repo, CatalogModelClient())
+
+    with pytest.raises(SetNotFoundError):
+        await service.add_set("404")
+
+
+class SlowCatalogClient:
+    """Records how the two catalog calls overlap."""
+
+    def __init__(self, metadata=None, inventory_error=None):
+        self.metadata = metadata
+        self.inventory_error = inventory_error
+        self.inventory_cancelled = False
+        self.running = 0
+        self.max_running = 0
+
+    async def _call(self):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.running -= 1
+
+    async def fetch_set_metadata(self, set_no: str):
+        await self._call()
+        if isinstance(self.metadata, Exception):
+            raise self.metadata
+        return self.metadata
+
+    async def fetch_set_inventory(self, set_no: str):
+        try:
+            await self._call()
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            self.inventory_cancelled = True
+            raise
+        if self.inventory_error:
+            raise self.inventory_error
+        return [{"part_no": "3001", "color_id": 1, "qty": 1, "name": "Brick"}]
+
+
+@pytest.mark.asyncio
+async def test_add_set_fetches_concurrently(db_session):
+    client = SlowCatalogClient(metadata={"set_no": "75192", "name": "Falcon"})
+    service = InventoryService(
+        SqliteInventoryRepository(db_session), SqliteSetsRepository(db_session), client
+    )
+
+    await service.add_set("75192")
+
+    assert client.max_running == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "metadata, expected",
+    [
+        (None, SetNotFoundError),
+        (CatalogNotFoundError("404"), SetNotFoundError),
+        (CatalogAPIError("boom"), BricklinkAPIError),
+    ],
+)
+async def test_add_set_cancels_inventory_on_metadata_failure(
+    db_session, metadata, expected
+):
+    client = SlowCatalogClient(metadata=metadata)
+    service = InventoryService(
+        SqliteInventoryRepository(db_session), SqliteSetsRepository(db_session), client
+    )
+
+    with pytest.raises(expected):
+        await service.add_set("75192")
+    await asyncio.sleep(0)
+
+    assert client.inventory_cancelled
+
+
+@pytest.mark.asyncio
+async def test_add_set_cancels_shared_inventory_request(db_session):
+    """The catalog's single-flight request is cancelled, not just our wait on it."""
+    subsets_cancelled = asyncio.Event()
+
+    async def get(url, params=None):
+        if not url.endswith("/subsets"):
+            await asyncio.sleep(0.01)
+            raise CatalogNotFoundError("Set not found in Bricklink catalog")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            subsets_cancelled.set()
+            raise
+        return {"data": []}
+
+    oauth_client = Mock(spec=OAuthHTTPClient)
+    oauth_client.get = AsyncMock(side_effect=get)
+    catalog = BricklinkCatalogService(oauth_client)
+    service = InventoryService(
+        SqliteInventoryRepository(db_session), SqliteSetsRepository(db_session), catalog
+    )
+
+    with pytest.raises(SetNotFoundError):
+        await service.add_set("75192")
+    await asyncio.wait_for(subsets_cancelled.wait(), timeout=1)
+    await asyncio.sleep(0)
+
+    assert ("inventory", "75192") not in catalog._inflight
+    assert "75192" not in catalog.inventory_cache
+
+
+@pytest.mark.asyncio
+async def test_add_set_inventory_failure_mapped(db_session):
+    client = SlowCatalogClient(
+        metadata={"set_no": "75192", "name": "Falcon"},
+        inventory_error=CatalogAPIError("boom"),
+    )
+    sets_repo = SqliteSetsRepository(db_session)
+    service = InventoryService(SqliteInventoryRepository(db_session), sets_repo, client)
+
+    with pytest.raises(BricklinkAPIError):
+        await service.add_set("75192")
+    assert sets_repo.get("75192") is None
+
+
+class CountingCatalogClient:
+    """Tracks how many catalog calls overlap during a bulk import."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def _call(self):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.005)
+        self.running -= 1
+
+    async def fetch_set_metadata(self, set_no: str):
+        await self._call()
+        if set_no.startswith("BAD"):
+            raise CatalogNotFoundError(set_no)
+        return {"set_no": set_no, "name": f"Set {set_no}"}
+
+    async def fetch_set_inventory(self, set_no: str):
+        await self._call()
+        return [{"part_no": "3001", "color_id": 1, "qty": 2, "name": "Brick"}]
+
+
+@pytest.mark.asyncio
+async def test_add_sets_bounded_concurrency(db_session):
+    client = CountingCatalogClient()
+    inv_repo = SqliteInventoryRepository(db_session)
+    service = InventoryService(inv_repo, SqliteSetsRepository(db_session), client)
+    set_nos = [f"{1000 + i}" for i in range(30)] + ["BAD1"]
+
+    results = await service.add_sets(set_nos, concurrency=4, batch_size=5)
+
+    assert client.max_running <= 8  # two calls per set in flight
+    assert [r["set_no"] for r in results] == set_nos
+    assert sum(r["ok"] for r in results) == 30
+    assert results[-1]["ok"] is False
+    assert len(inv_repo.list()) == 30
+
+
+@pytest.mark.asyncio
+async def test_add_sets_isolates_failed_writes(db_session):
+    sets_repo = SqliteSetsRepository(db_session)
+    inv_repo = SqliteInventoryRepository(db_session)
+    service = InventoryService(inv_repo, sets_repo, CountingCatalogClient())
+    real_add = sets_repo.add
+
+    def add(lego_set, commit=True):
+        if lego_set.set_no == "2002":
+            raise RuntimeError("disk full")
+        real_add(lego_set, commit=commit)
+
+    sets_repo.add = add
+
+    results = await service.add_sets(["2001", "2002", "2003"], batch_size=10)
+
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert results[1]["error"] == "Failed to save set"
+    assert {i["set_no"] for i in inv_repo.list()} == {"2001", "2003"}
+
+
+@pytest.mark.asyncio
+async def test_add_sets_releases_session_while_fetching(db_session):
+    sets_repo = SqliteSetsRepository(db_session)
+    client = CountingCatalogClient()
+    in_transaction = []
+    fetch_metadata = client.fetch_set_metadata
+
+    async def fetch_set_metadata(set_no):
+        in_transaction.append(db_session.in_transaction())
+        return await fetch_metadata(set_no)
+
+    client.fetch_set_metadata = fetch_set_metadata
+    service = InventoryService(SqliteInventoryRepository(db_session), sets_repo, client)
+
+    await service.add_sets(["3001", "3002"])
+
+    assert in_transaction == [False, False]
@@ -4,8 +4,12 @@ Unit tests for Bricklink catalog service implementation.
 Tests the Bricklink-specific catalog service that uses OAuth client.
 """
 
+import asyncio
+import time
+import timeit
 from unittest.mock import AsyncMock, Mock
 
+import aiohttp
 import pytest
 
 from app.core.catalog_interface import InventoryPart, SetMetadata, SetSearchResult
@@ -16,8 +20,27 @@ from app.core.exceptions import (
     CatalogRateLimitError,
     CatalogTimeoutError,
 )
-from app.infrastructure.bricklink_catalog import BricklinkCatalogService
-from app.infrastructure.oauth_client import OAuthHTTPClient
+from app.infrastructure.bricklink_catalog import (
+    BricklinkCatalogService,
+    CacheEntry,
+    parse_subsets,
+)
+from app.infrastructure.cache_manager import CacheManager
+from app.infrastructure.catalog_disk_cache import CatalogDiskCache
+from app.infrastructure.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+)
+from app.infrastructure.compact_inventory import CompactInventory
+from app.infrastructure.oauth_client import AsyncOAuthHTTPClient, OAuthHTTPClient
+from app.infrastructure.rate_limiter import (
+    CatalogRateLimiter,
+    Priority,
+    catalog_priority,
+    run_with_priority,
+)
+from app.infrastructure.tinylfu import WTinyLFUCache
 
 
 @pytest.fixture
@@ -197,6 +220,21 @@ class TestBricklinkCatalogService:
 
         assert len(result1) == len(result2)
 
+    @pytest.mark.asyncio
+    async def test_inventory_cached_compactly(
+        self, bricklink_service, mock_oauth_client
+    ):
+        """Test that cached inventories are packed and materialized on read."""
+        mock_oauth_client.get.return_value = _subsets_response(10)
+
+        fetched = await bricklink_service.fetch_set_inventory("75192")
+        entry = bricklink_service.inventory_cache["75192"]
+        cached = await bricklink_service.fetch_set_inventory("75192")
+
+        assert isinstance(entry.value, CompactInventory)
+        assert cached == fetched
+        assert cached is not fetched
+
     @pytest.mark.asyncio
     async def test_fetch_set_inventory_filters_non_parts(
         self, bricklink_service, mock_oauth_client
@@ -332,14 +370,47 @@ class TestBricklinkCatalogService:
         with pytest.raises(CatalogAPIError):
             await bricklink_service.fetch_set_metadata("75192")
 
+    @pytest.mark.asyncio
+    async def test_close(self, bricklink_service, mock_oauth_client):
+        """Test that close() closes the OAuth client's session."""
+        await bricklink_service.close()
+
+        mock_oauth_client.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_convert_aiohttp_errors(self, bricklink_service, mock_oauth_client):
+        """Test that errors from the aiohttp transport are converted."""
+        not_found = aiohttp.ClientResponseError(Mock(), (), status=404)
+        mock_oauth_client.get.side_effect = not_found
+        with pytest.raises(CatalogNotFoundError):
+            await bricklink_service.fetch_set_metadata("99999")
+
+        mock_oauth_client.get.side_effect = TimeoutError()
+        with pytest.raises(CatalogTimeoutError):
+            await bricklink_service.fetch_set_metadata("75192")
+
+        mock_oauth_client.get.side_effect = aiohttp.ClientConnectionError()
+        with pytest.raises(CatalogAPIError):
+            await bricklink_service.fetch_set_metadata("75192")
+
+    @pytest.mark.asyncio
+    async def test_close_async_client(self):
+        """Test that close() awaits an async OAuth client's close()."""
+        oauth_client = Mock(spec=AsyncOAuthHTTPClient)
+        oauth_client.close = AsyncMock()
+        service = BricklinkCatalogService(oauth_client)
+
+        await service.close()
+
+        oauth_client.close.assert_awaited_once()
+
     def test_clear_cache(self, bricklink_service):
         """Test that clear_cache() clears both caches."""
         # Add some data to caches
-        bricklink_service.metadata_cache["75192"] = SetMetadata(
-            set_no="75192",
-            name="Test",
+        bricklink_service._remember(
+            "metadata", "75192", SetMetadata(set_no="75192", name="Test"), 60
         )
-        bricklink_service.inventory_cache["75192"] = []
+        bricklink_service._remember("inventory", "75192", [], 60)
 
         assert len(bricklink_service.metadata_cache) == 1
         assert len(bricklink_service.inventory_cache) == 1
@@ -470,3 +541,659 @@ class TestBricklinkCatalogService:
             await bricklink_service.fetch_set_metadata("75192")
 
         assert "Something went wrong" in str(exc_info.value)
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent upstream requests for the same set."""
+
+    @staticmethod
+    def _slow_get(response, calls):
+        async def get(url, params=None):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        return get
+
+    @pytest.mark.asyncio
+    async def test_concurrent_metadata_requests_share_one_call(
+        self, bricklink_service, mock_oauth_client
+    ):
+        """Test that concurrent misses for one set make a single API call."""
+        calls = []
+        mock_oauth_client.get.side_effect = self._slow_get(
+            {"data": {"no": "75192", "name": "Millennium Falcon"}}, calls
+        )
+
+        results = await asyncio.gather(
+            *(bricklink_service.fetch_set_metadata("75192") for _ in range(5))
+        )
+
+        assert len(calls) == 1
+        assert all(r.name == "Millennium Falcon" for r in results)
+        assert bricklink_service._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_are_not_coalesced(
+        self, bricklink_service, mock_oauth_client
+    ):
+        """Test that metadata and inventory, or different sets, fetch separately."""
+        calls = []
+        mock_oauth_client.get.side_effect = self._slow_get({"data": []}, calls)
+
+        await asyncio.gather(
+            bricklink_service.fetch_set_inventory("75192"),
+            bricklink_service.fetch_set_inventory("10221"),
+            bricklink_service.fetch_set_inventory("75192"),
+        )
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_all_waiters(
+        self, bricklink_service, mock_oauth_client
+    ):
+        """Test that every waiter receives the shared request's error."""
+        calls = []
+        mock_oauth_client.get.side_effect = self._slow_get(
+            ValueError("upstream broke"), calls
+        )
+
+        results = await asyncio.gather(
+            *(bricklink_service.fetch_set_inventory("75192") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert len(calls) == 1
+        assert all(isinstance(r, CatalogAPIError) for r in results)
+        assert bricklink_service._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_request(
+        self, bricklink_service, mock_oauth_client
+    ):
+        """Test that cancelling one caller leaves the request running for others."""
+        calls = []
+        mock_oauth_client.get.side_effect = self._slow_get(
+            {"data": {"no": "75192", "name": "Millennium Falcon"}}, calls
+        )
+
+        first = asyncio.create_task(bricklink_service.fetch_set_metadata("75192"))
+        second = asyncio.create_task(bricklink_service.fetch_set_metadata("75192"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        metadata = await second
+        assert metadata.name == "Millennium Falcon"
+        assert len(calls) == 1
+        assert first.cancelled()
+
+
+class TestDiskCacheTier:
+    """Test the persistent cache behind the in-memory caches."""
+
+    @pytest.fixture
+    def disk_cache(self, tmp_path):
+        cache = CatalogDiskCache(tmp_path / "catalog_cache.db")
+        yield cache
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_restart_warms_from_disk(self, mock_oauth_client, disk_cache):
+        """Test that a new service instance reuses responses stored on disk."""
+        mock_oauth_client.get.side_effect = [
+            {"data": {"no": "75192", "name": "Millennium Falcon"}},
+            {
+                "data": [
+                    {
+                        "entries": [
+                            {
+                                "item": {"no": "3001", "name": "Brick", "type": "PART"},
+                                "color_id": 5,
+                                "quantity": 2,
+                            }
+                        ]
+                    }
+                ]
+            },
+        ]
+        first = BricklinkCatalogService(mock_oauth_client, disk_cache=disk_cache)
+        await first.fetch_set_metadata("75192")
+        await first.fetch_set_inventory("75192")
+
+        restarted = BricklinkCatalogService(mock_oauth_client, disk_cache=disk_cache)
+        metadata = await restarted.fetch_set_metadata("75192")
+        parts = await restarted.fetch_set_inventory("75192")
+
+        assert mock_oauth_client.get.call_count == 2
+        assert metadata.name == "Millennium Falcon"
+        assert parts == [InventoryPart(part_no="3001", color_id=5, qty=2, name="Brick")]
+        assert "75192" in restarted.metadata_cache
+        assert "75192" in restarted.inventory_cache
+
+    @pytest.mark.asyncio
+    async def test_clear_cache_clears_disk(self, mock_oauth_client, disk_cache):
+        """Test that clear_cache() also empties the disk tier."""
+        service = BricklinkCatalogService(mock_oauth_client, disk_cache=disk_cache)
+        disk_cache.set("metadata", "75192", {"set_no": "75192", "name": "x"}, 60)
+
+        service.clear_cache()
+
+        assert disk_cache.get("metadata", "75192") is None
+
+    @pytest.mark.asyncio
+    async def test_disk_errors_fall_back_to_upstream(self, mock_oauth_client):
+        """Test that a broken disk cache does not fail catalog lookups."""
+        disk_cache = Mock(spec=CatalogDiskCache)
+        disk_cache.get_entry.side_effect = OSError("disk I/O error")
+        disk_cache.set.side_effect = OSError("disk I/O error")
+        mock_oauth_client.get.return_value = {"data": {"no": "75192", "name": "x"}}
+        service = BricklinkCatalogService(mock_oauth_client, disk_cache=disk_cache)
+
+        metadata = await service.fetch_set_metadata("75192")
+
+        assert metadata.name == "x"
+
+
+class TestStaleWhileRevalidate:
+    """Test soft/hard expiry and background refresh of cached entries."""
+
+    @staticmethod
+    def _make_stale(service, kind, set_no):
+        """Move an entry past its soft expiry, keeping its hard expiry."""
+        cache = service._caches[kind]
+        entry = cache[set_no]
+        cache[set_no] = entry._replace(soft_expires=time.monotonic() - 1)
+
+    @staticmethod
+    def _age(service, kind, set_no, seconds):
+        """Move an entry's expiry times seconds into the past."""
+        cache = service._caches[kind]
+        entry = cache.pop(set_no)
+        cache[set_no] = CacheEntry(
+            entry.value, entry.soft_expires - seconds, entry.hard_expires - seconds
+        )
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed(
+        self, bricklink_service, mock_oauth_client
+    ):
+        """Test that a stale hit returns at once and refreshes in the background."""
+        mock_oauth_client.get.return_value = {"data": {"no": "75192", "name": "Old"}}
+        await bricklink_service.fetch_set_metadata("75192")
+        self._make_stale(bricklink_service, "metadata", "75192")
+
+        mock_oauth_client.get.return_value = {"data": {"no": "75192", "name": "New"}}
+        stale = await bricklink_service.fetch_set_metadata("75192")
+        assert stale.name == "Old"
+
+        await asyncio.gather(*(f.task for f in bricklink_service._inflight.values()))
+        fresh = await bricklink_service.fetch_set_metadata("75192")
+        assert fresh.name == "New"
+        assert mock_oauth_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_not_refreshed(
+        self, bricklink_service, mock_oauth_client
+    ):
+        """Test that hits before the soft TTL do not trigger refreshes."""
+        mock_oauth_client.get.return_value = {"data": {"no": "75192", "name": "x"}}
+        await bricklink_service.fetch_set_metadata("75192")
+
+        await bricklink_service.fetch_set_metadata("75192")
+
+        assert bricklink_service._inflight == {}
+        assert mock_oauth_client.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self, bricklink_service, mock_oauth_client):
+        """Test that past the hard TTL the caller waits for a new fetch."""
+        mock_oauth_client.get.return_value = {"data": []}
+        await bricklink_service.fetch_set_inventory("75192")
+        self._age(bricklink_service, "inventory", "75192", 60 * 7 * 2)
+
+        assert "75192" not in bricklink_service.inventory_cache
+        await bricklink_service.fetch_set_inventory("75192")
+        assert mock_oauth_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(
+        self, bricklink_service, mock_oauth_client
+    ):
+        """Test that a failing background refresh leaves the cached value."""
+        mock_oauth_client.get.return_value = {"data": {"no": "75192", "name": "Old"}}
+        await bricklink_service.fetch_set_metadata("75192")
+        self._make_stale(bricklink_service, "metadata", "75192")
+
+        mock_oauth_client.get.side_effect = ValueError("upstream broke")
+        await bricklink_service.fetch_set_metadata("75192")
+        await asyncio.gather(
+            *(f.task for f in bricklink_service._inflight.values()),
+            return_exceptions=True,
+        )
+
+        metadata = await bricklink_service.fetch_set_metadata("75192")
+        assert metadata.name == "Old"
+        await asyncio.gather(
+            *(f.task for f in bricklink_service._inflight.values()),
+            return_exceptions=True,
+        )
+
+    def test_ttl_jitter_spreads_expiry(self, mock_oauth_client):
+        """Test that entry TTLs are spread within the jitter range."""
+        service = BricklinkCatalogService(
+            mock_oauth_client, cache_ttl=1000, ttl_jitter=0.1
+        )
+        ttls = {service._jittered_ttl("metadata") for _ in range(50)}
+
+        assert len(ttls) > 1
+        assert all(900 <= ttl <= 1100 for ttl in ttls)
+        assert all(
+            6300 <= service._jittered_ttl("inventory") <= 7700 for _ in range(50)
+        )
+
+
+class TestRateLimiting:
+    """Test that catalog calls pass through the rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_calls_acquire_limiter(self, mock_oauth_client):
+        """Test that each upstream call takes a token at the caller's priority."""
+        limiter = Mock(spec=CatalogRateLimiter)
+        limiter.acquire = AsyncMock()
+        mock_oauth_client.get.return_value = {"data": {"no": "75192", "name": "x"}}
+        service = BricklinkCatalogService(mock_oauth_client, rate_limiter=limiter)
+
+        await service.fetch_set_metadata("75192")
+        await service.fetch_set_metadata("75192")
+
+        limiter.acquire.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_is_low_priority(self, mock_oauth_client):
+        """Test that stale-entry refreshes run at background priority."""
+        priorities = []
+
+        async def get(url, params=None):
+            priorities.append(catalog_priority.get())
+            return {"data": {"no": "75192", "name": "x"}}
+
+        mock_oauth_client.get.side_effect = get
+        service = BricklinkCatalogService(mock_oauth_client, cache_ttl=60)
+        await service.fetch_set_metadata("75192")
+        TestStaleWhileRevalidate._make_stale(service, "metadata", "75192")
+
+        await service.fetch_set_metadata("75192")
+        await asyncio.gather(*(f.task for f in service._inflight.values()))
+
+        assert priorities == [Priority.INTERACTIVE, Priority.BACKGROUND]
+
+    @pytest.mark.asyncio
+    async def test_quota_error_not_rewrapped(self, mock_oauth_client):
+        """Test that the limiter's CatalogRateLimitError reaches the caller."""
+        limiter = CatalogRateLimiter(per_day=0)
+        service = BricklinkCatalogService(mock_oauth_client, rate_limiter=limiter)
+
+        with pytest.raises(CatalogRateLimitError):
+            await service.fetch_set_inventory("75192")
+        mock_oauth_client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_interactive_caller_retries_background_quota_error(
+        self, mock_oauth_client
+    ):
+        """Test that joining a background fetch cannot hit the background floor."""
+        limiter = CatalogRateLimiter(
+            per_second=100, per_day=10, interactive_reserve=0.5
+        )
+        for _ in range(5):  # leave only the interactive reserve
+            await limiter.acquire()
+        mock_oauth_client.get.return_value = {"data": {"no": "75192", "name": "x"}}
+        service = BricklinkCatalogService(mock_oauth_client, rate_limiter=limiter)
+
+        background, interactive = await asyncio.gather(
+            run_with_priority(
+                Priority.BACKGROUND, lambda: service.fetch_set_metadata("75192")
+            ),
+            service.fetch_set_metadata("75192"),
+            return_exceptions=True,
+        )
+
+        assert isinstance(background, CatalogRateLimitError)
+        assert interactive.name == "x"
+        assert mock_oauth_client.get.call_count == 1
+
+
+class TestCircuitBreaking:
+    """Test the circuit breaker around Bricklink calls."""
+
+    @pytest.mark.asyncio
+    async def test_outages_open_circuit(self, mock_oauth_client):
+        """Test that repeated upstream errors make later calls fail fast."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2)
+        limiter = CatalogRateLimiter(per_second=100)
+        service = BricklinkCatalogService(
+            mock_oauth_client, rate_limiter=limiter, circuit_breaker=breaker
+        )
+        mock_oauth_client.get.side_effect = aiohttp.ClientConnectionError()
+
+        for set_no in ("1", "2"):
+            with pytest.raises(CatalogAPIError):
+                await service.fetch_set_metadata(set_no)
+        assert breaker.state is CircuitState.OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await service.fetch_set_metadata("3")
+        assert mock_oauth_client.get.call_count == 2
+        assert limiter.remaining()["per_day"] == 4998  # no token spent
+
+    @pytest.mark.asyncio
+    async def test_not_found_does_not_open_circuit(self, mock_oauth_client):
+        """Test that 404s are not treated as an outage."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2)
+        service = BricklinkCatalogService(mock_oauth_client, circuit_breaker=breaker)
+        mock_oauth_client.get.side_effect = aiohttp.ClientResponseError(
+            Mock(), (), status=404
+        )
+
+        for set_no in ("1", "2", "3"):
+            with pytest.raises(CatalogNotFoundError):
+                await service.fetch_set_metadata(set_no)
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_spends_one_token(self, mock_oauth_client):
+        """Test that callers rejected during the trial call take no token."""
+        breaker = CircuitBreaker(min_calls=1, window_size=1, open_seconds=0)
+        limiter = CatalogRateLimiter(per_second=100, burst=1)  # callers must wait
+        service = BricklinkCatalogService(
+            mock_oauth_client, rate_limiter=limiter, circuit_breaker=breaker
+        )
+        mock_oauth_client.get.side_effect = aiohttp.ClientConnectionError()
+        with pytest.raises(CatalogAPIError):
+            await service.fetch_set_metadata("1")
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        async def get(url, params=None):
+            await asyncio.sleep(0.01)
+            return {"data": {"no": "2", "name": "x"}}
+
+        mock_oauth_client.get.side_effect = get
+        results = await asyncio.gather(
+            *(service.fetch_set_metadata(n) for n in ("2", "3", "4")),
+            return_exceptions=True,
+        )
+
+        assert sum(isinstance(r, CircuitOpenError) for r in results) == 2
+        assert limiter.remaining()["per_day"] == 4998
+
+
+class TestMemoryBudget:
+    """Test the service's caches under a shared byte budget."""
+
+    @pytest.mark.asyncio
+    async def test_large_inventories_evicted_to_fit_budget(self, mock_oauth_client):
+        """Test that caching a big inventory evicts older ones, not metadata."""
+        manager = CacheManager(max_bytes=300_000)
+        service = BricklinkCatalogService(mock_oauth_client, cache_manager=manager)
+        mock_oauth_client.get.return_value = {"data": {"no": "75192", "name": "x"}}
+        await service.fetch_set_metadata("75192")
+
+        mock_oauth_client.get.return_value = _subsets_response(7500)
+        await service.fetch_set_inventory("75192")
+        await service.fetch_set_inventory("10179")
+
+        assert manager.used_bytes() <= manager.max_bytes
+        assert "75192" not in service.inventory_cache
+        assert "10179" in service.inventory_cache
+        assert "75192" in service.metadata_cache
+        assert manager.occupancy()["caches"]["inventory"]["entries"] == 1
+
+
+class TestCachePolicy:
+    """Test selecting the in-memory cache eviction policy."""
+
+    @pytest.mark.asyncio
+    async def test_wtinylfu_policy(self, mock_oauth_client):
+        """Test that the W-TinyLFU caches are drop-in replacements."""
+        service = BricklinkCatalogService(mock_oauth_client, cache_policy="wtinylfu")
+        mock_oauth_client.get.return_value = {"data": {"no": "75192", "name": "x"}}
+
+        await service.fetch_set_metadata("75192")
+        await service.fetch_set_metadata("75192")
+
+        assert isinstance(service.metadata_cache, WTinyLFUCache)
+        assert isinstance(service.inventory_cache, WTinyLFUCache)
+        assert mock_oauth_client.get.call_count == 1
+        assert service.metadata_cache.stats()["hits"] == 1
+
+    def test_wtinylfu_under_memory_budget(self, mock_oauth_client):
+        """Test that budgeted W-TinyLFU caches report hit ratios."""
+        manager = CacheManager(max_bytes=1024)
+        BricklinkCatalogService(
+            mock_oauth_client, cache_manager=manager, cache_policy="wtinylfu"
+        )
+
+        assert manager.occupancy()["caches"]["metadata"] == {
+            "entries": 0,
+            "bytes": 0,
+            "hits": 0,
+            "misses": 0,
+            "hit_ratio": 0.0,
+        }
+
+    def test_unknown_policy(self, mock_oauth_client):
+        """Test that a misspelt policy fails at startup."""
+        with pytest.raises(ValueError):
+            BricklinkCatalogService(mock_oauth_client, cache_policy="lfu")
+
+
+class TestNegativeCache:
+    """Test caching of set numbers Bricklink does not know."""
+
+    @pytest.fixture
+    def not_found(self):
+        return aiohttp.ClientResponseError(Mock(), (), status=404)
+
+    @pytest.mark.asyncio
+    async def test_not_found_is_remembered(
+        self, bricklink_service, mock_oauth_client, not_found
+    ):
+        """Test that a 404 is answered from cache for both fetches."""
+        mock_oauth_client.get.side_effect = not_found
+
+        with pytest.raises(CatalogNotFoundError):
+            await bricklink_service.fetch_set_metadata("99999")
+        with pytest.raises(CatalogNotFoundError):
+            await bricklink_service.fetch_set_metadata("99999")
+        with pytest.raises(CatalogNotFoundError):
+            await bricklink_service.fetch_set_inventory("99999")
+
+        assert mock_oauth_client.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_remembered(
+        self, bricklink_service, mock_oauth_client
+    ):
+        """Test that outages are retried rather than cached as not found."""
+        mock_oauth_client.get.side_effect = aiohttp.ClientResponseError(
+            Mock(), (), status=500
+        )
+
+        for _ in range(2):
+            with pytest.raises(CatalogAPIError):
+                await bricklink_service.fetch_set_metadata("75192")
+
+        assert mock_oauth_client.get.call_count == 2
+        assert len(bricklink_service.not_found_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_purge_not_found(
+        self, bricklink_service, mock_oauth_client, not_found
+    ):
+        """Test that a purged set number is looked up again."""
+        mock_oauth_client.get.side_effect = [
+            not_found,
+            {"data": {"no": "99999", "name": "New Set"}},
+        ]
+        with pytest.raises(CatalogNotFoundError):
+            await bricklink_service.fetch_set_metadata("99999")
+
+        assert bricklink_service.purge_not_found("99999") == 1
+        assert bricklink_service.purge_not_found("99999") == 0
+        metadata = await bricklink_service.fetch_set_metadata("99999")
+
+        assert metadata.name == "New Set"
+        assert mock_oauth_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_purge_all_and_clear_cache(
+        self, bricklink_service, mock_oauth_client, not_found
+    ):
+        """Test purging every entry, and that clear_cache() also does."""
+        mock_oauth_client.get.side_effect = not_found
+        for set_no in ("1", "2"):
+            with pytest.raises(CatalogNotFoundError):
+                await bricklink_service.fetch_set_metadata(set_no)
+
+        assert bricklink_service.purge_not_found() == 2
+
+        with pytest.raises(CatalogNotFoundError):
+            await bricklink_service.fetch_set_metadata("3")
+        bricklink_service.clear_cache()
+        assert len(bricklink_service.not_found_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(
+        self, bricklink_service, mock_oauth_client, not_found
+    ):
+        """Test that not-found results are only kept for not_found_ttl."""
+        mock_oauth_client.get.side_effect = not_found
+        with pytest.raises(CatalogNotFoundError):
+            await bricklink_service.fetch_set_metadata("99999")
+
+        bricklink_service.not_found_cache.expire(
+            time.monotonic() + bricklink_service.not_found_ttl
+        )
+        with pytest.raises(CatalogNotFoundError):
+            await bricklink_service.fetch_set_metadata("99999")
+
+        assert mock_oauth_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, mock_oauth_client, not_found):
+        """Test that not_found_ttl=0 turns negative caching off."""
+        service = BricklinkCatalogService(mock_oauth_client, not_found_ttl=0)
+        mock_oauth_client.get.side_effect = not_found
+
+        for _ in range(2):
+            with pytest.raises(CatalogNotFoundError):
+                await service.fetch_set_metadata("99999")
+
+        assert mock_oauth_client.get.call_count == 2
+
+
+def _subsets_response(parts: int) -> dict:
+    """Build a subsets response shaped like Bricklink's, with a minifig per 50 parts."""
+    entries = []
+    for i in range(parts):
+        entries.append(
+            {
+                "item": {
+                    "no": f"{3001 + i % 900}",
+                    "name": f"Brick 2 x {i % 8 + 1}",
+                    "type": "PART",
+                    "category_id": 5,
+                },
+                "color_id": i % 90,
+                "quantity": i % 12 + 1,
+                "extra_quantity": 0,
+                "is_alternate": i % 17 == 0,
+                "is_counterpart": i % 23 == 0,
+            }
+        )
+        if i % 50 == 0:
+            entries.append(
+                {"item": {"no": "sw0001", "name": "Pilot", "type": "MINIFIG"}}
+            )
+    # Bricklink groups entries in match sets of a few items each
+    return {
+        "meta": {"code": 200},
+        "data": [
+            {"match_no": n, "entries": entries[n : n + 4]}
+            for n in range(0, len(entries), 4)
+        ],
+    }
+
+
+class TestSubsetsParsing:
+    """Test the subsets parser's fast and validated paths."""
+
+    def test_fast_path_matches_validated_path(self):
+        """Test that unvalidated parts equal validated ones field for field."""
+        response = _subsets_response(200)
+
+        fast = parse_subsets(response)
+        validated = parse_subsets(response, validate=True)
+
+        assert len(fast) == 200
+        assert fast == validated
+        assert [p.model_dump() for p in fast] == [p.model_dump() for p in validated]
+        assert all(type(p) is InventoryPart for p in fast)
+
+    def test_missing_fields_use_defaults(self):
+        """Test that sparse entries get the same defaults as before."""
+        response = {"data": [{"entries": [{"item": {"type": "PART"}}, {}]}]}
+
+        assert parse_subsets(response) == [
+            InventoryPart(part_no="", color_id=0, qty=1, name="")
+        ]
+
+    def test_validated_path_rejects_malformed_parts(self):
+        """Test that the debug path surfaces bad field types."""
+        response = {
+            "data": [
+                {"entries": [{"item": {"no": "3001", "type": "PART"}, "color_id": "x"}]}
+            ]
+        }
+
+        with pytest.raises(ValueError):
+            parse_subsets(response, validate=True)
+
+    @pytest.mark.asyncio
+    async def test_service_validate_flag(self, mock_oauth_client):
+        """Test that validate_responses routes fetches through validation."""
+        mock_oauth_client.get.return_value = {
+            "data": [
+                {"entries": [{"item": {"no": "3001", "type": "PART"}, "color_id": "x"}]}
+            ]
+        }
+        service = BricklinkCatalogService(mock_oauth_client, validate_responses=True)
+
+        with pytest.raises(CatalogAPIError):
+            await service.fetch_set_inventory("75192")
+
+    def test_large_inventory_matches_validated_path(self):
+        """Test that both paths agree on a 7,500-part set."""
+        response = _subsets_response(7500)
+
+        fast = parse_subsets(response)
+
+        assert len(fast) == 7500
+        assert fast == parse_subsets(response, validate=True)
+
+    @pytest.mark.slow
+    def test_benchmark_7500_parts(self):
+        """Microbenchmark: the fast path beats validation on a 7,500-part set."""
+        response = _subsets_response(7500)
+
+        fast = min(timeit.repeat(lambda: parse_subsets(response), number=3, repeat=7))
+        validated = min(
+            timeit.repeat(
+                lambda: parse_subsets(response, validate=True), number=3, repeat=7
+            )
+        )
+
+        assert fast < validated, f"fast {fast:.3f}s vs validated {validated:.3f}s"
@@ -0,0 +1,103 @@
+"""
+Unit tests for the shared catalog cache memory budget.
+"""
+
+import pytest
+from cachetools import LRUCache
+
+from app.core.catalog_interface import InventoryPart, SetMetadata
+from app.infrastructure.cache_manager import CacheManager, approx_size
+from app.infrastructure.compact_inventory import CompactInventory
+
+
+def _forever(key, value, now):
+    return now + 3600
+
+
+def _sized(value: int) -> int:
+    """sizeof for tests: the value is its own size."""
+    return value
+
+
+class TestApproxSize:
+    """Test entry size estimates."""
+
+    def test_compact_inventory_reports_own_size(self):
+        """Test that nbytes() is used when a value provides it."""
+        inventory = CompactInventory.from_parts(
+            [InventoryPart(part_no="3001", color_id=5, qty=2, name="Brick")]
+        )
+
+        assert approx_size(inventory) == inventory.nbytes()
+
+    def test_models_and_containers_are_measured_recursively(self):
+        """Test that a model costs more than its bare object header."""
+        metadata = SetMetadata(set_no="75192", name="Millennium Falcon")
+
+        assert approx_size(metadata) > approx_size(metadata.__dict__) > 0
+        assert approx_size((metadata, 1.0)) > approx_size(metadata)
+
+
+class TestCacheManager:
+    """Test the shared budget across caches."""
+
+    def test_budget_is_shared_across_caches(self):
+        """Test that inserts into one cache evict from the largest cache."""
+        manager = CacheManager(max_bytes=100, sizeof=_sized)
+        small = manager.timed_cache("metadata", _forever)
+        large = manager.timed_cache("inventory", _forever)
+
+        small["a"] = 10
+        large["x"] = 40
+        large["y"] = 40
+        small["b"] = 20  # 110 bytes: evict from inventory, oldest first
+
+        assert "x" not in large
+        assert "y" in large
+        assert set(small) == {"a", "b"}
+        assert manager.used_bytes() == 70
+
+    def test_oversized_entry_is_not_cached(self):
+        """Test that an entry above the whole budget is skipped, not raised."""
+        manager = CacheManager(max_bytes=100, sizeof=_sized)
+        cache = manager.timed_cache("inventory", _forever)
+
+        cache["huge"] = 101
+
+        assert "huge" not in cache
+
+    def test_registered_cache_shares_budget(self):
+        """Test that other cachetools caches can join the budget."""
+        manager = CacheManager(max_bytes=100, sizeof=_sized)
+        cache = manager.register("other", LRUCache(maxsize=100, getsizeof=_sized))
+        timed = manager.timed_cache("metadata", _forever)
+        cache["a"] = 60
+        cache["b"] = 30
+
+        timed["c"] = 20
+
+        assert "a" not in cache
+        assert manager.used_bytes() == 50
+
+    def test_duplicate_name_rejected(self):
+        """Test that a cache name can only be registered once."""
+        manager = CacheManager()
+        manager.timed_cache("metadata", _forever)
+
+        with pytest.raises(ValueError):
+            manager.timed_cache("metadata", _forever)
+
+    def test_occupancy(self):
+        """Test that occupancy reports totals and per-cache use."""
+        manager = CacheManager(max_bytes=100, sizeof=_sized)
+        manager.timed_cache("metadata", _forever)["a"] = 10
+        manager.timed_cache("inventory", _forever)["x"] = 40
+
+        assert manager.occupancy() == {
+            "max_bytes": 100,
+            "used_bytes": 50,
+            "caches": {
+                "metadata": {"entries": 1, "bytes": 10},
+                "inventory": {"entries": 1, "bytes": 40},
+            },
+        }
@@ -0,0 +1,77 @@
+"""
+Unit tests for startup catalog cache warm-up.
+"""
+
+import pytest
+
+from app.core.exceptions import CatalogAPIError, CatalogRateLimitError
+from app.core.models import LegoSet
+from app.infrastructure.cache_warmer import warm_catalog_cache
+from app.infrastructure.db import AsyncSqliteSetsRepository
+from app.infrastructure.rate_limiter import Priority, catalog_priority
+
+
+class RecordingCatalogClient:
+    """Records fetched sets and the priority they were fetched at."""
+
+    def __init__(self, errors=None):
+        self.errors = errors or {}
+        self.calls = []
+
+    async def fetch_set_metadata(self, set_no):
+        self.calls.append(("metadata", set_no, catalog_priority.get()))
+        if set_no in self.errors:
+            raise self.errors[set_no]
+        return {"set_no": set_no, "name": set_no}
+
+    async def fetch_set_inventory(self, set_no):
+        self.calls.append(("inventory", set_no, catalog_priority.get()))
+        return []
+
+
+@pytest.fixture
+async def owned_sets(async_session_factory):
+    async with async_session_factory() as db:
+        repo = AsyncSqliteSetsRepository(db)
+        for set_no in ("1111", "2222", "3333"):
+            await repo.add(LegoSet(set_no=set_no, name=set_no))
+
+
+class TestWarmCatalogCache:
+    """Test walking owned sets into the catalog caches."""
+
+    @pytest.mark.asyncio
+    async def test_warms_recent_sets_at_background_priority(
+        self, async_session_factory, owned_sets
+    ):
+        """Test that the newest sets are fetched first, as background work."""
+        client = RecordingCatalogClient()
+
+        warmed = await warm_catalog_cache(client, async_session_factory, limit=2)
+
+        assert warmed == 2
+        assert [(kind, set_no) for kind, set_no, _ in client.calls] == [
+            ("metadata", "3333"),
+            ("inventory", "3333"),
+            ("metadata", "2222"),
+            ("inventory", "2222"),
+        ]
+        assert {priority for _, _, priority in client.calls} == {Priority.BACKGROUND}
+        assert catalog_priority.get() is Priority.INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_skips_failures_and_stops_on_rate_limit(
+        self, async_session_factory, owned_sets
+    ):
+        """Test that errors skip a set and an exhausted quota ends the run."""
+        client = RecordingCatalogClient(
+            errors={
+                "3333": CatalogAPIError("boom"),
+                "2222": CatalogRateLimitError("quota"),
+            }
+        )
+
+        warmed = await warm_catalog_cache(client, async_session_factory, limit=None)
+
+        assert warmed == 0
+        assert [set_no for _, set_no, _ in client.calls] == ["3333", "2222"]
@@ -0,0 +1,87 @@
+"""
+Unit tests for the persistent catalog disk cache.
+"""
+
+import pytest
+
+from app.infrastructure.catalog_disk_cache import CatalogDiskCache
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    """Provide a disk cache in a temporary file."""
+    cache = CatalogDiskCache(tmp_path / "catalog_cache.db")
+    yield cache
+    cache.close()
+
+
+class TestCatalogDiskCache:
+    """Test storage, expiry and eviction of the disk cache."""
+
+    def test_round_trip(self, disk_cache):
+        """Test that stored values are returned decoded."""
+        value = [{"part_no": "3001", "color_id": 5, "qty": 2}]
+        disk_cache.set("inventory", "75192", value, ttl=60)
+
+        assert disk_cache.get("inventory", "75192") == value
+        assert disk_cache.get("metadata", "75192") is None
+        assert disk_cache.get("inventory", "10221") is None
+
+    def test_expired_entries_are_misses(self, disk_cache):
+        """Test that an entry past its TTL is not returned."""
+        disk_cache.set("metadata", "75192", {"name": "Falcon"}, ttl=-1)
+
+        assert disk_cache.get("metadata", "75192") is None
+
+    def test_survives_reopen(self, tmp_path):
+        """Test that entries persist across cache instances."""
+        path = tmp_path / "catalog_cache.db"
+        cache = CatalogDiskCache(path)
+        cache.set("metadata", "75192", {"name": "Falcon"}, ttl=60)
+        cache.close()
+
+        reopened = CatalogDiskCache(path)
+        assert reopened.get("metadata", "75192") == {"name": "Falcon"}
+        reopened.close()
+
+    def test_values_are_compressed(self, disk_cache):
+        """Test that repetitive inventories are stored compressed."""
+        value = [{"part_no": "3001", "color_id": 5, "qty": 2}] * 500
+        disk_cache.set("inventory", "75192", value, ttl=60)
+
+        assert 0 < disk_cache.size_bytes() < 1000
+
+    def test_evicts_least_recently_used_over_budget(self, tmp_path):
+        """Test that the size budget is kept by dropping LRU entries."""
+        cache = CatalogDiskCache(tmp_path / "c.db", max_bytes=10_000, compress_level=0)
+        payload = "x" * 4000
+        cache.set("inventory", "a", payload, ttl=60)
+        cache.set("inventory", "b", payload, ttl=60)
+        cache.get("inventory", "a")  # "b" is now least recently used
+        cache.set("inventory", "c", payload, ttl=60)
+
+        assert cache.get("inventory", "a") == payload
+        assert cache.get("inventory", "b") is None
+        assert cache.get("inventory", "c") == payload
+        assert cache.size_bytes() <= 10_000
+        cache.close()
+
+    def test_delete_and_clear(self, disk_cache):
+        """Test removing one entry and all entries."""
+        disk_cache.set("metadata", "75192", {}, ttl=60)
+        disk_cache.set("metadata", "10221", {}, ttl=60)
+
+        disk_cache.delete("metadata", "75192")
+        assert disk_cache.get("metadata", "75192") is None
+
+        disk_cache.clear()
+        assert disk_cache.size_bytes() == 0
+
+    def test_get_entry_reports_remaining_ttl(self, disk_cache):
+        """Test that get_entry() returns the value and its remaining lifetime."""
+        disk_cache.set("metadata", "75192", {"name": "Falcon"}, ttl=60)
+
+        value, remaining = disk_cache.get_entry("metadata", "75192")
+
+        assert value == {"name": "Falcon"}
+        assert 59 < remaining <= 60
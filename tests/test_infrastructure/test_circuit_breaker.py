@@ -0,0 +1,180 @@
+"""
+Unit tests for the circuit breaker.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.exceptions import CatalogAPIError
+from app.infrastructure.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _ok():
+    return "ok"
+
+
+async def _fail():
+    raise ConnectionError("down")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        window_size=4,
+        min_calls=4,
+        failure_rate_threshold=0.5,
+        slow_call_seconds=1.0,
+        slow_call_rate_threshold=0.75,
+        open_seconds=30,
+        timer=clock,
+    )
+
+
+async def _call(breaker, fn):
+    try:
+        return await breaker.call(fn)
+    except ConnectionError:
+        return "failed"
+
+
+class TestCircuitBreaker:
+    """Test state transitions of the breaker."""
+
+    @pytest.mark.asyncio
+    async def test_opens_on_failure_rate_and_fails_fast(self, breaker):
+        """Test that enough failures open the circuit and reject calls."""
+        for fn in (_ok, _ok, _fail):
+            await _call(breaker, fn)
+        assert breaker.state is CircuitState.CLOSED
+
+        await _call(breaker, _fail)
+        assert breaker.state is CircuitState.OPEN
+
+        called = False
+
+        async def should_not_run():
+            nonlocal called
+            called = True
+
+        with pytest.raises(CatalogAPIError):
+            await breaker.call(should_not_run)
+        assert not called
+        snapshot = breaker.snapshot()
+        assert snapshot["state"] == "OPEN"
+        assert snapshot["retry_in"] == 30
+
+    @pytest.mark.asyncio
+    async def test_opens_on_slow_calls(self, breaker, clock):
+        """Test that calls over the latency threshold open the circuit."""
+
+        async def slow():
+            clock.now += 2
+
+        for _ in range(3):
+            await breaker.call(slow)
+        await breaker.call(_ok)
+        assert breaker.state is CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_ignored_errors_do_not_count(self, breaker):
+        """Test that errors rejected by is_failure leave the circuit closed."""
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                await breaker.call(_fail, is_failure=lambda e: False)
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_trial_closes_or_reopens(self, breaker, clock):
+        """Test recovery through a single successful trial call."""
+        for _ in range(4):
+            await _call(breaker, _fail)
+        clock.now = 30
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        assert await _call(breaker, _fail) == "failed"
+        assert breaker.state is CircuitState.OPEN
+
+        clock.now = 60
+        assert await breaker.call(_ok) == "ok"
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.snapshot()["calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_half_open_allows_one_trial_at_a_time(self, breaker, clock):
+        """Test that concurrent callers are rejected while the trial runs."""
+        for _ in range(4):
+            await _call(breaker, _fail)
+        clock.now = 30
+        release = asyncio.Event()
+
+        async def trial():
+            await release.wait()
+            return "ok"
+
+        task = asyncio.create_task(breaker.call(trial))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+        release.set()
+        assert await task == "ok"
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_trial_reserved_before_hook(self, breaker, clock):
+        """Test that callers rejected during the trial never run before()."""
+        for _ in range(4):
+            await _call(breaker, _fail)
+        clock.now = 30
+        release = asyncio.Event()
+        hooks = []
+
+        async def before():
+            hooks.append(len(hooks))
+            await release.wait()
+
+        task = asyncio.create_task(breaker.call(_ok, before=before))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(_ok, before=before)
+
+        release.set()
+        assert await task == "ok"
+        assert hooks == [0]
+
+    @pytest.mark.asyncio
+    async def test_failed_hook_releases_trial(self, breaker, clock):
+        """Test that an error in before() is not recorded as the trial outcome."""
+        for _ in range(4):
+            await _call(breaker, _fail)
+        clock.now = 30
+
+        async def before():
+            raise CatalogAPIError("no token")
+
+        with pytest.raises(CatalogAPIError):
+            await breaker.call(_ok, before=before)
+
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert await breaker.call(_ok) == "ok"
+        assert breaker.state is CircuitState.CLOSED
@@ -0,0 +1,105 @@
+"""
+Unit tests for the column-wise inventory representation.
+"""
+
+import sys
+
+from app.core.catalog_interface import InventoryPart
+from app.infrastructure.compact_inventory import CompactInventory, construct_part
+
+
+def _parts(count: int) -> list[InventoryPart]:
+    return [
+        InventoryPart(
+            part_no=f"{3001 + i % 40}",
+            color_id=i % 90,
+            qty=i % 12 + 1,
+            name=f"Brick 2 x {i % 8 + 1}",
+            is_spare=i % 5 == 0,
+            is_counterpart=i % 7 == 0,
+        )
+        for i in range(count)
+    ]
+
+
+class TestCompactInventory:
+    """Test packing and materializing inventories."""
+
+    def test_round_trip(self):
+        """Test that to_parts() returns the packed parts in order."""
+        parts = _parts(100)
+
+        inventory = CompactInventory.from_parts(parts)
+
+        assert len(inventory) == 100
+        assert inventory.to_parts() == parts
+        assert [p.model_dump() for p in inventory.to_parts()] == [
+            p.model_dump() for p in parts
+        ]
+
+    def test_flags(self):
+        """Test that spare and counterpart flags survive independently."""
+        parts = [
+            InventoryPart(part_no="1", color_id=0, qty=1, name="a"),
+            InventoryPart(part_no="2", color_id=0, qty=1, name="b", is_spare=True),
+            InventoryPart(
+                part_no="3", color_id=0, qty=1, name="c", is_counterpart=True
+            ),
+            InventoryPart(
+                part_no="4",
+                color_id=0,
+                qty=1,
+                name="d",
+                is_spare=True,
+                is_counterpart=True,
+            ),
+        ]
+
+        restored = CompactInventory.from_parts(parts).to_parts()
+
+        assert [(p.is_spare, p.is_counterpart) for p in restored] == [
+            (False, False),
+            (True, False),
+            (False, True),
+            (True, True),
+        ]
+
+    def test_strings_are_shared(self):
+        """Test that repeated part numbers and names point at one string."""
+        first = CompactInventory.from_parts(_parts(80))
+        second = CompactInventory.from_parts(_parts(80))
+
+        assert first.part_nos[0] is first.part_nos[40]
+        assert first.names[0] is second.names[0]
+
+    def test_materialized_parts_are_independent(self):
+        """Test that callers mutating returned parts cannot change the cache."""
+        inventory = CompactInventory.from_parts(_parts(3))
+
+        inventory.to_parts()[0].qty = 999
+
+        assert inventory.to_parts()[0].qty == 1
+
+    def test_nbytes_is_small(self):
+        """Test that a large inventory costs a few dozen bytes per part."""
+        inventory = CompactInventory.from_parts(_parts(7500))
+
+        assert inventory.nbytes() < 7500 * 40
+
+    def test_nbytes_counts_each_string_once(self):
+        """Test that repeated part numbers and names are counted once."""
+        one = CompactInventory.from_parts(_parts(40))
+        many = CompactInventory.from_parts(_parts(40) * 10)
+        strings = set(one.part_nos) | set(one.names)
+
+        assert one.nbytes() > sum(map(sys.getsizeof, strings))
+        assert many.nbytes() - one.nbytes() < 360 * 32  # columns only
+
+    def test_construct_part_matches_validated_model(self):
+        """Test that unvalidated parts behave like validated ones."""
+        part = construct_part("3001", 5, 2, "Brick", is_spare=True)
+
+        assert part == InventoryPart(
+            part_no="3001", color_id=5, qty=2, name="Brick", is_spare=True
+        )
+        assert part.model_fields_set == set(InventoryPart.model_fields)
@@ -0,0 +1,361 @@
+"""
+Unit tests for the SQLite repositories.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import SetNotFoundError
+from app.core.models import LegoSet, Part
+from app.core.states import PieceState
+from app.infrastructure.db import (
+    PIECE_STATE_CODES,
+    AsyncSqliteInventoryRepository,
+    AsyncSqliteSetsRepository,
+    SqliteInventoryRepository,
+    SqliteSetsRepository,
+    apply_sqlite_pragmas,
+    create_async_read_engine,
+    create_async_write_engine,
+    init_db,
+)
+
+
+def _add_sets(db, *set_nos: str) -> None:
+    for set_no in set_nos:
+        SqliteSetsRepository(db).add(LegoSet(set_no=set_no, name=f"Set {set_no}"))
+
+
+class TestAddParts:
+    """Test bulk part ingestion."""
+
+    def test_aggregates_duplicate_parts(self, db_session):
+        """Test that duplicate (part_no, color_id) entries are summed."""
+        repo = SqliteInventoryRepository(db_session)
+        _add_sets(db_session, "1234")
+        brick = Part(part_no="3001", color_id=1, name="Brick 2 x 4")
+        plate = Part(part_no="3020", color_id=1, name="Plate 2 x 4")
+
+        written = repo.add_parts("1234", [(brick, 4), (plate, 2), (brick, 3)])
+
+        assert written == 2
+        items = {i["part_no"]: i for i in repo.list()}
+        assert items["3001"]["qty"] == 7
+        assert items["3020"]["qty"] == 2
+
+    def test_merges_with_existing_rows(self, db_session):
+        """Test that parts already in the set have their qty increased."""
+        repo = SqliteInventoryRepository(db_session)
+        _add_sets(db_session, "1234")
+        brick = Part(part_no="3001", color_id=1, name="Brick 2 x 4")
+        repo.add_part("1234", brick, qty=2)
+
+        repo.add_parts("1234", [(brick, 5)], state=PieceState.OWNED_LOCKED)
+
+        items = repo.list()
+        assert len(items) == 1
+        assert items[0]["qty"] == 7
+        assert items[0]["state"] == PieceState.OWNED_LOCKED.value
+
+    def test_commits_pending_set_atomically(self, db_session):
+        """Test that a set added without commit is rolled back on failure."""
+        sets_repo = SqliteSetsRepository(db_session)
+        repo = SqliteInventoryRepository(db_session)
+        sets_repo.add(LegoSet(set_no="1234", name="Test"), commit=False)
+
+        def broken_parts():
+            yield Part(part_no="3001", color_id=1, name="Brick"), 1
+            raise RuntimeError("catalog stream broke")
+
+        with pytest.raises(RuntimeError):
+            repo.add_parts("1234", broken_parts())
+
+        assert sets_repo.get("1234") is None
+        assert repo.list() == []
+
+
+class TestSqlitePragmas:
+    """Test the per-connection PRAGMA profiles."""
+
+    def test_pi_profile_applied_on_connect(self, tmp_path):
+        """Test that the pi profile enables WAL and relaxed sync."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+        apply_sqlite_pragmas(engine, "pi")
+
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            # synchronous=NORMAL is reported as 1
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        engine.dispose()
+
+    def test_unknown_profile_rejected(self):
+        """Test that an unknown profile name raises ValueError."""
+        engine = create_engine("sqlite:///:memory:")
+        with pytest.raises(ValueError, match="Unknown SQLite profile"):
+            apply_sqlite_pragmas(engine, "turbo")
+
+
+class TestAsyncRepositories:
+    """Test the async repositories over an AsyncSession."""
+
+    @pytest.mark.asyncio
+    async def test_add_set_and_list_parts(self, async_session_factory):
+        """Test that async repos persist and read back a set's parts."""
+        async with async_session_factory() as db:
+            sets_repo = AsyncSqliteSetsRepository(db)
+            repo = AsyncSqliteInventoryRepository(db)
+            await sets_repo.add(LegoSet(set_no="1234", name="Test"), commit=False)
+            await repo.add_parts(
+                "1234", [(Part(part_no="3001", color_id=1, name="Brick"), 2)]
+            )
+
+        async with async_session_factory() as db:
+            assert (await AsyncSqliteSetsRepository(db).get("1234"))["name"] == "Test"
+            items = await AsyncSqliteInventoryRepository(db).list()
+            assert [(i["part_no"], i["qty"]) for i in items] == [("3001", 2)]
+
+
+class TestListPage:
+    """Test keyset pagination over the inventory table."""
+
+    def test_pages_cover_all_rows_once(self, db_session):
+        """Test that walking the pages returns every row exactly once."""
+        repo = SqliteInventoryRepository(db_session)
+        _add_sets(db_session, "1234")
+        repo.add_parts(
+            "1234",
+            [
+                (Part(part_no=f"30{i:02d}", color_id=1, name="Brick"), 1)
+                for i in range(5)
+            ],
+        )
+
+        first, after_id = repo.list_page(limit=2)
+        second, after_id2 = repo.list_page(limit=2, after_id=after_id)
+        third, after_id3 = repo.list_page(limit=2, after_id=after_id2)
+
+        assert [len(first), len(second), len(third)] == [2, 2, 1]
+        assert after_id3 is None
+        ids = [r["id"] for r in first + second + third]
+        assert ids == sorted(set(ids))
+
+    def test_filters_by_state(self, db_session):
+        """Test that pages only contain rows in the requested state."""
+        repo = SqliteInventoryRepository(db_session)
+        _add_sets(db_session, "1", "2")
+        brick = Part(part_no="3001", color_id=1, name="Brick")
+        repo.add_parts("1", [(brick, 1)], state=PieceState.OWNED_LOCKED)
+        repo.add_parts("2", [(brick, 1)], state=PieceState.OWNED_FREE)
+
+        rows, after_id = repo.list_page(state=PieceState.OWNED_FREE, limit=10)
+
+        assert [r["set_no"] for r in rows] == ["2"]
+        assert after_id is None
+
+    @pytest.mark.asyncio
+    async def test_iter_batches(self, async_session_factory):
+        """Test that streamed batches are bounded and cover every row."""
+        async with async_session_factory() as db:
+            repo = AsyncSqliteInventoryRepository(db)
+            await AsyncSqliteSetsRepository(db).add(LegoSet(set_no="1234", name="T"))
+            await repo.add_parts(
+                "1234",
+                [
+                    (Part(part_no=f"30{i:02d}", color_id=1, name="B"), 1)
+                    for i in range(5)
+                ],
+            )
+            batches = [b async for b in repo.iter_batches(batch_size=2)]
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+
+class TestUpdateItem:
+    """Test single-statement inventory updates."""
+
+    def test_update_by_set_targets_one_row(self, db_session):
+        """Test that set_no restricts the update to that set's row."""
+        repo = SqliteInventoryRepository(db_session)
+        _add_sets(db_session, "1111", "2222")
+        brick = Part(part_no="3001", color_id=1, name="Brick")
+        repo.add_parts("1111", [(brick, 1)])
+        repo.add_parts("2222", [(brick, 1)])
+
+        assert repo.update_item("3001", 1, 9, PieceState.MISSING, set_no="2222")
+
+        qty_by_set = {i["set_no"]: i["qty"] for i in repo.list()}
+        assert qty_by_set == {"1111": 1, "2222": 9}
+
+    def test_update_without_set_targets_first_row(self, db_session):
+        """Test that without set_no only the oldest matching row changes."""
+        repo = SqliteInventoryRepository(db_session)
+        _add_sets(db_session, "1111", "2222")
+        brick = Part(part_no="3001", color_id=1, name="Brick")
+        repo.add_parts("1111", [(brick, 1)])
+        repo.add_parts("2222", [(brick, 1)])
+
+        assert repo.update_item("3001", 1, 9, PieceState.MISSING)
+
+        qty_by_set = {i["set_no"]: i["qty"] for i in repo.list()}
+        assert qty_by_set == {"1111": 9, "2222": 1}
+
+    def test_update_missing_row(self, db_session):
+        """Test that updating an unknown row reports no match."""
+        repo = SqliteInventoryRepository(db_session)
+        assert not repo.update_item("3001", 1, 1, PieceState.MISSING, set_no="1")
+
+    def test_add_part_upserts(self, db_session):
+        """Test that add_part adds to the qty of an existing row."""
+        repo = SqliteInventoryRepository(db_session)
+        _add_sets(db_session, "1111")
+        brick = Part(part_no="3001", color_id=1, name="Brick")
+        repo.add_part("1111", brick, qty=2)
+        repo.add_part("1111", brick, qty=3, state=PieceState.OWNED_LOCKED)
+
+        items = repo.list()
+        assert len(items) == 1
+        assert items[0]["qty"] == 5
+        assert items[0]["state"] == PieceState.OWNED_LOCKED.value
+
+
+class TestCompactSchema:
+    """Test the normalized inventory layout and its migration."""
+
+    def test_state_stored_as_code_and_names_interned(self, db_session):
+        """Test that states are small ints and part names are stored once."""
+        _add_sets(db_session, "1111", "2222")
+        repo = SqliteInventoryRepository(db_session)
+        repo.add_parts("1111", [(Part(part_no="3001", color_id=1, name="Brick"), 1)])
+        repo.add_parts(
+            "2222",
+            [(Part(part_no="3001", color_id=5, name="Brick"), 1)],
+            state=PieceState.OWNED_LOCKED,
+        )
+
+        raw_states = db_session.execute(
+            text("SELECT state FROM inventory ORDER BY id")
+        ).scalars()
+        assert list(raw_states) == [
+            PIECE_STATE_CODES[PieceState.OWNED_FREE],
+            PIECE_STATE_CODES[PieceState.OWNED_LOCKED],
+        ]
+        parts = db_session.execute(text("SELECT part_no, name FROM parts")).all()
+        assert parts == [("3001", "Brick")]
+
+    def test_add_parts_fills_missing_part_names(self, db_session):
+        """Test that a part interned without a name gets one from later imports."""
+        _add_sets(db_session, "1111")
+        db_session.execute(text("INSERT INTO parts (part_no) VALUES ('3001')"))
+        repo = SqliteInventoryRepository(db_session)
+
+        repo.add_parts("1111", [(Part(part_no="3001", color_id=1, name="Brick"), 1)])
+        repo.add_parts("1111", [(Part(part_no="3001", color_id=2, name="Other"), 1)])
+
+        parts = db_session.execute(text("SELECT part_no, name FROM parts")).all()
+        assert parts == [("3001", "Brick")]
+
+    def test_add_parts_requires_set(self, db_session):
+        """Test that parts cannot be added to a set that does not exist."""
+        repo = SqliteInventoryRepository(db_session)
+        with pytest.raises(SetNotFoundError):
+            repo.add_parts("9999", [(Part(part_no="3001", color_id=1, name="B"), 1)])
+
+    def test_init_db_migrates_legacy_layout(self, tmp_path):
+        """Test that the string-keyed layout is converted in place."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as conn:
+            for ddl in (
+                "CREATE TABLE sets (id INTEGER PRIMARY KEY, set_no VARCHAR "
+                "NOT NULL UNIQUE, name VARCHAR, assembled BOOLEAN)",
+                "CREATE TABLE parts (id INTEGER PRIMARY KEY, part_no VARCHAR "
+                "NOT NULL, color_id INTEGER NOT NULL, name VARCHAR)",
+                "CREATE TABLE inventory (id INTEGER PRIMARY KEY, set_no VARCHAR "
+                "NOT NULL, part_no VARCHAR NOT NULL, color_id INTEGER NOT NULL, "
+                "qty INTEGER, state VARCHAR NOT NULL)",
+                "CREATE INDEX ix_inventory_state ON inventory (state)",
+                "INSERT INTO sets (set_no, name, assembled) VALUES ('1111', 'A', 0)",
+                "INSERT INTO inventory (set_no, part_no, color_id, qty, state) "
+                "VALUES ('1111', '3001', 1, 4, 'OWNED_FREE'), "
+                "('1111', '3020', 1, 2, 'MISSING'), "
+                "('2222', '3001', 1, 1, 'OWNED_LOCKED')",
+            ):
+                conn.exec_driver_sql(ddl)
+
+        init_db(engine)
+
+        with Session(engine) as db:
+            items = SqliteInventoryRepository(db).list()
+            assert {
+                (i["set_no"], i["part_no"], i["qty"], i["state"]) for i in items
+            } == {
+                ("1111", "3001", 4, "OWNED_FREE"),
+                ("1111", "3020", 2, "MISSING"),
+                ("2222", "3001", 1, "OWNED_LOCKED"),
+            }
+            assert SqliteSetsRepository(db).get("2222") is not None
+        engine.dispose()
+
+    def test_init_db_merges_legacy_duplicates(self, tmp_path):
+        """Test that legacy rows duplicating the new unique key are merged."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'dupes.db'}")
+        with engine.begin() as conn:
+            for ddl in (
+                "CREATE TABLE inventory (id INTEGER PRIMARY KEY, set_no VARCHAR "
+                "NOT NULL, part_no VARCHAR NOT NULL, color_id INTEGER NOT NULL, "
+                "qty INTEGER, state VARCHAR NOT NULL)",
+                "INSERT INTO inventory (set_no, part_no, color_id, qty, state) "
+                "VALUES ('1111', '3001', 5, 2, 'OWNED_FREE'), "
+                "('1111', '3001', 5, 3, 'OWNED_FREE'), "
+                "('1111', '3001', 6, 1, 'OWNED_FREE')",
+            ):
+                conn.exec_driver_sql(ddl)
+
+        init_db(engine)
+
+        with Session(engine) as db:
+            items = SqliteInventoryRepository(db).list()
+            assert sorted((i["color_id"], i["qty"]) for i in items) == [(5, 5), (6, 1)]
+        with engine.connect() as conn:
+            indexes = {
+                r[1] for r in conn.exec_driver_sql("PRAGMA index_list(inventory)")
+            }
+        assert "uq_inventory_set_part_color" in indexes
+        engine.dispose()
+
+
+class TestAsyncEngines:
+    """Test the separate read and write engines."""
+
+    @pytest.mark.asyncio
+    async def test_read_engine_rejects_writes(self, tmp_path):
+        """Test that reader sessions can read but never write."""
+        db_path = str(tmp_path / "rw.db")
+        init_db(create_engine(f"sqlite:///{db_path}"))
+        write_engine = create_async_write_engine(db_path)
+        read_engine = create_async_read_engine(db_path, pool_size=2)
+        try:
+            async with AsyncSession(write_engine) as db:
+                await AsyncSqliteSetsRepository(db).add(
+                    LegoSet(set_no="1234", name="A")
+                )
+
+            async with AsyncSession(read_engine) as db:
+                assert await AsyncSqliteSetsRepository(db).get("1234") is not None
+                with pytest.raises(OperationalError, match="readonly"):
+                    await AsyncSqliteSetsRepository(db).add(
+                        LegoSet(set_no="5678", name="B")
+                    )
+        finally:
+            await read_engine.dispose()
+            await write_engine.dispose()
+
+    def test_write_engine_has_single_connection(self, tmp_path):
+        """Test that the write pool never hands out a second connection."""
+        write_engine = create_async_write_engine(str(tmp_path / "w.db"))
+        pool = write_engine.sync_engine.pool
+        assert pool.size() == 1
+        assert pool._max_overflow == 0
@@ -0,0 +1,176 @@
+"""
+Unit tests for the durable background job queue.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.exceptions import SetNotFoundError
+from app.core.states import JobStatus
+from app.infrastructure.db import AsyncSqliteJobsRepository
+from app.infrastructure.job_queue import JobWorkerPool, add_set_handler
+
+_FINISHED = (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+async def _enqueue(session_factory, kind, payload):
+    async with session_factory() as db:
+        return await AsyncSqliteJobsRepository(db).enqueue(kind, payload)
+
+
+async def _get(session_factory, job_id):
+    async with session_factory() as db:
+        return await AsyncSqliteJobsRepository(db).get(job_id)
+
+
+class TestJobWorkerPool:
+    """Test claiming, running and recording jobs."""
+
+    @pytest.mark.asyncio
+    async def test_jobs_run_in_order_with_results(self, async_session_factory):
+        """Test that queued jobs run oldest first and store their results."""
+        seen = []
+
+        async def echo(payload):
+            seen.append(payload["n"])
+            return {"doubled": payload["n"] * 2}
+
+        pool = JobWorkerPool(async_session_factory, {"echo": echo})
+        ids = [await _enqueue(async_session_factory, "echo", {"n": n}) for n in (1, 2)]
+
+        assert await pool.run_pending() == 2
+
+        assert seen == [1, 2]
+        job = await _get(async_session_factory, ids[1])
+        assert job["status"] == JobStatus.SUCCEEDED
+        assert job["result"] == {"doubled": 4}
+        assert job["attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_recorded(self, async_session_factory):
+        """Test domain errors, unexpected errors and unknown kinds."""
+
+        async def not_found(payload):
+            raise SetNotFoundError("Set '9999' not found")
+
+        async def broken(payload):
+            raise RuntimeError("bug")
+
+        pool = JobWorkerPool(
+            async_session_factory, {"not_found": not_found, "broken": broken}
+        )
+        ids = [
+            await _enqueue(async_session_factory, kind, {})
+            for kind in ("not_found", "broken", "unknown")
+        ]
+
+        await pool.run_pending()
+
+        jobs = [await _get(async_session_factory, job_id) for job_id in ids]
+        assert all(job["status"] == JobStatus.FAILED for job in jobs)
+        assert [job["error"] for job in jobs] == [
+            "Set '9999' not found",
+            "Internal server error",
+            "Unknown job kind: unknown",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_workers_wake_on_notify(self, async_session_factory):
+        """Test that started workers pick up jobs without waiting to poll."""
+        done = asyncio.Event()
+
+        async def handler(payload):
+            done.set()
+            return {}
+
+        pool = JobWorkerPool(
+            async_session_factory, {"job": handler}, workers=2, poll_interval=60
+        )
+        await pool.start()
+        try:
+            await asyncio.sleep(0.05)  # let workers go idle
+            await _enqueue(async_session_factory, "job", {})
+            pool.notify()
+            await asyncio.wait_for(done.wait(), timeout=2)
+        finally:
+            await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_jobs_for_one_set_both_succeed(
+        self, async_session_factory
+    ):
+        """Test that the job losing the race to add a set returns the stored set."""
+
+        class SlowCatalog:
+            async def fetch_set_metadata(self, set_no):
+                await asyncio.sleep(0.05)  # both jobs pass the existence check
+                return {"set_no": set_no, "name": "Falcon"}
+
+            async def fetch_set_inventory(self, set_no):
+                return [{"part_no": "3001", "color_id": 1, "qty": 2, "name": "B"}]
+
+        pool = JobWorkerPool(
+            async_session_factory,
+            {"add_set": add_set_handler(async_session_factory, SlowCatalog())},
+            workers=2,
+        )
+        ids = [
+            await _enqueue(async_session_factory, "add_set", {"set_no": "75192"})
+            for _ in range(2)
+        ]
+        await pool.start()
+        try:
+            for _ in range(200):
+                jobs = [await _get(async_session_factory, i) for i in ids]
+                if all(j["status"] in _FINISHED for j in jobs):
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await pool.stop()
+
+        assert [j["status"] for j in jobs] == [JobStatus.SUCCEEDED] * 2
+        assert [j["result"]["name"] for j in jobs] == ["Falcon", "Falcon"]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_jobs_requeued_on_start(self, async_session_factory):
+        """Test that a job left RUNNING by a crash runs again after restart."""
+        job_id = await _enqueue(async_session_factory, "job", {})
+        async with async_session_factory() as db:
+            claimed = await AsyncSqliteJobsRepository(db).claim_next()
+        assert claimed["id"] == job_id
+
+        async def handler(payload):
+            return {}
+
+        pool = JobWorkerPool(async_session_factory, {"job": handler}, workers=1)
+        await pool.start()
+        try:
+            for _ in range(100):
+                job = await _get(async_session_factory, job_id)
+                if job["status"] == JobStatus.SUCCEEDED:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await pool.stop()
+
+        assert job["status"] == JobStatus.SUCCEEDED
+        assert job["attempts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_repeatedly_interrupted_job_is_failed(self, async_session_factory):
+        """Test that a job interrupted max_attempts times is not re-queued."""
+        job_id = await _enqueue(async_session_factory, "job", {})
+        async with async_session_factory() as db:
+            repo = AsyncSqliteJobsRepository(db)
+            await repo.claim_next()
+            assert await repo.requeue_running(max_attempts=2) == (1, 0)
+        async with async_session_factory() as db:
+            repo = AsyncSqliteJobsRepository(db)
+            await repo.claim_next()
+            assert await repo.requeue_running(max_attempts=2) == (0, 1)
+
+        job = await _get(async_session_factory, job_id)
+        assert job["status"] == JobStatus.FAILED
+        assert job["attempts"] == 2
+        assert "Interrupted" in job["error"]
@@ -4,12 +4,21 @@ Unit tests for the OAuth 1.0a HTTP client.
 Tests OAuth configuration, request signing, retries, and error handling.
 """
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
+from urllib.parse import unquote
 
+import aiohttp
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from oauthlib.oauth1 import Client as OAuth1Signer
 from requests_oauthlib import OAuth1Session
 
-from app.infrastructure.oauth_client import OAuthConfig, OAuthHTTPClient
+from app.infrastructure.oauth_client import (
+    AsyncOAuthHTTPClient,
+    OAuthConfig,
+    OAuthHTTPClient,
+)
 
 
 class TestOAuthConfig:
@@ -199,3 +208,123 @@ class TestOAuthHTTPClient:
         with patch.object(client.session, "close") as mock_close:
             client.close()
             mock_close.assert_called_once()
+
+
+@pytest.fixture
+async def oauth_server():
+    """Local aiohttp server that records requests and echoes them as JSON."""
+    received = []
+
+    async def echo(request: web.Request) -> web.Response:
+        received.append(request)
+        if request.path == "/missing":
+            return web.json_response({"error": "Not found"}, status=404)
+        return web.json_response(
+            {
+                "query": dict(request.query),
+                "form": dict(await request.post()),
+                "authorization": request.headers.get("Authorization", ""),
+            }
+        )
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", echo)
+    server = TestServer(app)
+    await server.start_server()
+    server.received = received
+    yield server
+    await server.close()
+
+
+class TestAsyncOAuthHTTPClient:
+    """Test the aiohttp-based OAuth HTTP client."""
+
+    def test_client_initialization(self, oauth_config):
+        """Test that connection limits are applied to the pooled session."""
+        client = AsyncOAuthHTTPClient(oauth_config, max_connections_per_host=4)
+        assert client.timeout == 30
+        assert client.max_connections_per_host == 4
+
+    def test_client_validates_config(self):
+        """Test that client validates config on init."""
+        with pytest.raises(ValueError):
+            AsyncOAuthHTTPClient(OAuthConfig("", "", "", ""))
+
+    @pytest.mark.asyncio
+    async def test_get_request_is_signed(self, oauth_config, oauth_server):
+        """Test that GET requests carry a valid OAuth 1.0a signature."""
+        client = AsyncOAuthHTTPClient(oauth_config)
+        url = str(oauth_server.make_url("/items/SET/75192"))
+
+        result = await client.get(url, params={"break_minifigs": "true"})
+        await client.close()
+
+        assert result["query"] == {"break_minifigs": "true"}
+        auth = result["authorization"]
+        assert auth.startswith("OAuth ")
+        assert 'oauth_consumer_key="key"' in auth
+        assert 'oauth_token="token"' in auth
+
+        # Recompute the signature as the server would
+        signer = OAuth1Signer(
+            "key",
+            client_secret="secret",
+            resource_owner_key="token",
+            resource_owner_secret="token_secret",
+        )
+        oauth_params = dict(p.split("=", 1) for p in auth[len("OAuth ") :].split(", "))
+        signer.nonce = unquote(oauth_params["oauth_nonce"].strip('"'))
+        signer.timestamp = unquote(oauth_params["oauth_timestamp"].strip('"'))
+        _, expected, _ = signer.sign(f"{url}?break_minifigs=true")
+        assert expected["Authorization"] == auth
+
+    @pytest.mark.asyncio
+    async def test_post_form_request(self, oauth_config, oauth_server):
+        """Test that form data is sent and signed."""
+        client = AsyncOAuthHTTPClient(oauth_config)
+
+        result = await client.post(
+            str(oauth_server.make_url("/create")), data={"name": "Test Set"}
+        )
+        await client.close()
+
+        assert result["form"] == {"name": "Test Set"}
+        assert "oauth_signature=" in result["authorization"]
+
+    @pytest.mark.asyncio
+    async def test_get_request_http_error(self, oauth_config, oauth_server):
+        """Test that error statuses raise ClientResponseError."""
+        client = AsyncOAuthHTTPClient(oauth_config)
+
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await client.get(str(oauth_server.make_url("/missing")))
+        await client.close()
+
+        assert exc_info.value.status == 404
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, oauth_config, oauth_server):
+        """Test that sequential requests share one pooled session."""
+        client = AsyncOAuthHTTPClient(oauth_config)
+
+        await client.get(str(oauth_server.make_url("/a")))
+        session = client.session
+        await client.get(str(oauth_server.make_url("/b")))
+
+        assert client.session is session
+        assert session.connector.limit_per_host == 10
+        await client.close()
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_max_retries_limits_attempts(self, oauth_config):
+        """Test that connection errors are retried at most max_retries times."""
+        client = AsyncOAuthHTTPClient(oauth_config, max_retries=1)
+        client._request = AsyncMock(
+            side_effect=aiohttp.ClientConnectionError("connection refused")
+        )
+
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await client.get("https://api.bricklink.com/api/store/v1/colors")
+
+        assert client._request.await_count == 1
@@ -0,0 +1,133 @@
+"""
+Unit tests for the catalog rate limiter.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.exceptions import CatalogRateLimitError
+from app.infrastructure.rate_limiter import (
+    CatalogRateLimiter,
+    Priority,
+    TokenBucket,
+    catalog_priority,
+    run_with_priority,
+)
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic bucket refills."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    """Test token bucket refill and consumption."""
+
+    def test_refills_up_to_capacity(self):
+        """Test that tokens refill at the rate and are capped at capacity."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=4, timer=clock)
+        for _ in range(4):
+            bucket.take()
+        assert bucket.tokens == 0
+        assert bucket.time_until_available() == 0.5
+
+        clock.now = 1.0
+        assert bucket.tokens == 2
+
+        clock.now = 10.0
+        assert bucket.tokens == 4
+
+
+class TestCatalogRateLimiter:
+    """Test per-second pacing, daily quota and priority ordering."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_paced(self):
+        """Test that calls beyond the burst wait for the bucket to refill."""
+        limiter = CatalogRateLimiter(per_second=100, burst=2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        for _ in range(4):
+            await limiter.acquire()
+
+        assert loop.time() - start >= 0.015
+        assert limiter.remaining()["per_day"] == 4996
+
+    @pytest.mark.asyncio
+    async def test_daily_quota_exhausted(self):
+        """Test that acquire() fails fast once the daily quota is spent."""
+        limiter = CatalogRateLimiter(per_second=100, per_day=2, timer=FakeClock())
+        await limiter.acquire()
+        await limiter.acquire()
+
+        with pytest.raises(CatalogRateLimitError):
+            await limiter.acquire()
+
+    @pytest.mark.asyncio
+    async def test_background_cannot_use_interactive_reserve(self):
+        """Test that the reserved slice of the day is for interactive calls."""
+        limiter = CatalogRateLimiter(
+            per_second=100, per_day=10, interactive_reserve=0.5, timer=FakeClock()
+        )
+        for _ in range(5):
+            await limiter.acquire(Priority.BACKGROUND)
+
+        with pytest.raises(CatalogRateLimitError):
+            await limiter.acquire(Priority.BACKGROUND)
+        await limiter.acquire(Priority.INTERACTIVE)
+        assert limiter.remaining()["per_day"] == 4
+
+    @pytest.mark.asyncio
+    async def test_interactive_waiters_served_first(self):
+        """Test that queued interactive calls jump ahead of background ones."""
+        limiter = CatalogRateLimiter(per_second=50, burst=1)
+        await limiter.acquire()  # empty the bucket so the rest queue up
+        order = []
+
+        async def call(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        background = [
+            asyncio.create_task(call(f"bg{i}", Priority.BACKGROUND)) for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(call("user", Priority.INTERACTIVE))
+        await asyncio.gather(*background, interactive)
+
+        assert order[0] == "user"
+        assert order[1:] == ["bg0", "bg1", "bg2"]
+
+    @pytest.mark.asyncio
+    async def test_priority_from_context(self):
+        """Test that acquire() defaults to the priority in the context."""
+        limiter = CatalogRateLimiter(
+            per_second=100, per_day=10, interactive_reserve=1.0, timer=FakeClock()
+        )
+        assert catalog_priority.get() is Priority.INTERACTIVE
+
+        with pytest.raises(CatalogRateLimitError):
+            await run_with_priority(Priority.BACKGROUND, limiter.acquire)
+        await limiter.acquire()
+        assert catalog_priority.get() is Priority.INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self):
+        """Test that a cancelled waiter does not consume a token."""
+        limiter = CatalogRateLimiter(per_second=50, burst=1)
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await limiter.acquire()
+
+        assert limiter.remaining()["per_day"] == 4998
@@ -0,0 +1,187 @@
+"""
+Unit tests for the W-TinyLFU catalog cache.
+"""
+
+import random
+
+import pytest
+from cachetools import LRUCache
+
+from app.infrastructure.tinylfu import CountMinSketch, WTinyLFUCache, main, replay
+
+
+class FakeTimer:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _ttl(seconds: float):
+    return lambda key, value, now: now + seconds
+
+
+def _scanned_workload() -> list[str]:
+    """Popular keys interrupted by one-off scans, like bulk imports."""
+    rng = random.Random(7)
+    hot = [f"hot-{i}" for i in range(30)]
+    keys = []
+    for round_no in range(50):
+        keys.extend(rng.choice(hot) for _ in range(100))
+        if round_no % 5 == 0:
+            keys.extend(f"scan-{round_no}-{i}" for i in range(200))
+    return keys
+
+
+class TestCountMinSketch:
+    """Test frequency estimates."""
+
+    def test_estimates_never_undercount(self):
+        """Test that estimates are at least the true count (up to the cap)."""
+        sketch = CountMinSketch(width=64, sample_size=10_000)
+        for _ in range(5):
+            sketch.increment("75192")
+        sketch.increment("10179")
+
+        assert sketch.estimate("75192") >= 5
+        assert sketch.estimate("10179") >= 1
+
+    def test_counts_saturate_and_age(self):
+        """Test that counters cap at 15 and halve after sample_size adds."""
+        sketch = CountMinSketch(width=64, sample_size=20)
+        for _ in range(19):
+            sketch.increment("75192")
+        assert sketch.estimate("75192") == 15
+
+        sketch.increment("75192")  # 20th increment triggers aging
+
+        assert sketch.estimate("75192") == 7
+
+
+class TestWTinyLFUCache:
+    """Test the admission policy and the TLRUCache-compatible interface."""
+
+    def test_basic_mapping(self):
+        """Test get, set, contains, delete and len."""
+        cache = WTinyLFUCache(maxsize=10)
+        cache["a"] = 1
+
+        assert cache["a"] == 1
+        assert "a" in cache
+        assert cache.get("b") is None
+        assert len(cache) == 1
+
+        del cache["a"]
+        assert "a" not in cache
+        assert len(cache) == 0
+
+    def test_never_exceeds_maxsize(self):
+        """Test that inserts beyond capacity evict."""
+        cache = WTinyLFUCache(maxsize=10)
+        for i in range(100):
+            cache[i] = i
+
+        assert len(cache) == 10
+        assert cache.currsize == 10
+
+    def test_popular_entries_survive_a_scan(self):
+        """Test that one-off keys are not admitted over frequently used ones."""
+        cache = WTinyLFUCache(maxsize=10)
+        for _ in range(5):
+            for key in range(5):
+                if cache.get(key) is None:
+                    cache[key] = key
+
+        for key in range(1000, 1050):
+            if cache.get(key) is None:
+                cache[key] = key
+
+        assert all(key in cache for key in range(5))
+
+    def test_beats_lru_on_scanned_workload(self):
+        """Test that replayed scans hurt W-TinyLFU far less than LRU."""
+        keys = _scanned_workload()
+
+        lru = replay(keys, LRUCache(maxsize=50))
+        tinylfu = replay(keys, WTinyLFUCache(maxsize=50))
+
+        assert tinylfu["hit_ratio"] > lru["hit_ratio"] + 0.03
+
+    def test_entries_expire(self):
+        """Test per-entry expiry through the ttu function."""
+        timer = FakeTimer()
+        cache = WTinyLFUCache(maxsize=10, ttu=_ttl(60), timer=timer)
+        cache["a"] = 1
+
+        timer.now = 59
+        assert cache.get("a") == 1
+        timer.now = 60
+        assert cache.get("a") is None
+        assert "a" not in cache
+        assert list(cache) == []
+
+        cache.expire()
+        assert len(cache) == 0
+
+    def test_already_expired_entries_are_skipped(self):
+        """Test that, like TLRUCache, expired inserts are dropped."""
+        cache = WTinyLFUCache(maxsize=10, ttu=_ttl(0), timer=FakeTimer())
+        cache["a"] = 1
+
+        assert len(cache) == 0
+
+    def test_sized_entries(self):
+        """Test that capacity is measured with getsizeof when given."""
+        cache = WTinyLFUCache(maxsize=100, getsizeof=len)
+        cache["a"] = "x" * 60
+        cache["b"] = "x" * 60
+
+        assert cache.currsize <= 100
+        assert len(cache) == 1
+
+    def test_stats(self):
+        """Test hit and miss counting."""
+        cache = WTinyLFUCache(maxsize=10)
+        cache.get("a")
+        cache["a"] = 1
+        cache.get("a")
+        cache.get("a")
+
+        assert cache.stats() == {"hits": 2, "misses": 1, "hit_ratio": 0.6667}
+
+    def test_clear_and_popitem(self):
+        """Test that clear() empties the cache and popitem() then raises."""
+        cache = WTinyLFUCache(maxsize=10)
+        for i in range(5):
+            cache[i] = i
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.currsize == 0
+        with pytest.raises(KeyError):
+            cache.popitem()
+
+
+class TestReplay:
+    """Test comparing policies on an access log."""
+
+    def test_replay_counts(self):
+        """Test that replay loads misses and counts hits."""
+        stats = replay(["a", "b", "a", "a"], LRUCache(maxsize=10))
+
+        assert stats == {"hits": 2, "misses": 2, "hit_ratio": 0.5}
+
+    def test_cli(self, tmp_path, capsys):
+        """Test the command-line comparison on a key file."""
+        log = tmp_path / "keys.txt"
+        log.write_text("\n".join(_scanned_workload()))
+
+        main([str(log), "--size", "50"])
+
+        output = capsys.readouterr().out
+        assert "lru: hit ratio" in output
+        assert "wtinylfu: hit ratio" in output
@@ -0,0 +1,97 @@
+"""
+Unit tests for the group-commit inventory write queue.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.exceptions import SetNotFoundError
+from app.core.models import LegoSet, Part
+from app.core.states import PieceState
+from app.infrastructure.db import (
+    AsyncSqliteInventoryRepository,
+    AsyncSqliteSetsRepository,
+)
+from app.infrastructure.write_queue import InventoryWriteQueue
+
+BRICK = Part(part_no="3001", color_id=1, name="Brick 2 x 4")
+
+
+@pytest.fixture
+async def write_queue(async_session_factory):
+    async with async_session_factory() as db:
+        await AsyncSqliteSetsRepository(db).add(LegoSet(set_no="1111", name="A"))
+    queue = InventoryWriteQueue(async_session_factory, max_delay=0.05)
+    queue.start()
+    yield queue
+    await queue.stop()
+
+
+class TestInventoryWriteQueue:
+    """Test batching and per-caller results of the write queue."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_one_commit(
+        self, write_queue, async_session_factory, monkeypatch
+    ):
+        """Test that writes submitted together are applied in one batch."""
+        batches = []
+        original_apply = InventoryWriteQueue._apply
+
+        def counting_apply(db, batch):
+            batches.append(len(batch))
+            return original_apply(db, batch)
+
+        monkeypatch.setattr(InventoryWriteQueue, "_apply", staticmethod(counting_apply))
+
+        await asyncio.gather(
+            *(
+                write_queue.add_part("1111", BRICK.model_copy(update={"color_id": c}))
+                for c in range(10)
+            )
+        )
+
+        assert batches == [10]
+        async with async_session_factory() as db:
+            assert len(await AsyncSqliteInventoryRepository(db).list()) == 10
+
+    @pytest.mark.asyncio
+    async def test_each_caller_gets_its_own_result(self, write_queue):
+        """Test that results and errors are routed to the right caller."""
+        await write_queue.add_part("1111", BRICK)
+
+        found, missing, bad_set = await asyncio.gather(
+            write_queue.update_item("3001", 1, 5, PieceState.MISSING, set_no="1111"),
+            write_queue.update_item("9999", 1, 5, PieceState.MISSING),
+            write_queue.add_part("0000", BRICK),
+            return_exceptions=True,
+        )
+
+        assert found is True
+        assert missing is False
+        assert isinstance(bad_set, SetNotFoundError)
+
+    @pytest.mark.asyncio
+    async def test_failed_write_does_not_discard_others(
+        self, write_queue, async_session_factory
+    ):
+        """Test that a failing write is isolated from the rest of its batch."""
+        results = await asyncio.gather(
+            write_queue.add_part("1111", BRICK),
+            write_queue.add_part("0000", BRICK),
+            return_exceptions=True,
+        )
+
+        assert results[0] is None
+        assert isinstance(results[1], SetNotFoundError)
+        async with async_session_factory() as db:
+            items = await AsyncSqliteInventoryRepository(db).list()
+        assert [(i["set_no"], i["part_no"]) for i in items] == [("1111", "3001")]
+
+    @pytest.mark.asyncio
+    async def test_submit_requires_start(self, async_session_factory):
+        """Test that writes are rejected before the writer task runs."""
+        queue = InventoryWriteQueue(async_session_factory)
+        with pytest.raises(RuntimeError):
+            await queue.update_item("3001", 1, 1, PieceState.MISSING)